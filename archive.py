@@ -0,0 +1,215 @@
+import gzip
+import json
+import os
+import struct
+import threading
+import time
+
+# zstandard是可选依赖，没有安装时使用gzip
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# 每条记录前的帧头：魔数 + 压缩后数据的长度，索引丢失时可以顺序扫描分段重建
+_FRAME = struct.Struct('<4sI')
+_MAGIC = b'BSPA'
+
+INDEX_FILE = 'index.jsonl'
+
+# 保存路径下的默认归档目录
+ARCHIVE_DIR = 'archive'
+
+# 页面类型
+LIST_PAGE = 'list'
+DETAIL_PAGE = 'detail'
+
+
+def compress(data, codec):
+    """
+    压缩一条记录
+
+    Args:
+        data (bytes): 原始数据
+        codec (str): 'zstd' 或 'gzip'
+
+    Returns:
+        bytes: 压缩后的数据
+    """
+    if codec == 'zstd':
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def decompress(data, codec):
+    """
+    解压一条记录
+
+    Args:
+        data (bytes): 压缩后的数据
+        codec (str): 'zstd' 或 'gzip'
+
+    Returns:
+        bytes: 原始数据
+    """
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ImportError("读取zstd压缩的归档需要安装zstandard: pip install zstandard")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def read_record(directory, entry):
+    """
+    按索引条目读取一个页面
+
+    Args:
+        directory (str): 归档目录
+        entry (dict): 索引条目
+
+    Returns:
+        tuple: (记录头, 页面HTML)
+    """
+    with open(os.path.join(directory, entry['segment']), 'rb') as f:
+        f.seek(entry['offset'] + _FRAME.size)
+        data = decompress(f.read(entry['length']), entry['codec'])
+    header, _, body = data.partition(b'\n')
+    return json.loads(header), body.decode('utf-8')
+
+
+class PageArchive:
+    """
+    原始页面归档
+
+    抓取到的列表页和详情页逐条压缩后追加到分段文件中，每条记录带有URL、
+    抓取时间和筛选条件。索引文件记录每条记录所在的分段和偏移量，
+    修复选择器后可以从归档重新解析，无需重新爬取。
+    """
+
+    def __init__(self, directory, segment_size=256 * 1024 * 1024, codec=None):
+        """
+        打开（或创建）归档
+
+        Args:
+            directory (str): 归档目录
+            segment_size (int): 单个分段文件的最大字节数，超过后写入新分段
+            codec (str): 'zstd' 或 'gzip'，默认安装了zstandard时使用zstd
+        """
+        self.directory = directory
+        self.segment_size = segment_size
+        self.codec = codec or ('zstd' if zstandard is not None else 'gzip')
+        if self.codec == 'zstd' and zstandard is None:
+            print("没有安装zstandard，归档改用gzip压缩")
+            self.codec = 'gzip'
+        self.lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self.segment_number = self.last_segment_number()
+        self.segment = None
+        self.index = open(os.path.join(directory, INDEX_FILE), 'a', encoding='utf-8')
+        self.open_segment()
+
+    def last_segment_number(self):
+        """已有的最后一个分段编号，没有分段时为1"""
+        numbers = [int(name[8:13]) for name in os.listdir(self.directory)
+                   if name.startswith('segment-') and name.endswith('.arc')]
+        return max(numbers, default=1)
+
+    def segment_name(self, number):
+        return f"segment-{number:05d}.arc"
+
+    def open_segment(self):
+        """以追加方式打开当前分段，已满时换到下一个分段"""
+        if self.segment is not None:
+            self.segment.close()
+        path = os.path.join(self.directory, self.segment_name(self.segment_number))
+        if os.path.exists(path) and os.path.getsize(path) >= self.segment_size:
+            self.segment_number += 1
+            path = os.path.join(self.directory, self.segment_name(self.segment_number))
+        self.segment = open(path, 'ab')
+
+    def write(self, kind, url, page_html, **meta):
+        """
+        追加一个页面
+
+        Args:
+            kind (str): 页面类型，LIST_PAGE 或 DETAIL_PAGE
+            url (str): 页面URL
+            page_html (str): 页面HTML
+            **meta: 其他需要记录的信息，如职位名称、筛选条件、结果文件名
+        """
+        header = dict(meta, kind=kind, url=url, time=time.time())
+        data = compress(json.dumps(header, ensure_ascii=False).encode('utf-8') + b'\n' +
+                        page_html.encode('utf-8'), self.codec)
+        with self.lock:
+            if self.segment.tell() >= self.segment_size:
+                self.segment_number += 1
+                self.open_segment()
+            offset = self.segment.tell()
+            self.segment.write(_FRAME.pack(_MAGIC, len(data)))
+            self.segment.write(data)
+            self.segment.flush()
+            entry = dict(header, segment=self.segment_name(self.segment_number), offset=offset,
+                         length=len(data), codec=self.codec)
+            self.index.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self.index.flush()
+
+    def close(self):
+        """关闭归档"""
+        with self.lock:
+            self.segment.close()
+            self.index.close()
+
+
+def load_index(directory):
+    """
+    读取归档索引，索引文件不存在时扫描分段重建
+
+    Args:
+        directory (str): 归档目录
+
+    Returns:
+        list: 索引条目列表，按写入顺序排列
+    """
+    index_path = os.path.join(directory, INDEX_FILE)
+    if os.path.exists(index_path):
+        entries = []
+        with open(index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # 写入中断留下的半行
+                    continue
+        return entries
+    return scan_segments(directory)
+
+
+def scan_segments(directory):
+    """
+    顺序扫描所有分段文件重建索引
+
+    Args:
+        directory (str): 归档目录
+
+    Returns:
+        list: 索引条目列表
+    """
+    entries = []
+    for name in sorted(os.listdir(directory)):
+        if not (name.startswith('segment-') and name.endswith('.arc')):
+            continue
+        with open(os.path.join(directory, name), 'rb') as f:
+            while True:
+                offset = f.tell()
+                frame = f.read(_FRAME.size)
+                if len(frame) < _FRAME.size:
+                    break
+                magic, length = _FRAME.unpack(frame)
+                data = f.read(length)
+                if magic != _MAGIC or len(data) < length:
+                    print(f"分段 {name} 在偏移 {offset} 处损坏，停止扫描")
+                    break
+                codec = 'zstd' if data[:4] == b'\x28\xb5\x2f\xfd' else 'gzip'
+                header = json.loads(decompress(data, codec).partition(b'\n')[0])
+                entries.append(dict(header, segment=name, offset=offset, length=length, codec=codec))
+    return entries
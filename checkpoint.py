@@ -0,0 +1,78 @@
+import json
+import os
+import time
+
+
+class Checkpoint:
+    """
+    爬取断点
+
+    以JSON文件保存在CSV旁边，记录下一个要爬取的页码、已保存的职位ID、
+    爬取模式和筛选条件。写入时先写临时文件再原子替换，进程崩溃也不会留下半个文件。
+    """
+
+    def __init__(self, path):
+        """
+        初始化断点
+
+        Args:
+            path (str): 断点文件路径
+        """
+        self.path = path
+
+    @classmethod
+    def for_csv(cls, save_path, csv_file):
+        """
+        获取CSV文件对应的断点
+
+        Args:
+            save_path (str): 保存路径
+            csv_file (str): CSV文件名
+
+        Returns:
+            Checkpoint: 断点实例
+        """
+        return cls(os.path.join(save_path, f"{csv_file}.checkpoint.json"))
+
+    def load(self):
+        """
+        读取断点
+
+        Returns:
+            dict: 断点内容，文件不存在或损坏时返回None
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"读取断点文件失败: {e}")
+            return None
+
+    def save(self, state):
+        """
+        保存断点
+
+        Args:
+            state (dict): 断点内容
+        """
+        state = dict(state, updated_at=time.time())
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"保存断点失败: {e}")
+
+    def clear(self):
+        """爬取完成后删除断点"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"删除断点失败: {e}")
@@ -0,0 +1,138 @@
+import json
+import os
+import re
+import shutil
+from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.os_manager import OperationSystemManager, ChromeType
+from webdriver_manager.core.constants import DEFAULT_USER_HOME_CACHE_PATH
+
+# 解析结果缓存文件，记录每个Chrome版本对应的chromedriver路径
+CACHE_FILE = os.path.join(os.path.expanduser('~'), '.boss_spider', 'chromedriver.json')
+
+# 设置该环境变量为1时进入离线模式，永不访问网络
+OFFLINE_ENV = 'BOSS_SPIDER_OFFLINE'
+
+
+def is_offline():
+    """
+    是否处于离线模式
+
+    Returns:
+        bool: 环境变量 BOSS_SPIDER_OFFLINE 为真值时返回True
+    """
+    return os.environ.get(OFFLINE_ENV, '').lower() in ('1', 'true', 'yes')
+
+
+def get_chrome_version():
+    """
+    读取本机已安装的Chrome版本，只执行本地命令，不访问网络
+
+    Returns:
+        str: Chrome版本号，读取失败时返回None
+    """
+    try:
+        return OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+    except Exception as e:
+        print(f"读取Chrome版本失败: {e}")
+        return None
+
+
+def load_cache():
+    """
+    读取解析结果缓存
+
+    Returns:
+        dict: Chrome版本到chromedriver路径的映射
+    """
+    try:
+        with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f).get('drivers', {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache(drivers):
+    """
+    保存解析结果缓存
+
+    Args:
+        drivers (dict): Chrome版本到chromedriver路径的映射
+    """
+    try:
+        os.makedirs(os.path.dirname(CACHE_FILE), exist_ok=True)
+        with open(CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'drivers': drivers}, f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f"保存chromedriver缓存失败: {e}")
+
+
+def find_local_driver(chrome_version=None):
+    """
+    在本地查找已下载的chromedriver，不访问网络
+
+    依次查找webdriver-manager的下载目录和系统PATH。
+
+    Args:
+        chrome_version (str): Chrome版本号，提供时优先匹配相同主版本
+
+    Returns:
+        str: chromedriver路径，找不到时返回None
+    """
+    name = 'chromedriver.exe' if os.name == 'nt' else 'chromedriver'
+    major = chrome_version.split('.')[0] if chrome_version else None
+
+    candidates = []
+    for root, _, files in os.walk(os.path.join(DEFAULT_USER_HOME_CACHE_PATH, 'drivers', 'chromedriver')):
+        if name in files:
+            candidates.append(os.path.join(root, name))
+    if major:
+        matched = [p for p in candidates if re.search(rf'[\\/]{major}\.', p)]
+        if matched:
+            return sorted(matched)[-1]
+    if candidates:
+        return sorted(candidates)[-1]
+    return shutil.which(name)
+
+
+def resolve_chromedriver(offline=None):
+    """
+    获取与本机Chrome匹配的chromedriver路径
+
+    已解析过的版本直接返回缓存的路径，只有Chrome版本变化（或缓存文件失效）时
+    才调用 ChromeDriverManager().install() 重新解析。离线模式下只使用本地文件。
+
+    Args:
+        offline (bool): 是否离线模式，None时读取环境变量 BOSS_SPIDER_OFFLINE
+
+    Returns:
+        str: chromedriver可执行文件路径
+
+    Raises:
+        RuntimeError: 离线模式下本地找不到chromedriver
+    """
+    if offline is None:
+        offline = is_offline()
+
+    chrome_version = get_chrome_version()
+    drivers = load_cache()
+
+    cached_path = drivers.get(chrome_version) if chrome_version else None
+    if cached_path and os.path.exists(cached_path):
+        return cached_path
+
+    if offline:
+        driver_path = find_local_driver(chrome_version)
+        if not driver_path:
+            # 版本读取失败时退而使用缓存中任意一个仍然存在的路径
+            driver_path = next((p for p in drivers.values() if os.path.exists(p)), None)
+        if not driver_path:
+            raise RuntimeError("离线模式下没有找到本地chromedriver，请先联网运行一次或将chromedriver加入PATH")
+        print(f"离线模式，使用本地chromedriver: {driver_path}")
+    else:
+        print(f"Chrome版本 {chrome_version} 没有缓存的chromedriver，正在解析...")
+        driver_path = ChromeDriverManager().install()
+
+    if chrome_version:
+        drivers[chrome_version] = driver_path
+        save_cache(drivers)
+    return driver_path
@@ -0,0 +1,145 @@
+import hashlib
+import math
+import os
+import sqlite3
+import threading
+import time
+
+# 默认的去重索引文件，所有职位和所有运行共享
+DEFAULT_INDEX_PATH = os.path.join(os.path.expanduser('~'), '.boss_spider', 'dedup.sqlite')
+
+
+class BloomFilter:
+    """
+    布隆过滤器
+
+    放在SQLite索引前面，绝大多数新职位在内存中即可判定为“未见过”，不需要查询磁盘。
+    """
+
+    def __init__(self, capacity=100000, error_rate=0.001):
+        """
+        初始化布隆过滤器
+
+        Args:
+            capacity (int): 预计容纳的元素数
+            error_rate (float): 期望的误判率
+        """
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.bits_count = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.bits_count / self.capacity * math.log(2)))
+        self.bits = bytearray((self.bits_count + 7) // 8)
+        self.count = 0
+
+    def positions(self, key):
+        """使用双重哈希计算key对应的各个比特位"""
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.bits_count for i in range(self.hash_count)]
+
+    def add(self, key):
+        """
+        添加元素
+
+        Args:
+            key (str): 元素
+        """
+        for pos in self.positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self.positions(key))
+
+
+class DedupIndex:
+    """
+    持久化的职位去重索引
+
+    以详情页URL中的职位ID为键保存在SQLite中，跨运行、跨职位名称共享。
+    内存中的布隆过滤器负责快速排除新职位，命中时再用主键查询确认。
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH, error_rate=0.001):
+        """
+        打开（或创建）去重索引
+
+        Args:
+            path (str): SQLite文件路径
+            error_rate (float): 布隆过滤器的误判率
+        """
+        self.path = path
+        self.error_rate = error_rate
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_jobs ("
+            "job_id TEXT PRIMARY KEY, title TEXT, first_seen REAL) WITHOUT ROWID"
+        )
+        self.conn.commit()
+        self.rebuild_filter()
+
+    def rebuild_filter(self, capacity=None):
+        """
+        根据SQLite中的所有职位ID重建布隆过滤器
+
+        Args:
+            capacity (int): 过滤器容量，默认为当前条数的两倍
+        """
+        total = self.conn.execute("SELECT COUNT(*) FROM seen_jobs").fetchone()[0]
+        self.bloom = BloomFilter(capacity or max(100000, total * 2), self.error_rate)
+        for (job_id,) in self.conn.execute("SELECT job_id FROM seen_jobs"):
+            self.bloom.add(job_id)
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM seen_jobs").fetchone()[0]
+
+    def __contains__(self, job_id):
+        with self.lock:
+            if job_id not in self.bloom:
+                return False
+            return self.conn.execute(
+                "SELECT 1 FROM seen_jobs WHERE job_id = ?", (job_id,)
+            ).fetchone() is not None
+
+    def add_many(self, jobs):
+        """
+        在一个事务中批量记录已爬取的职位
+
+        Args:
+            jobs (list): (职位ID, 职位名称) 元组列表
+        """
+        if not jobs:
+            return
+        now = time.time()
+        with self.lock:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO seen_jobs (job_id, title, first_seen) VALUES (?, ?, ?)",
+                    [(job_id, title, now) for job_id, title in jobs]
+                )
+            for job_id, _ in jobs:
+                self.bloom.add(job_id)
+            # 元素数超过容量后误判率上升，按两倍容量重建
+            if self.bloom.count > self.bloom.capacity:
+                self.rebuild_filter(self.bloom.count * 2)
+
+    def add(self, job_id, title=''):
+        """
+        记录一个已爬取的职位
+
+        Args:
+            job_id (str): 职位ID
+            title (str): 职位名称，仅用于排查
+        """
+        self.add_many([(job_id, title)])
+
+    def close(self):
+        """关闭索引"""
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,65 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class DetailFetchPool:
+    """
+    详情页并发抓取池
+
+    由固定数量的工作线程并发获取详情页，每个线程持有自己的抓取后端
+    （浏览器或HTTP会话），限速由后端共享的令牌桶负责。
+    """
+
+    def __init__(self, fetcher_factory, workers=4):
+        """
+        初始化抓取池
+
+        Args:
+            fetcher_factory (function): 无参函数，为每个工作线程创建一个抓取后端
+            workers (int): 工作线程数
+        """
+        self.fetcher_factory = fetcher_factory
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='detail')
+        self.local = threading.local()
+        self.fetchers = []  # 所有线程创建过的后端，关闭时统一释放
+        self.lock = threading.Lock()
+
+    def get_fetcher(self):
+        """
+        获取当前线程的抓取后端，首次调用时创建
+
+        Returns:
+            Fetcher: 抓取后端实例
+        """
+        fetcher = getattr(self.local, 'fetcher', None)
+        if fetcher is None:
+            fetcher = self.fetcher_factory()
+            self.local.fetcher = fetcher
+            with self.lock:
+                self.fetchers.append(fetcher)
+        return fetcher
+
+    def submit(self, func, item):
+        """
+        提交一个任务到工作线程
+
+        Args:
+            func (function): 处理函数，签名为 func(fetcher, item)，fetcher为当前线程的抓取后端
+            item: 任务参数
+
+        Returns:
+            concurrent.futures.Future: 任务结果
+        """
+        return self.executor.submit(lambda: func(self.get_fetcher(), item))
+
+    def close(self):
+        """等待所有任务结束并关闭各线程的抓取后端"""
+        self.executor.shutdown(wait=True)
+        with self.lock:
+            fetchers, self.fetchers = self.fetchers, []
+        for fetcher in fetchers:
+            try:
+                fetcher.close()
+            except Exception as e:
+                print(f"关闭抓取后端时出错: {e}")
@@ -0,0 +1,171 @@
+import threading
+from fetcher import open_chrome
+
+
+class DriverPool:
+    """
+    Chrome WebDriver池
+
+    在多个爬取任务之间复用已启动的浏览器，避免每个职位都冷启动一次Chrome。
+    借出前做健康检查，归还时按已加载页数和JS堆内存判断是否需要回收重建。
+    """
+
+    def __init__(self, size=1, max_pages=300, max_memory_mb=1024, factory=None):
+        """
+        初始化WebDriver池
+
+        Args:
+            size (int): 池中最多同时存在的浏览器数量
+            max_pages (int): 单个浏览器加载多少个页面后回收重建
+            max_memory_mb (int): 页面JS堆内存超过该值(MB)时回收重建，0表示不检查
+            factory (function): 创建WebDriver的函数，默认为fetcher.open_chrome
+        """
+        self.size = size
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.factory = factory or open_chrome
+        self.idle = []  # 空闲的浏览器，后进先出以优先使用最近用过的
+        self.pages = {}  # 每个浏览器累计加载的页数
+        self.created = 0  # 当前存活的浏览器数量
+        self.closed = False
+        self.condition = threading.Condition()
+
+    def is_healthy(self, driver):
+        """
+        检查浏览器会话是否仍然可用
+
+        Args:
+            driver (webdriver.Chrome): WebDriver实例
+
+        Returns:
+            bool: 会话是否可用
+        """
+        try:
+            return driver.execute_script("return 1") == 1 and len(driver.window_handles) > 0
+        except Exception:
+            return False
+
+    def memory_mb(self, driver):
+        """
+        读取当前页面的JS堆内存占用
+
+        Args:
+            driver (webdriver.Chrome): WebDriver实例
+
+        Returns:
+            float: 内存占用(MB)，浏览器不支持时返回0
+        """
+        try:
+            used = driver.execute_script(
+                "return (window.performance && performance.memory) ? performance.memory.usedJSHeapSize : 0;"
+            )
+            return (used or 0) / (1024 * 1024)
+        except Exception:
+            return 0
+
+    def discard(self, driver):
+        """
+        关闭并丢弃一个浏览器
+
+        Args:
+            driver (webdriver.Chrome): WebDriver实例
+        """
+        try:
+            driver.quit()
+        except Exception as e:
+            print(f"关闭浏览器时出错: {e}")
+        with self.condition:
+            self.pages.pop(id(driver), None)
+            self.created -= 1
+            self.condition.notify()
+
+    def acquire(self, timeout=None):
+        """
+        借出一个健康的浏览器，池已满时等待其他任务归还
+
+        Args:
+            timeout (float): 最长等待时间(秒)，None表示一直等待
+
+        Returns:
+            webdriver.Chrome: WebDriver实例
+
+        Raises:
+            TimeoutError: 等待超时
+            RuntimeError: 池已关闭
+        """
+        while True:
+            with self.condition:
+                if self.closed:
+                    raise RuntimeError("WebDriver池已关闭")
+                if not self.idle and self.created >= self.size:
+                    if not self.condition.wait(timeout):
+                        raise TimeoutError("等待可用浏览器超时")
+                    continue
+                driver = self.idle.pop() if self.idle else None
+                if driver is None:
+                    self.created += 1
+
+            if driver is None:
+                try:
+                    driver = self.factory()
+                except Exception:
+                    with self.condition:
+                        self.created -= 1
+                        self.condition.notify()
+                    raise
+                with self.condition:
+                    self.pages[id(driver)] = 0
+                print(f"已启动新的浏览器，池中共 {self.created} 个")
+                return driver
+
+            if self.is_healthy(driver):
+                return driver
+            print("浏览器会话已失效，重新创建")
+            self.discard(driver)
+
+    def release(self, driver, pages=0):
+        """
+        归还浏览器，超过页数或内存上限时直接回收
+
+        Args:
+            driver (webdriver.Chrome): WebDriver实例
+            pages (int): 本次借用期间加载的页数
+        """
+        with self.condition:
+            total_pages = self.pages.get(id(driver), 0) + pages
+            self.pages[id(driver)] = total_pages
+            closed = self.closed
+
+        if closed or total_pages >= self.max_pages:
+            if not closed:
+                print(f"浏览器已加载 {total_pages} 个页面，回收重建")
+            self.discard(driver)
+            return
+
+        if self.max_memory_mb and self.memory_mb(driver) > self.max_memory_mb:
+            print("浏览器内存占用过高，回收重建")
+            self.discard(driver)
+            return
+
+        try:
+            # 只保留一个标签页，避免残留状态影响下一个任务
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+        except Exception:
+            self.discard(driver)
+            return
+
+        with self.condition:
+            self.idle.append(driver)
+            self.condition.notify()
+
+    def close(self):
+        """关闭池中所有空闲浏览器，借出中的浏览器在归还时关闭"""
+        with self.condition:
+            self.closed = True
+            idle, self.idle = self.idle, []
+        for driver in idle:
+            self.discard(driver)
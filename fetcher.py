@@ -0,0 +1,638 @@
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.common.by import By
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from chromedriver_cache import resolve_chromedriver
+from archive import LIST_PAGE, DETAIL_PAGE
+from resourcefilter import configure_options, enable_blocking, block_stats
+from pacing import (default_pacer, wait_until, wait_for_document_ready, wait_for_network_idle,
+                    wait_for_stable_count, count_elements)
+import requests
+import random
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
+
+
+# 列表页中的职位卡片
+JOB_CARD_SELECTOR = '.job-card-wrapper'
+
+# 一页列表完整显示的职位数，初始DOM中已有这么多卡片时不需要滚动
+LIST_PAGE_SIZE = 30
+
+# 触发懒加载时最多滚动的次数
+MAX_SCROLLS = 5
+
+# 每次滚动后等待新卡片出现的时间(秒)，第一次滚动没有新卡片时这一页不再滚动
+SCROLL_PROBE_TIMEOUT = 2
+
+
+def open_chrome(block_resources=True, collect_stats=False):
+    """
+    配置并打开Chrome浏览器
+
+    Args:
+        block_resources (bool): 是否屏蔽图片、字体、音视频和统计脚本，解析只需要页面文本
+        collect_stats (bool): 是否统计被屏蔽的请求，只在屏蔽资源时生效
+
+    Returns:
+        webdriver.Chrome: 配置好的Chrome WebDriver实例
+    """
+    options = Options()
+    options.headless = False
+
+    # 添加更多反爬虫检测的规避选项
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_argument('--disable-infobars')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--ignore-certificate-errors')  # 忽略证书错误
+    options.add_argument('--ignore-ssl-errors')  # 忽略SSL错误
+    options.add_argument('--disable-web-security')  # 禁用网页安全性检查
+    options.add_argument('--allow-running-insecure-content')  # 允许运行不安全内容
+    options.add_argument('--disable-webgl')  # 禁用WebGL
+    options.add_argument('--disable-software-rasterizer')  # 禁用软件光栅化器
+    options.add_argument(f'--window-size={random.randint(1200,1600)},{random.randint(800,1000)}')
+    options.add_argument(f"user-agent={USER_AGENT}")
+
+    # 添加实验性选项
+    options.add_experimental_option('useAutomationExtension', False)
+    options.add_experimental_option('excludeSwitches', ['enable-automation'])
+
+    # 禁用日志
+    options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    if block_resources:
+        configure_options(options, collect_stats)
+
+    service = Service(resolve_chromedriver())
+    driver = webdriver.Chrome(service=service, options=options)
+
+    # 修改 webdriver 属性
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+
+    # 设置页面加载超时
+    driver.set_page_load_timeout(30)
+    driver.set_script_timeout(30)
+
+    # 屏蔽规则对标签页生效，记录在driver上，需要统计时抓取后端才读取性能日志
+    blocks_resources = block_resources and enable_blocking(driver)
+    driver.collects_block_stats = blocks_resources and collect_stats
+
+    return driver
+
+
+class Fetcher:
+    """
+    页面抓取后端接口
+
+    所有后端都只负责把页面取回为HTML文本，字段解析统一交给JobParser，
+    因此浏览器后端和纯HTTP后端可以共用同一套解析逻辑。
+    """
+
+    def fetch_list(self, url):
+        """
+        加载列表页
+
+        Args:
+            url (str): 列表页URL
+
+        Returns:
+            str: 页面HTML
+        """
+        raise NotImplementedError
+
+    def reload(self, url=None):
+        """
+        重新加载列表页，不使用缓存，用于页面加载失败后的重试
+
+        Args:
+            url (str): 列表页URL，默认为当前列表页
+
+        Returns:
+            str: 页面HTML
+        """
+        raise NotImplementedError
+
+    def expand_list(self):
+        """
+        触发列表页的懒加载内容（如滚动），没有懒加载的后端直接返回当前HTML
+
+        Returns:
+            str: 页面HTML
+        """
+        raise NotImplementedError
+
+    def fetch_detail(self, url):
+        """
+        获取职位详情页
+
+        Args:
+            url (str): 详情页URL
+
+        Returns:
+            str: 页面HTML，失败时返回None
+        """
+        raise NotImplementedError
+
+    def fetch_conditional(self, url, kind, etag=None, last_modified=None):
+        """
+        带缓存验证信息获取页面，不支持条件请求的后端直接重新获取
+
+        Args:
+            url (str): 页面URL
+            kind (str): 页面类型，LIST_PAGE 或 DETAIL_PAGE
+            etag (str): 缓存页面的ETag
+            last_modified (str): 缓存页面的Last-Modified
+
+        Returns:
+            tuple: (页面HTML, ETag, Last-Modified, 是否未修改)，未修改时页面HTML为None
+        """
+        if kind == LIST_PAGE:
+            return self.fetch_list(url), None, None, False
+        return self.fetch_detail(url), None, None, False
+
+    @property
+    def current_url(self):
+        """当前列表页的URL，用于补全相对链接"""
+        raise NotImplementedError
+
+    def close(self):
+        """释放后端占用的资源"""
+        pass
+
+
+class SeleniumFetcher(Fetcher):
+    """
+    基于Chrome浏览器的抓取后端，适用于需要执行JS的页面
+    """
+
+    def __init__(self, driver=None, driver_pool=None, pacer=default_pacer):
+        """
+        初始化浏览器后端
+
+        Args:
+            driver (webdriver.Chrome): 已有的WebDriver实例
+            driver_pool (DriverPool): WebDriver池，提供时从池中借用浏览器，关闭时归还
+            pacer (HostPacer): 请求间隔，默认使用进程内共享的请求间隔，为None时不控制间隔
+        """
+        self.driver_pool = driver_pool
+        self.pacer = pacer
+        self.pages_loaded = 0  # 本次借用期间加载的页数
+        if driver is not None:
+            self.driver = driver
+        elif driver_pool is not None:
+            self.driver = driver_pool.acquire()
+        else:
+            self.driver = open_chrome()
+
+    def wait_for(self, by, value, timeout):
+        """
+        等待元素出现，超时不抛出异常
+
+        Args:
+            by (By): 查找方式
+            value (str): 查找值
+            timeout (int): 超时时间(秒)
+
+        Returns:
+            bool: 元素是否出现
+        """
+        try:
+            WebDriverWait(self.driver, timeout).until(
+                EC.presence_of_element_located((by, value))
+            )
+            return True
+        except TimeoutException:
+            return False
+
+    def pace(self, url):
+        """
+        按请求间隔等待到允许访问该站点
+
+        Args:
+            url (str): 即将访问的URL
+        """
+        if self.pacer is not None:
+            self.pacer.wait(url)
+
+    def collect_blocked(self):
+        """统计刚加载的页面中被屏蔽的请求，未开启统计时不读取性能日志"""
+        if getattr(self.driver, 'collects_block_stats', False):
+            block_stats.collect(self.driver)
+
+    def wait_for_cards(self, timeout=15):
+        """
+        等待职位卡片出现并且数量不再变化，页面没有职位时等到超时
+
+        Args:
+            timeout (float): 超时时间(秒)
+        """
+        if self.wait_for(By.CSS_SELECTOR, JOB_CARD_SELECTOR, timeout):
+            wait_for_stable_count(self.driver, JOB_CARD_SELECTOR, timeout=5)
+
+    def fetch_list(self, url):
+        self.pace(url)
+        self.driver.get(url)
+        self.pages_loaded += 1
+        self.wait_for_cards()
+        self.collect_blocked()
+        return self.driver.page_source
+
+    def reload(self, url=None):
+        if url is None or url == self.driver.current_url:
+            self.pace(self.driver.current_url)
+            self.driver.refresh()
+        else:
+            self.pace(url)
+            self.driver.get(url)
+        self.pages_loaded += 1
+        self.wait_for_cards()
+        self.collect_blocked()
+        return self.driver.page_source
+
+    def expand_list(self):
+        # 滚动前先数一下卡片，初始DOM中已有整页卡片时不需要滚动
+        count = count_elements(self.driver, JOB_CARD_SELECTOR)
+        if count >= LIST_PAGE_SIZE:
+            return self.driver.page_source
+
+        # 每一页单独判断是否懒加载：滚到底部，只要还有新卡片出现就继续滚动，
+        # 第一次滚动就没有新卡片时说明这一页已完整显示，只多花一次试探的时间
+        for _ in range(MAX_SCROLLS):
+            self.driver.execute_script(f"window.scrollBy(0, {random.randint(300, 700)});")
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            before = count
+            if not wait_until(lambda: count_elements(self.driver, JOB_CARD_SELECTOR) > before,
+                              SCROLL_PROBE_TIMEOUT):
+                break
+            # 新卡片开始出现后，等这一轮懒加载的请求全部完成
+            wait_for_network_idle(self.driver, timeout=4)
+            count = count_elements(self.driver, JOB_CARD_SELECTOR)
+            if count >= LIST_PAGE_SIZE:
+                break
+        self.collect_blocked()
+        return self.driver.page_source
+
+    def fetch_detail(self, url):
+        # 详情页由详情抓取池中独立的浏览器获取，列表页所在的浏览器不受影响，
+        # 因此直接在当前标签页中打开，省去新建、切换和关闭标签页的往返
+        try:
+            self.pace(url)
+            self.driver.get(url)
+            self.pages_loaded += 1
+            if not self.wait_for(By.CLASS_NAME, 'job-detail', 10):
+                print(f"详情页加载超时: {url}")
+                return None
+            # 职位描述等内容可能由页面脚本随后请求，等网络空闲后再取页面
+            if wait_for_document_ready(self.driver, 5):
+                wait_for_network_idle(self.driver, timeout=3)
+            self.collect_blocked()
+            return self.driver.page_source
+        except Exception as e:
+            print(f"获取详情页时出错: {e}")
+            return None
+
+    @property
+    def current_url(self):
+        return self.driver.current_url
+
+    def close(self):
+        if self.driver_pool is not None:
+            self.driver_pool.release(self.driver, self.pages_loaded)
+            self.pages_loaded = 0
+            return
+        try:
+            self.driver.quit()
+        except Exception as e:
+            print(f"关闭浏览器时出错: {e}")
+
+
+class HttpFetcher(Fetcher):
+    """
+    基于requests会话的轻量抓取后端
+
+    复用连接池，不启动浏览器，适用于无需执行JS的页面以及本地HTML夹具服务器。
+    """
+
+    def __init__(self, pool_size=10, timeout=30, retries=2):
+        """
+        初始化HTTP后端
+
+        Args:
+            pool_size (int): 每个主机保持的连接数
+            timeout (int): 请求超时时间(秒)
+            retries (int): 连接错误和5xx响应的重试次数
+        """
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'zh-CN,zh;q=0.9',
+        })
+        retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.last_url = ''
+        self.last_html = ''
+
+    def get(self, url):
+        """
+        发送GET请求并返回页面文本
+
+        Args:
+            url (str): 页面URL
+
+        Returns:
+            tuple: (重定向后的最终URL, 页面HTML)
+        """
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        if response.encoding is None or response.encoding.lower() == 'iso-8859-1':
+            response.encoding = response.apparent_encoding
+        return response.url, response.text
+
+    def fetch_list(self, url):
+        self.last_url, self.last_html = self.get(url)
+        return self.last_html
+
+    def fetch_conditional(self, url, kind, etag=None, last_modified=None):
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        try:
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304:
+                if kind == LIST_PAGE:
+                    self.last_url = url
+                return None, etag, last_modified, True
+            response.raise_for_status()
+        except Exception as e:
+            if kind == LIST_PAGE:
+                raise
+            print(f"获取详情页时出错: {e}")
+            return None, None, None, False
+        if response.encoding is None or response.encoding.lower() == 'iso-8859-1':
+            response.encoding = response.apparent_encoding
+        if kind == LIST_PAGE:
+            self.last_url, self.last_html = response.url, response.text
+        return response.text, response.headers.get('ETag'), response.headers.get('Last-Modified'), False
+
+    def reload(self, url=None):
+        return self.fetch_list(url or self.last_url)
+
+    def expand_list(self):
+        return self.last_html
+
+    def fetch_detail(self, url):
+        try:
+            return self.get(url)[1]
+        except Exception as e:
+            print(f"获取详情页时出错: {e}")
+            return None
+
+    @property
+    def current_url(self):
+        return self.last_url
+
+    def close(self):
+        self.session.close()
+
+
+class ThrottledFetcher(Fetcher):
+    """
+    限速包装器
+
+    每次网络请求前先从共享的令牌桶中取令牌，多个后端共用一个令牌桶时，
+    总请求速率不会超过设定的预算。
+    """
+
+    def __init__(self, fetcher, rate_limiter):
+        """
+        初始化限速包装器
+
+        Args:
+            fetcher (Fetcher): 被包装的抓取后端
+            rate_limiter (TokenBucket): 共享的令牌桶
+        """
+        self.fetcher = fetcher
+        self.rate_limiter = rate_limiter
+
+    def fetch_list(self, url):
+        self.rate_limiter.acquire()
+        return self.fetcher.fetch_list(url)
+
+    def reload(self, url=None):
+        self.rate_limiter.acquire()
+        return self.fetcher.reload(url)
+
+    def expand_list(self):
+        return self.fetcher.expand_list()
+
+    def fetch_detail(self, url):
+        self.rate_limiter.acquire()
+        return self.fetcher.fetch_detail(url)
+
+    def fetch_conditional(self, url, kind, etag=None, last_modified=None):
+        self.rate_limiter.acquire()
+        return self.fetcher.fetch_conditional(url, kind, etag, last_modified)
+
+    @property
+    def current_url(self):
+        return self.fetcher.current_url
+
+    def close(self):
+        self.fetcher.close()
+
+
+class CachingFetcher(Fetcher):
+    """
+    缓存包装器
+
+    获取页面前先查本地缓存：有效期内直接返回，不占用限速令牌；
+    过期时带ETag/Last-Modified发送条件请求，服务器返回304时继续使用缓存。
+    只缓存包含职位信息的页面，验证码等异常页面不会进入缓存。
+    """
+
+    # 判断页面可以缓存的标记
+    CACHEABLE_MARKERS = {LIST_PAGE: 'job-card-wrapper', DETAIL_PAGE: 'job-detail'}
+
+    def __init__(self, fetcher, cache):
+        """
+        初始化缓存包装器
+
+        Args:
+            fetcher (Fetcher): 被包装的抓取后端
+            cache (ResponseCache): 页面缓存
+        """
+        self.fetcher = fetcher
+        self.cache = cache
+        self.list_from_cache = False  # 当前列表页是否来自缓存
+        self.last_url = ''
+        self.last_html = ''
+
+    def fetch(self, url, kind):
+        """
+        按缓存策略获取页面
+
+        Args:
+            url (str): 页面URL
+            kind (str): 页面类型
+
+        Returns:
+            tuple: (页面HTML, 是否来自缓存)
+        """
+        cached = self.cache.get(url, kind)
+        if cached is not None and cached.fresh:
+            return cached.body, True
+        if cached is not None:
+            page_html, etag, last_modified, not_modified = self.fetcher.fetch_conditional(
+                url, kind, cached.etag, cached.last_modified)
+            if not_modified:
+                self.cache.refresh(url)
+                return cached.body, True
+        else:
+            page_html, etag, last_modified, _ = self.fetcher.fetch_conditional(url, kind)
+        if page_html and self.CACHEABLE_MARKERS[kind] in page_html:
+            self.cache.put(url, kind, page_html, etag, last_modified)
+        return page_html, False
+
+    def fetch_list(self, url):
+        page_html, self.list_from_cache = self.fetch(url, LIST_PAGE)
+        self.last_url, self.last_html = url, page_html
+        return page_html
+
+    def reload(self, url=None):
+        # 重新加载说明之前的页面有问题，绕过缓存，取回的正常页面替换缓存中的旧页面
+        self.list_from_cache = False
+        self.last_url = url or self.last_url
+        page_html = self.fetcher.reload(self.last_url)
+        self.last_html = page_html
+        if page_html and self.CACHEABLE_MARKERS[LIST_PAGE] in page_html:
+            self.cache.put(self.last_url, LIST_PAGE, page_html)
+        return page_html
+
+    def expand_list(self):
+        if self.list_from_cache:
+            return self.last_html
+        page_html = self.fetcher.expand_list()
+        # 浏览器懒加载出更多内容时，缓存加载之后的完整页面
+        if page_html and page_html != self.last_html and self.CACHEABLE_MARKERS[LIST_PAGE] in page_html:
+            self.cache.put(self.last_url, LIST_PAGE, page_html)
+        return page_html
+
+    def fetch_detail(self, url):
+        return self.fetch(url, DETAIL_PAGE)[0]
+
+    @property
+    def current_url(self):
+        if self.list_from_cache:
+            return self.last_url
+        return self.fetcher.current_url
+
+    def close(self):
+        self.fetcher.close()
+
+
+class ArchivingFetcher(Fetcher):
+    """
+    归档包装器
+
+    把用于解析的列表页（懒加载之后）和详情页原样写入页面归档，
+    修复选择器后可以直接从归档重新解析。
+    """
+
+    def __init__(self, fetcher, archive, meta=None):
+        """
+        初始化归档包装器
+
+        Args:
+            fetcher (Fetcher): 被包装的抓取后端
+            archive (PageArchive): 页面归档
+            meta (dict): 随每个页面记录的信息，如职位名称、筛选条件、结果文件名
+        """
+        self.fetcher = fetcher
+        self.archive = archive
+        self.meta = meta or {}
+
+    def save(self, kind, url, page_html):
+        if not page_html:
+            return
+        try:
+            self.archive.write(kind, url, page_html, **self.meta)
+        except Exception as e:
+            print(f"写入页面归档失败: {e}")
+
+    def fetch_list(self, url):
+        return self.fetcher.fetch_list(url)
+
+    def reload(self, url=None):
+        return self.fetcher.reload(url)
+
+    def expand_list(self):
+        page_html = self.fetcher.expand_list()
+        self.save(LIST_PAGE, self.fetcher.current_url, page_html)
+        return page_html
+
+    def fetch_detail(self, url):
+        page_html = self.fetcher.fetch_detail(url)
+        self.save(DETAIL_PAGE, url, page_html)
+        return page_html
+
+    @property
+    def current_url(self):
+        return self.fetcher.current_url
+
+    def close(self):
+        self.fetcher.close()
+
+
+# 可选的抓取后端
+FETCH_BACKENDS = {
+    'selenium': SeleniumFetcher,
+    'http': HttpFetcher,
+}
+
+
+def create_fetcher(backend='selenium', driver_pool=None, rate_limiter=None, archive=None, archive_meta=None,
+                   cache=None, pacer=default_pacer):
+    """
+    按名称创建抓取后端
+
+    Args:
+        backend (str): 后端名称，'selenium' 或 'http'
+        driver_pool (DriverPool): 浏览器后端使用的WebDriver池，为None时独占一个浏览器
+        rate_limiter (TokenBucket): 共享的令牌桶，提供时对后端的请求限速
+        archive (PageArchive): 页面归档，提供时保存所有用于解析的页面
+        archive_meta (dict): 随每个页面记录的信息
+        cache (ResponseCache): 页面缓存，提供时先查缓存再访问网络
+        pacer (HostPacer): 浏览器后端的请求间隔，默认使用进程内共享的请求间隔；
+            提供令牌桶时由令牌桶统一限速，不再使用请求间隔
+
+    Returns:
+        Fetcher: 抓取后端实例
+    """
+    if backend not in FETCH_BACKENDS:
+        raise ValueError(f"未知的抓取后端: {backend}")
+    if rate_limiter is not None:
+        # 只保留一种限速策略，请求间隔和令牌桶叠加会让详情线程排队
+        pacer = None
+    if backend == 'selenium':
+        fetcher = SeleniumFetcher(driver_pool=driver_pool, pacer=pacer)
+    else:
+        fetcher = FETCH_BACKENDS[backend]()
+    if rate_limiter is not None:
+        fetcher = ThrottledFetcher(fetcher, rate_limiter)
+    if cache is not None:
+        fetcher = CachingFetcher(fetcher, cache)
+    if archive is not None:
+        fetcher = ArchivingFetcher(fetcher, archive, archive_meta)
+    return fetcher
@@ -0,0 +1,182 @@
+import os
+import sqlite3
+import threading
+import time
+import urllib.parse
+import zlib
+
+from archive import LIST_PAGE, DETAIL_PAGE
+from jobparser import SITE_URL, extract_job_id
+
+# 默认的缓存文件，所有职位和所有运行共享
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.boss_spider', 'http_cache.sqlite')
+
+# 不影响页面内容的跟踪参数，生成缓存键时去掉
+TRACKING_PARAMS = {'lid', 'securityId', 'sessionId', 'ka', 'from'}
+
+
+def normalize_url(url):
+    """
+    生成缓存键：详情页只保留职位ID，其他页面统一大小写、去掉锚点和跟踪参数并对参数排序
+
+    Args:
+        url (str): 页面URL
+
+    Returns:
+        str: 规范化后的URL
+    """
+    if '/job_detail/' in url:
+        return f"{SITE_URL}/job_detail/{extract_job_id(url)}.html"
+    parts = urllib.parse.urlsplit(url)
+    query = sorted((key, value) for key, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+                   if key not in TRACKING_PARAMS)
+    return urllib.parse.urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/',
+                                    urllib.parse.urlencode(query), ''))
+
+
+class CachedResponse:
+    """缓存中的一个页面"""
+
+    def __init__(self, url, body, etag, last_modified, fetched_at, fresh):
+        self.url = url
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+        self.fresh = fresh  # 是否仍在有效期内，过期的页面需要重新验证
+
+
+class ResponseCache:
+    """
+    本地页面缓存
+
+    以规范化URL为键保存在SQLite中，列表页和详情页使用不同的有效期。
+    过期的页面保留ETag/Last-Modified，用于条件请求重新验证；
+    总大小超过上限时按最近访问时间淘汰。
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, list_ttl=30 * 60, detail_ttl=7 * 24 * 3600,
+                 max_bytes=512 * 1024 * 1024):
+        """
+        打开（或创建）页面缓存
+
+        Args:
+            path (str): SQLite文件路径
+            list_ttl (float): 列表页有效期(秒)
+            detail_ttl (float): 详情页有效期(秒)
+            max_bytes (int): 缓存的最大字节数（按压缩后的页面大小计算）
+        """
+        self.path = path
+        self.ttls = {LIST_PAGE: list_ttl, DETAIL_PAGE: detail_ttl}
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "url TEXT PRIMARY KEY, kind TEXT, body BLOB, size INTEGER, etag TEXT, "
+                "last_modified TEXT, fetched_at REAL, accessed_at REAL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed_at)")
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, url, kind):
+        """
+        查找缓存的页面
+
+        Args:
+            url (str): 页面URL
+            kind (str): 页面类型，LIST_PAGE 或 DETAIL_PAGE
+
+        Returns:
+            CachedResponse: 缓存的页面，没有缓存时返回None
+        """
+        key = normalize_url(url)
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT body, etag, last_modified, fetched_at FROM responses WHERE url = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            with self.conn:
+                self.conn.execute("UPDATE responses SET accessed_at = ? WHERE url = ?", (now, key))
+        body, etag, last_modified, fetched_at = row
+        fresh = now - fetched_at < self.ttls[kind]
+        if fresh:
+            self.hits += 1
+        return CachedResponse(url, zlib.decompress(body).decode('utf-8'), etag, last_modified, fetched_at, fresh)
+
+    def put(self, url, kind, page_html, etag=None, last_modified=None):
+        """
+        保存页面
+
+        Args:
+            url (str): 页面URL
+            kind (str): 页面类型
+            page_html (str): 页面HTML
+            etag (str): 响应的ETag
+            last_modified (str): 响应的Last-Modified
+        """
+        key = normalize_url(url)
+        body = zlib.compress(page_html.encode('utf-8'), 6)
+        now = time.time()
+        with self.lock:
+            old = self.conn.execute("SELECT size FROM responses WHERE url = ?", (key,)).fetchone()
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO responses (url, kind, body, size, etag, last_modified, fetched_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, kind, body, len(body), etag, last_modified, now, now)
+                )
+            self.total_bytes += len(body) - (old[0] if old else 0)
+            if self.total_bytes > self.max_bytes:
+                self.evict()
+
+    def refresh(self, url):
+        """
+        服务器返回304时，重新开始计算页面的有效期
+
+        Args:
+            url (str): 页面URL
+        """
+        now = time.time()
+        with self.lock:
+            with self.conn:
+                self.conn.execute("UPDATE responses SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                                  (now, now, normalize_url(url)))
+            self.revalidated += 1
+
+    def evict(self):
+        """按最近访问时间淘汰页面，直到总大小降到上限的90%，调用方需持有锁"""
+        target = self.max_bytes * 0.9
+        with self.conn:
+            evicted = []
+            for key, size in self.conn.execute("SELECT url, size FROM responses ORDER BY accessed_at"):
+                if self.total_bytes <= target:
+                    break
+                evicted.append((key,))
+                self.total_bytes -= size
+            self.conn.executemany("DELETE FROM responses WHERE url = ?", evicted)
+        print(f"页面缓存超过上限，淘汰了 {len(evicted)} 个最久未访问的页面")
+
+    def stats(self):
+        """
+        缓存命中统计
+
+        Returns:
+            dict: hits(有效期内命中)/revalidated(304重新验证)/misses(未命中)
+        """
+        return {'hits': self.hits, 'revalidated': self.revalidated, 'misses': self.misses}
+
+    def close(self):
+        """关闭缓存"""
+        with self.lock:
+            self.conn.close()
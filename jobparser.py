@@ -0,0 +1,319 @@
+import re
+import urllib.parse
+from lxml import etree, html as lxml_html
+from segmenter import split_description
+
+# CSV列顺序，与get_job_detail返回的行一一对应
+JOB_COLUMNS = [
+    '职位名称', '薪资', '公司名称', '公司规模', '融资阶段',
+    '所属行业', '工作年限', '学历要求', '职位标签',
+    '工作地址', '职位描述', '岗位职责', '任职要求',
+    '公司福利', '面试地址'
+]
+
+# 渲染文本时需要换行的块级元素
+_BLOCK_TAGS = {'div', 'p', 'li', 'ul', 'ol', 'section', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'dd', 'dt', 'tr'}
+_SPACE_RE = re.compile(r'[ \t\r\f\v 　]+')
+_HIDDEN_RE = re.compile(r'display\s*:\s*none|visibility\s*:\s*hidden')
+
+
+def _has_class(name):
+    """生成匹配class属性的XPath条件，等价于CSS的 .name"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _css(*classes, tail='', relative=False):
+    """
+    将由类名组成的后代选择器编译为XPath
+
+    Args:
+        *classes (str): 依次嵌套的类名，如 ('job-detail', 'name') 对应 '.job-detail .name'
+        tail (str): 追加在末尾的XPath片段，如 '//span'
+        relative (bool): 是否相对于传入的元素查找（用于在卡片内部查找）
+
+    Returns:
+        etree.XPath: 预编译的XPath表达式
+    """
+    path = ''.join(f"//*[{_has_class(c)}]" for c in classes)
+    return etree.XPath(('.' if relative else '') + path + tail)
+
+
+# 详情页选择器，模块加载时一次性编译
+DETAIL_SELECTORS = {
+    'job_detail': _css('job-detail'),
+    'job_name': _css('job-detail', 'name'),
+    'salary': _css('job-detail', 'salary'),
+    'company_name': _css('company-info', 'name'),
+    'company_tags': _css('company-info', 'tag-list', tail='//span'),
+    'job_require_tags': _css('job-detail', 'tag-list', tail='//span'),
+    'job_tags': _css('job-tags', tail='//span'),
+    'address': _css('location-address'),
+    'description': _css('job-detail', 'job-sec-text'),
+    'welfare_tags': _css('job-tags', 'tag-list', tail='//span'),
+    'interview': _css('interview-description'),
+}
+
+# 列表页选择器，卡片内字段均相对于卡片元素查找
+LIST_SELECTORS = {
+    'cards': _css('job-card-wrapper'),
+    'title': _css('job-title', relative=True),
+    'company': _css('company-name', relative=True),
+    'link': _css('job-card-left', relative=True),
+    'salary': _css('salary', relative=True),
+    'area': _css('job-area', relative=True),
+    'tags': _css('tag-list', tail='//li', relative=True),
+    'page_links': _css('options-pages', tail='//a'),
+    'current_page': _css('options-pages', 'selected'),
+}
+
+# 职位链接的站点根地址，用于补全相对链接
+SITE_URL = 'https://www.zhipin.com'
+
+# 页面声明的规范URL
+_CANONICAL_URL = etree.XPath('//link[@rel="canonical"]/@href | //meta[@property="og:url"]/@content')
+
+# 详情页URL中的职位ID，如 /job_detail/3f1a2b....html
+_JOB_ID_RE = re.compile(r'/job_detail/([^/?#]+?)\.html')
+
+
+def extract_job_id(url):
+    """
+    从详情页URL中提取稳定的职位ID
+
+    Args:
+        url (str): 详情页URL
+
+    Returns:
+        str: 职位ID，URL不符合详情页格式时返回去掉查询参数后的URL
+    """
+    match = _JOB_ID_RE.search(url or '')
+    if match:
+        return match.group(1)
+    return (url or '').split('?', 1)[0].split('#', 1)[0]
+
+
+def element_text(element):
+    """
+    获取元素的可见文本，尽量与Selenium的 WebElement.text 保持一致
+
+    <br> 和块级元素转为换行，连续空白折叠为一个空格，并去掉隐藏元素。
+
+    Args:
+        element (lxml.html.HtmlElement): 元素
+
+    Returns:
+        str: 元素文本
+    """
+    parts = []
+
+    def walk(el):
+        tag = el.tag if isinstance(el.tag, str) else ''
+        if _HIDDEN_RE.search(el.get('style', '') or ''):
+            return
+        if tag in ('script', 'style'):
+            return
+        if tag == 'br':
+            parts.append('\n')
+        elif tag in _BLOCK_TAGS:
+            parts.append('\n')
+        if el.text and tag:
+            parts.append(el.text)
+        for child in el:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        if tag in _BLOCK_TAGS:
+            parts.append('\n')
+
+    walk(element)
+    lines = (_SPACE_RE.sub(' ', line).strip() for line in ''.join(parts).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+class JobParser:
+    """
+    BOSS直聘页面解析器
+
+    对整页HTML快照做一次性解析，使用预编译的XPath提取所有字段，
+    避免逐字段调用WebDriver带来的往返开销。
+    """
+
+    def load(self, page_html):
+        """
+        解析HTML文本为文档树
+
+        Args:
+            page_html (str): 页面HTML，也可以是已经解析好的文档根节点
+
+        Returns:
+            lxml.html.HtmlElement: 文档根节点，HTML为空时返回None
+        """
+        if page_html is None or isinstance(page_html, etree._Element):
+            return page_html
+        if not page_html:
+            return None
+        return lxml_html.fromstring(page_html)
+
+    def canonical_url(self, page_html):
+        """
+        获取页面声明的规范URL，用于识别离线保存的页面
+
+        Args:
+            page_html (str): 页面HTML或文档根节点
+
+        Returns:
+            str: 规范URL，页面没有声明时返回空字符串
+        """
+        doc = self.load(page_html)
+        if doc is None:
+            return ''
+        urls = _CANONICAL_URL(doc)
+        return urls[0].strip() if urls else ''
+
+    def first_text(self, doc, key):
+        """
+        获取选择器匹配到的第一个元素的文本
+
+        Args:
+            doc (lxml.html.HtmlElement): 文档根节点
+            key (str): DETAIL_SELECTORS中的选择器名称
+
+        Returns:
+            str: 元素文本，找不到元素时返回空字符串
+        """
+        nodes = DETAIL_SELECTORS[key](doc)
+        return element_text(nodes[0]) if nodes else ''
+
+    def all_texts(self, doc, key):
+        """
+        获取选择器匹配到的所有元素的文本
+
+        Args:
+            doc (lxml.html.HtmlElement): 文档根节点
+            key (str): DETAIL_SELECTORS中的选择器名称
+
+        Returns:
+            list: 元素文本列表
+        """
+        return [element_text(node) for node in DETAIL_SELECTORS[key](doc)]
+
+    def parse_pagination(self, page_html):
+        """
+        解析列表页的分页信息
+
+        Args:
+            page_html (str): 列表页HTML
+
+        Returns:
+            tuple: (当前页码, 页面上出现的最大页码)，找不到时对应值为None
+        """
+        doc = self.load(page_html)
+        if doc is None:
+            return None, None
+
+        def to_int(node):
+            try:
+                return int(element_text(node))
+            except ValueError:
+                return None
+
+        page_numbers = [n for n in map(to_int, LIST_SELECTORS['page_links'](doc)) if n is not None]
+        current_nodes = LIST_SELECTORS['current_page'](doc)
+        current_page = to_int(current_nodes[0]) if current_nodes else None
+        return current_page, max(page_numbers) if page_numbers else None
+
+    def parse_list(self, page_html, base_url=SITE_URL):
+        """
+        一次性解析列表页上的所有职位卡片
+
+        Args:
+            page_html (str): 列表页HTML（如 driver.page_source）
+            base_url (str): 列表页所在URL，用于补全相对的详情链接
+
+        Returns:
+            list: 职位卡片记录列表，每条记录为包含
+                  title/company/href/job_id/salary/area/tags 的字典
+        """
+        doc = self.load(page_html)
+        if doc is None:
+            return []
+
+        cards = []
+        for card in LIST_SELECTORS['cards'](doc):
+            title_nodes = LIST_SELECTORS['title'](card)
+            company_nodes = LIST_SELECTORS['company'](card)
+            link_nodes = LIST_SELECTORS['link'](card)
+            salary_nodes = LIST_SELECTORS['salary'](card)
+            area_nodes = LIST_SELECTORS['area'](card)
+
+            href = link_nodes[0].get('href', '') if link_nodes else ''
+            href = urllib.parse.urljoin(base_url or SITE_URL, href) if href else ''
+            cards.append({
+                'title': element_text(title_nodes[0]) if title_nodes else '',
+                'company': element_text(company_nodes[0]) if company_nodes else '',
+                'href': href,
+                'job_id': extract_job_id(href) if href else '',
+                'salary': element_text(salary_nodes[0]) if salary_nodes else '',
+                'area': element_text(area_nodes[0]) if area_nodes else '',  # 如 "北京·朝阳区·望京"
+                'tags': [element_text(tag) for tag in LIST_SELECTORS['tags'](card)],
+            })
+        return cards
+
+    def parse_detail(self, page_html):
+        """
+        解析职位详情页
+
+        Args:
+            page_html (str): 详情页HTML（如 driver.page_source）
+
+        Returns:
+            list: 与JOB_COLUMNS顺序一致的15列数据，页面不是详情页时返回None
+        """
+        doc = self.load(page_html)
+        if doc is None or not DETAIL_SELECTORS['job_detail'](doc):
+            return None
+
+        job_detail = {}
+
+        # 基本信息
+        job_detail['职位名称'] = self.first_text(doc, 'job_name')
+        job_detail['薪资'] = self.first_text(doc, 'salary')
+        job_detail['公司名称'] = self.first_text(doc, 'company_name')
+
+        # 公司信息
+        company_tags = self.all_texts(doc, 'company_tags')
+        if len(company_tags) >= 3:
+            job_detail['公司规模'] = company_tags[0]
+            job_detail['融资阶段'] = company_tags[1]
+            job_detail['所属行业'] = company_tags[2]
+        else:
+            job_detail['公司规模'] = job_detail['融资阶段'] = job_detail['所属行业'] = ''
+
+        # 职位要求
+        job_tags = self.all_texts(doc, 'job_require_tags')
+        if len(job_tags) >= 2:
+            job_detail['工作年限'] = job_tags[0]
+            job_detail['学历要求'] = job_tags[1]
+        else:
+            job_detail['工作年限'] = job_detail['学历要求'] = ''
+
+        # 职位标签
+        job_detail['职位标签'] = ' '.join(self.all_texts(doc, 'job_tags'))
+
+        # 地址信息
+        job_detail['工作地址'] = self.first_text(doc, 'address')
+
+        # 职位描述
+        desc_text = self.first_text(doc, 'description')
+        job_detail['职位描述'] = desc_text
+
+        # 一次扫描分离岗位职责和任职要求
+        job_detail['岗位职责'], job_detail['任职要求'] = split_description(desc_text)
+
+        # 公司福利
+        job_detail['公司福利'] = ' '.join(self.all_texts(doc, 'welfare_tags'))
+
+        # 面试地址
+        job_detail['面试地址'] = self.first_text(doc, 'interview')
+
+        return [job_detail[column] for column in JOB_COLUMNS]
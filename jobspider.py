@@ -1,16 +1,18 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException
-import time
 import csv
-import random
 import urllib.parse
 import os
+import asyncio
+from jobparser import JobParser
+from fetcher import create_fetcher, open_chrome
+from detailpool import DetailFetchPool
+from ratelimit import TokenBucket
+from pacing import default_pacer
+from scheduler import CrawlScheduler
+from checkpoint import Checkpoint
+from sinks import RowStream, CsvSink, MarkdownSink
+
+# 搜索结果最多显示的页数，达到该页数时后面可能还有职位没有列出
+MAX_LIST_PAGES = 30
 
 class Job:
     """
@@ -28,12 +30,36 @@ class Job:
             name (str): 要搜索的职位名称
         """
         self.name = name
-        self.seen_jobs = set()  # 用于跟踪已经爬取的职位
+        self.seen_jobs = set()  # 本次运行中已经选中的职位ID
         self.target_count = 0  # 目标爬取数量
         self.save_path = os.getcwd()  # 默认保存路径为当前目录
         self.progress_callback = None  # 进度回调函数
         self.consecutive_duplicates = 0  # 连续重复页面计数
         self.max_consecutive_duplicates = 3  # 最大允许连续重复页面数
+        self.parser = JobParser()  # 页面解析器
+        self.fetch_backend = 'selenium'  # 抓取后端，'selenium' 或 'http'
+        self.base_url = "https://www.zhipin.com/web/geek/job"  # 搜索页地址，可指向本地测试服务器
+        self.driver_pool = None  # WebDriver池，设置后从池中借用浏览器而不是自己启动
+        self.detail_workers = 1  # 并发获取详情页的工作线程数
+        self.host_concurrency = 4  # 调度器对同一主机同时进行的最大请求数
+        self.rate_limiter = None  # 所有请求共享的令牌桶
+        self.pacer = default_pacer  # 浏览器访问同一站点的最小间隔，进程内所有职位共享
+        self.detail_pool = None  # 详情页并发抓取池，爬取期间有效
+        self.dedup_index = None  # 持久化去重索引，设置后跳过以往运行中已爬取的职位
+        self.exporters = []  # 额外输出的工厂函数，签名为 factory(job, csv_file, append)
+        self.row_stream = None  # 职位数据流，爬取期间有效
+        self.flush_rows = 100  # CSV累计多少行后刷新缓冲区
+        self.flush_interval = 5.0  # CSV距上次刷新多少秒后刷新缓冲区
+        self.archive = None  # 页面归档，设置后保存所有用于解析的原始页面
+        self.response_cache = None  # 本地页面缓存，设置后先查缓存再访问网络
+        self.watermark_store = None  # 增量爬取的高水位记录，设置后只爬取新发布的职位
+        self.watermark_query = None  # 增量爬取记录中本查询的标识，即结果文件名
+        self.known_ids = set()  # 本查询的高水位，以往成功运行中列表页上出现过的职位ID，用于停止条件
+        self.appended_ids = set()  # 本查询以往已追加到CSV的职位ID，不再获取详情
+        self.listed_ids = set()  # 本次列表页上出现的职位ID，用于推进高水位和判断职位是否已下线
+        self.full_listing = False  # 本次是否完整爬取了全部搜索结果，用于判断职位是否已下线
+        self.live_markdown = True  # 爬取过程中增量生成Markdown，否则爬取结束后从CSV转换
+        self.stop_requested = False  # 用户请求停止，调度器不再调度新的列表页
         
         # 默认筛选条件
         self.city_code = '100010000'  # 默认全国
@@ -47,6 +73,15 @@ class Job:
         self.publish_code = '0'  # 默认不限（发布时间）
         self.latest = False  # 默认不筛选最新发布
         
+    def request_stop(self):
+        """
+        请求停止爬取，可以从其他线程调用
+        
+        正在进行的列表页和已调度的详情页仍会完成，之后不再调度新的列表页，
+        断点保留，可使用断点续爬继续。
+        """
+        self.stop_requested = True
+
     def set_save_path(self, path):
         """
         设置保存路径
@@ -65,6 +100,117 @@ class Job:
         """
         self.progress_callback = callback
 
+    def set_fetch_backend(self, backend):
+        """
+        设置抓取后端
+        
+        Args:
+            backend (str): 'selenium' 使用Chrome浏览器，'http' 使用requests会话
+        """
+        self.fetch_backend = backend
+
+    def set_driver_pool(self, driver_pool):
+        """
+        设置WebDriver池
+        
+        Args:
+            driver_pool (DriverPool): 在多个任务之间共享的浏览器池
+        """
+        self.driver_pool = driver_pool
+
+    def set_dedup_index(self, dedup_index):
+        """
+        设置持久化去重索引
+        
+        Args:
+            dedup_index (DedupIndex): 跨运行、跨职位名称共享的去重索引
+        """
+        self.dedup_index = dedup_index
+
+    def set_archive(self, archive):
+        """
+        设置页面归档
+        
+        Args:
+            archive (PageArchive): 页面归档，为None时不归档
+        """
+        self.archive = archive
+
+    def set_response_cache(self, cache):
+        """
+        设置本地页面缓存，多个职位共享同一个缓存时可以避免重复获取相同的详情页
+        
+        Args:
+            cache (ResponseCache): 页面缓存，为None时不使用缓存
+        """
+        self.response_cache = cache
+
+    def set_incremental(self, watermark_store):
+        """
+        设置增量爬取模式
+        
+        增量模式下结果按发布时间从新到旧排列，已保存过的职位不再获取详情，
+        遇到一整页都是以往成功运行中出现过的职位时立即停止，新职位追加到已有的CSV中。
+        
+        Args:
+            watermark_store (WatermarkStore): 高水位记录，为None时关闭增量模式
+        """
+        self.watermark_store = watermark_store
+
+    def set_concurrency(self, workers=1, requests_per_second=None, rate_limiter=None, host_concurrency=4):
+        """
+        设置详情页并发抓取
+        
+        每个工作线程持有独立的浏览器或HTTP会话，所有请求共享同一个令牌桶。
+        列表页始终使用单独的后端，使用WebDriver池时池的大小至少应为 workers + 1。
+        
+        Args:
+            workers (int): 并发获取详情页的工作线程数
+            requests_per_second (float): 每秒允许的总请求数，None表示不限速
+            rate_limiter (TokenBucket): 与其他任务共享的令牌桶，提供时忽略requests_per_second
+            host_concurrency (int): 同一主机同时进行的最大请求数（列表页和详情页合计），
+                小于 workers + 1 时多出的详情线程会排队等待
+        """
+        self.detail_workers = max(1, int(workers))
+        self.host_concurrency = max(1, int(host_concurrency))
+        if rate_limiter is None and requests_per_second:
+            rate_limiter = TokenBucket(requests_per_second)
+        self.rate_limiter = rate_limiter
+
+    def set_pacing(self, min_interval=None, jitter=None):
+        """
+        设置浏览器访问同一站点的最小间隔
+        
+        页面加载完成与否由实际的页面状态判断，这里只控制礼貌性的请求间隔，
+        页面加载本身花费的时间也计入间隔。设置对进程内所有职位生效。
+        设置了令牌桶（见set_concurrency）时由令牌桶统一限速，请求间隔不生效。
+        
+        Args:
+            min_interval (float): 最小间隔(秒)，0表示不限制
+            jitter (float): 间隔上随机增加的比例
+        """
+        self.pacer.configure(min_interval, jitter)
+
+    def set_flush_policy(self, rows=100, seconds=5.0):
+        """
+        设置CSV缓冲区的刷新阈值，断点写入前总会落盘
+        
+        Args:
+            rows (int): 累计多少行后刷新
+            seconds (float): 距上次刷新多少秒后刷新
+        """
+        self.flush_rows = rows
+        self.flush_interval = seconds
+
+    def add_exporter(self, factory):
+        """
+        添加订阅职位数据流的输出
+        
+        Args:
+            factory (function): 每次爬取时调用 factory(job, csv_file, append) 创建一个RowSink
+        """
+        self.exporters.append(factory)
+
     def set_filter_conditions(self, city_code='100010000', salary_code='0', 
                               experience_code='0', education_code='0',
                               job_type_code='0', scale_code='0', finance_code='0',
@@ -102,311 +248,123 @@ class Job:
         Returns:
             webdriver.Chrome: 配置好的Chrome WebDriver实例
         """
-        options = Options()
-        options.headless = False
-        
-        # 添加更多反爬虫检测的规避选项
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_argument('--disable-infobars')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--ignore-certificate-errors')  # 忽略证书错误
-        options.add_argument('--ignore-ssl-errors')  # 忽略SSL错误
-        options.add_argument('--disable-web-security')  # 禁用网页安全性检查
-        options.add_argument('--allow-running-insecure-content')  # 允许运行不安全内容
-        options.add_argument('--disable-webgl')  # 禁用WebGL
-        options.add_argument('--disable-software-rasterizer')  # 禁用软件光栅化器
-        options.add_argument(f'--window-size={random.randint(1200,1600)},{random.randint(800,1000)}')
-        options.add_argument(f"user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36")
-        
-        # 添加实验性选项
-        options.add_experimental_option('useAutomationExtension', False)
-        options.add_experimental_option('excludeSwitches', ['enable-automation'])
-        
-        # 禁用日志
-        options.add_experimental_option('excludeSwitches', ['enable-logging'])
-        
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=options)
-        
-        # 修改 webdriver 属性
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        
-        # 设置页面加载超时
-        driver.set_page_load_timeout(30)
-        driver.set_script_timeout(30)
-        
-        return driver
+        return open_chrome()
 
-    def save_to_csv(self, data, filename, mode='a'):
+    def open_row_stream(self, filename, append=False):
         """
-        保存数据到CSV文件
+        打开本次爬取的职位数据流，CSV和其他输出都订阅这个数据流
         
         Args:
-            data (list): 要保存的数据列表
             filename (str): CSV文件名
-            mode (str): 文件打开模式，'a'为追加，'w'为覆盖
+            append (bool): 是否追加到已有CSV，否则清空后重写表头
+            
+        Returns:
+            RowStream: 职位数据流
         """
-        try:
-            # 使用完整路径
-            full_path = os.path.join(self.save_path, filename)
-            print(f"准备保存数据到: {full_path}，模式: {mode}")
-            
-            # 确保目录存在
-            os.makedirs(os.path.dirname(os.path.abspath(full_path)), exist_ok=True)
-            
-            # 确保写入UTF-8 with BOM
-            if mode == 'w' or not os.path.exists(full_path):
-                with open(full_path, mode, encoding='utf-8-sig', newline='') as f:
-                    writer = csv.writer(f)
-                    if mode == 'w':
-                        writer.writerow([
-                            '职位名称', '薪资', '公司名称', '公司规模', '融资阶段',
-                            '所属行业', '工作年限', '学历要求', '职位标签',
-                            '工作地址', '职位描述', '岗位职责', '任职要求',
-                            '公司福利', '面试地址'
-                        ])
-                        print(f"已创建CSV文件并写入表头: {full_path}")
-            if data:
-                with open(full_path, 'a', encoding='utf-8-sig', newline='') as f:
-                    writer = csv.writer(f)
-                    writer.writerows(data)
-                print(f"成功写入{len(data)}条数据到: {full_path}")
-        except Exception as e:
-            print(f"保存数据时出错: {e}")
-            # 尝试使用备用方法保存
+        full_path = os.path.join(self.save_path, filename)
+        print(f"准备保存数据到: {full_path}，模式: {'追加' if append else '覆盖'}")
+        stream = RowStream([CsvSink(full_path, append, flush_rows=self.flush_rows, flush_interval=self.flush_interval)])
+        if self.live_markdown:
+            md_full_path = os.path.join(self.save_path, filename.replace('.csv', '.md'))
+            if append and not os.path.exists(md_full_path):
+                # 续爬时Markdown丢失，先从已有CSV补齐再继续追加
+                self.csv_to_markdown(filename)
+            stream.subscribe(MarkdownSink(md_full_path, self.name, append))
+        for factory in self.exporters:
             try:
-                backup_path = os.path.join(os.getcwd(), f"backup_{filename}")
-                print(f"尝试保存到备用路径: {backup_path}")
-                if data:
-                    with open(backup_path, 'a', encoding='utf-8-sig', newline='') as f:
-                        writer = csv.writer(f)
-                        writer.writerows(data)
-                    print(f"成功保存到备用路径: {backup_path}")
-            except Exception as backup_error:
-                print(f"备用保存也失败: {backup_error}")
+                stream.subscribe(factory(self, filename, append))
+            except Exception as e:
+                print(f"创建输出失败: {e}")
+        self.row_stream = stream
+        return stream
+
+    def save_rows(self, rows, cards=None):
+        """
+        保存一批职位数据到当前数据流
+        
+        Args:
+            rows (list): 职位数据行
+            cards (list): 与每行对应的职位卡片信息
+        """
+        self.row_stream.write_rows(rows, cards)
+        print(f"成功写入{len(rows)}条数据")
+
+    def close_row_stream(self):
+        """关闭当前数据流，所有输出落盘"""
+        if self.row_stream is not None:
+            stream, self.row_stream = self.row_stream, None
+            stream.close()
                 
-    def get_job_detail(self, driver, card):
+    def get_job_detail(self, fetcher, job_link):
         """
         获取职位详细信息
         
         Args:
-            driver (webdriver.Chrome): Chrome WebDriver实例
-            card (WebElement): 职位卡片元素
+            fetcher (Fetcher): 页面抓取后端
+            job_link (str): 职位详情页链接
         
         Returns:
             list: 包含职位详细信息的列表，失败时返回None
         """
         try:
-            # 保存主窗口句柄
-            main_window = driver.current_window_handle
-            
-            # 获取职位链接并打开新标签
-            job_link = card.find_element(By.CSS_SELECTOR, '.job-card-left').get_attribute('href')
-            driver.execute_script(f"window.open('{job_link}', '_blank');")
-            self.random_sleep(1, 2)
-            
-            # 切换到新标签
-            new_window = [handle for handle in driver.window_handles if handle != main_window][0]
-            driver.switch_to.window(new_window)
+            page_html = fetcher.fetch_detail(job_link)
+            if not page_html:
+                return None
             
-            # 等待详情页加载
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, 'job-detail'))
-            )
-            
-            # 提取详细信息
-            job_detail = {}
-            
-            # 基本信息
-            job_detail['职位名称'] = self.safe_get_text(driver, '.job-detail .name')
-            job_detail['薪资'] = self.safe_get_text(driver, '.job-detail .salary')
-            job_detail['公司名称'] = self.safe_get_text(driver, '.company-info .name')
-            
-            # 公司信息
-            company_tags = driver.find_elements(By.CSS_SELECTOR, '.company-info .tag-list span')
-            if len(company_tags) >= 3:
-                job_detail['公司规模'] = company_tags[0].text.strip()
-                job_detail['融资阶段'] = company_tags[1].text.strip()
-                job_detail['所属行业'] = company_tags[2].text.strip()
-            else:
-                job_detail['公司规模'] = job_detail['融资阶段'] = job_detail['所属行业'] = ''
-            
-            # 职位要求
-            job_tags = driver.find_elements(By.CSS_SELECTOR, '.job-detail .tag-list span')
-            if len(job_tags) >= 2:
-                job_detail['工作年限'] = job_tags[0].text.strip()
-                job_detail['学历要求'] = job_tags[1].text.strip()
-            else:
-                job_detail['工作年限'] = job_detail['学历要求'] = ''
-            
-            # 职位标签
-            tags = driver.find_elements(By.CSS_SELECTOR, '.job-tags span')
-            job_detail['职位标签'] = ' '.join([tag.text.strip() for tag in tags])
-            
-            # 地址信息
-            job_detail['工作地址'] = self.safe_get_text(driver, '.location-address')
-            
-            # 职位描述
-            desc_text = self.safe_get_text(driver, '.job-detail .job-sec-text')
-            desc_parts = desc_text.split('\n')
-            
-            job_detail['职位描述'] = desc_text
-            job_detail['岗位职责'] = ''
-            job_detail['任职要求'] = ''
-            
-            # 尝试分离岗位职责和任职要求
-            for part in desc_parts:
-                if '岗位职责' in part or '工作职责' in part:
-                    start_idx = desc_parts.index(part)
-                    job_detail['岗位职责'] = '\n'.join(desc_parts[start_idx+1:])
-                elif '任职要求' in part or '职位要求' in part:
-                    start_idx = desc_parts.index(part)
-                    job_detail['任职要求'] = '\n'.join(desc_parts[start_idx+1:])
-            
-            # 公司福利
-            welfare_tags = driver.find_elements(By.CSS_SELECTOR, '.job-tags .tag-list span')
-            job_detail['公司福利'] = ' '.join([tag.text.strip() for tag in welfare_tags])
-            
-            # 面试地址
-            job_detail['面试地址'] = self.safe_get_text(driver, '.interview-description')
-            
-            # 关闭详情页并切回主页面
-            driver.close()
-            driver.switch_to.window(main_window)
-            
-            return [
-                job_detail['职位名称'], job_detail['薪资'], job_detail['公司名称'],
-                job_detail['公司规模'], job_detail['融资阶段'], job_detail['所属行业'],
-                job_detail['工作年限'], job_detail['学历要求'], job_detail['职位标签'],
-                job_detail['工作地址'], job_detail['职位描述'], job_detail['岗位职责'],
-                job_detail['任职要求'], job_detail['公司福利'], job_detail['面试地址']
-            ]
+            # 一次性获取页面快照并离线解析全部字段
+            row = self.parser.parse_detail(page_html)
+            if row is None:
+                print(f"详情页中没有找到职位信息: {job_link}")
+            return row
             
         except Exception as e:
             print(f"获取职位详情时出错: {e}")
-            # 确保返回主窗口
-            try:
-                driver.close()
-                driver.switch_to.window(main_window)
-            except:
-                pass
             return None
 
-    def safe_get_text(self, driver, selector):
-        """
-        安全地获取元素文本
-        
-        Args:
-            driver (webdriver.Chrome): Chrome WebDriver实例
-            selector (str): CSS选择器
-            
-        Returns:
-            str: 元素文本，找不到元素时返回空字符串
-        """
-        try:
-            element = driver.find_element(By.CSS_SELECTOR, selector)
-            return element.text.strip()
-        except:
-            return ''
-        
-    def random_sleep(self, min_time=1, max_time=3):
-        """
-        随机等待时间，避免被检测到爬虫行为
-        
-        Args:
-            min_time (float): 最小等待时间(秒)
-            max_time (float): 最大等待时间(秒)
-        """
-        time.sleep(random.uniform(min_time, max_time))
-        
-    def wait_and_find_element(self, driver, by, value, timeout=10, retries=3):
-        """
-        带重试的元素查找函数
-        
-        Args:
-            driver (webdriver.Chrome): Chrome WebDriver实例
-            by (By): 查找方式
-            value (str): 查找值
-            timeout (int): 每次查找的超时时间(秒)
-            retries (int): 重试次数
-            
-        Returns:
-            WebElement: 查找到的元素
-            
-        Raises:
-            TimeoutException: 找不到元素且重试次数用完时抛出
-        """
-        wait = WebDriverWait(driver, timeout)
-        for i in range(retries):
-            try:
-                return wait.until(EC.presence_of_element_located((by, value)))
-            except TimeoutException:
-                if i == retries - 1:
-                    raise
-                print(f"尝试第 {i+1} 次查找元素 {value}...")
-                self.random_sleep(2, 4)
-
-    def get_total_pages(self, driver):
+    def get_total_pages(self, page_html):
         """
         获取搜索结果的总页数
         
         Args:
-            driver (webdriver.Chrome): Chrome WebDriver实例
+            page_html (str): 列表页HTML
             
         Returns:
             int: 总页数，失败时返回1
         """
         try:
-            # 等待页码元素加载
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, '.options-pages'))
-            )
-            
-            # 获取所有页码链接
-            page_links = driver.find_elements(By.CSS_SELECTOR, '.options-pages a')
-            if not page_links:
+            _, total_pages = self.parser.parse_pagination(page_html)
+            if total_pages is None:
                 print("未找到分页链接")
                 return 1
-                
-            # 获取最后一个数字页码
-            total_pages = 1
-            for link in page_links:
-                try:
-                    page_num = int(link.text.strip())
-                    if page_num > total_pages:
-                        total_pages = page_num
-                except ValueError:
-                    continue
             
             print(f"共有 {total_pages} 页搜索结果")
-            return min(total_pages, 30)  # BOSS直聘最多显示30页
+            return min(total_pages, MAX_LIST_PAGES)  # BOSS直聘最多显示30页
         
         except Exception as e:
             print(f"获取总页数失败: {e}")
             return 1
 
-    def verify_page_loaded(self, driver, expected_page):
+    def verify_page_loaded(self, page_html, expected_page):
         """
         验证页面是否正确加载
         
         Args:
-            driver (webdriver.Chrome): Chrome WebDriver实例
+            page_html (str): 列表页HTML
             expected_page (int): 期望的页码
             
         Returns:
             bool: 页面是否正确加载
         """
         try:
-            # 等待职位卡片加载
-            WebDriverWait(driver, 15).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, '.job-card-wrapper'))
-            )
+            # 验证职位卡片已加载
+            if not self.parser.parse_list(page_html):
+                print("页面加载验证失败：没有找到职位卡片")
+                return False
             
-            # 验证当前页码
-            current_page_elem = driver.find_element(By.CSS_SELECTOR, '.options-pages .selected')
-            current_page = int(current_page_elem.text.strip())
+            # 验证当前页码，只有一页结果时页面上可能没有分页
+            current_page, _ = self.parser.parse_pagination(page_html)
+            if current_page is None:
+                return expected_page == 1
             
             if current_page != expected_page:
                 print(f"页面加载验证失败：期望第{expected_page}页，实际第{current_page}页")
@@ -422,130 +380,139 @@ class Job:
         """
         将CSV文件转换为Markdown格式
         
+        边读CSV边写Markdown，内存占用与职位数量无关。
+        
         Args:
             csv_file (str): CSV文件名
         """
+        # 使用完整路径
+        csv_full_path = os.path.join(self.save_path, csv_file)
+        md_file = csv_file.replace('.csv', '.md')
+        md_full_path = os.path.join(self.save_path, md_file)
+        
+        print(f"准备将CSV转换为Markdown: {csv_full_path} -> {md_full_path}")
+        
+        if not os.path.exists(csv_full_path):
+            print(f"错误: CSV文件不存在: {csv_full_path}")
+            return
+        
+        sink = None
         try:
-            # 使用完整路径
-            csv_full_path = os.path.join(self.save_path, csv_file)
-            md_file = csv_file.replace('.csv', '.md')
-            md_full_path = os.path.join(self.save_path, md_file)
-            
-            print(f"准备将CSV转换为Markdown: {csv_full_path} -> {md_full_path}")
-            
-            if not os.path.exists(csv_full_path):
-                print(f"错误: CSV文件不存在: {csv_full_path}")
-                return
-                
-            # 确保目录存在
-            os.makedirs(os.path.dirname(os.path.abspath(md_full_path)), exist_ok=True)
-            
-            with open(csv_full_path, 'r', encoding='utf-8-sig') as f:
+            with open(csv_full_path, 'r', encoding='utf-8-sig', newline='') as f:
                 reader = csv.reader(f)
-                headers = next(reader)  # 读取表头
+                next(reader, None)  # 跳过表头
                 print(f"成功读取CSV文件: {csv_full_path}")
                 
-                # 准备markdown内容
-                md_content = []
-                
-                # 添加标题
-                md_content.append(f"# {self.name}职位信息\n")
-                
-                # 遍历每个职位
+                sink = MarkdownSink(md_full_path, self.name)
                 row_count = 0
-                rows = list(reader)  # 提前读取所有行到列表中
-                for row in rows:
+                for row in reader:
                     row_count += 1
                     if len(row) < 15:  # 防止索引越界
                         print(f"警告: 行 {row_count} 数据不完整，仅包含 {len(row)} 个字段")
                         continue
-                        
-                    md_content.append(f"## {row[0]} - {row[2]}\n")  # 职位名称和公司名称作为二级标题
-                    
-                    # 添加基本信息表格
-                    md_content.append("### 基本信息\n")
-                    md_content.append("| 项目 | 内容 |")
-                    md_content.append("|------|------|")
-                    md_content.append(f"| 薪资 | {row[1]} |")
-                    md_content.append(f"| 公司规模 | {row[3]} |")
-                    md_content.append(f"| 融资阶段 | {row[4]} |")
-                    md_content.append(f"| 所属行业 | {row[5]} |")
-                    md_content.append(f"| 工作年限 | {row[6]} |")
-                    md_content.append(f"| 学历要求 | {row[7]} |")
-                    md_content.append(f"| 工作地址 | {row[9]} |")
-                    md_content.append("")
-                    
-                    # 添加职位标签
-                    if row[8]:  # 职位标签
-                        md_content.append("### 职位标签")
-                        md_content.append(f"{row[8]}\n")
-                    
-                    # 添加职位描述
-                    if row[10]:  # 职位描述
-                        md_content.append("### 职位描述")
-                        md_content.append(f"{row[10]}\n")
-                    
-                    # 添加岗位职责
-                    if row[11]:  # 岗位职责
-                        md_content.append("### 岗位职责")
-                        md_content.append(f"{row[11]}\n")
-                    
-                    # 添加任职要求
-                    if row[12]:  # 任职要求
-                        md_content.append("### 任职要求")
-                        md_content.append(f"{row[12]}\n")
-                    
-                    # 添加公司福利
-                    if row[13]:  # 公司福利
-                        md_content.append("### 公司福利")
-                        md_content.append(f"{row[13]}\n")
-                    
-                    # 添加面试地址
-                    if row[14]:  # 面试地址
-                        md_content.append("### 面试地址")
-                        md_content.append(f"{row[14]}\n")
-                    
-                    # 添加分隔线
-                    md_content.append("---\n")
+                    sink.write_rows([row])
                 
                 print(f"处理了 {row_count} 条职位记录")
-                
-                # 如果没有职位记录，添加提示信息
-                if row_count == 0:
-                    md_content.append("*没有找到职位记录*\n")
-                
-                # 写入markdown文件
-                with open(md_full_path, 'w', encoding='utf-8') as md:
-                    md.write('\n'.join(md_content))
-                
+                sink.close()
                 print(f"已成功将数据转换为Markdown格式并保存到 {md_full_path}")
                 
         except Exception as e:
             print(f"转换为Markdown格式时出错: {e}")
+            if sink is not None:
+                try:
+                    sink.close()
+                except Exception:
+                    pass
             # 尝试保存到备用位置
             try:
-                backup_md_path = os.path.join(os.getcwd(), f"backup_{csv_file.replace('.csv', '.md')}")
+                backup_md_path = os.path.join(os.getcwd(), f"backup_{md_file}")
                 print(f"尝试将Markdown保存到备用位置: {backup_md_path}")
                 with open(backup_md_path, 'w', encoding='utf-8') as f:
-                    f.write('\n'.join(md_content) if 'md_content' in locals() else f"# {self.name}职位信息\n\n转换失败，请检查CSV文件")
+                    f.write(f"# {self.name}职位信息\n\n转换失败，请检查CSV文件")
                 print(f"已成功保存Markdown到备用位置: {backup_md_path}")
             except Exception as backup_error:
                 print(f"备用保存Markdown也失败: {backup_error}")
 
-    def give_me_job(self, mode, count):
+    def get_filter_state(self):
+        """
+        获取当前的筛选条件
+        
+        Returns:
+            dict: 筛选条件名称到代码的映射
+        """
+        return {
+            'city': self.city_code,
+            'salary': self.salary_code,
+            'experience': self.experience_code,
+            'education': self.education_code,
+            'job_type': self.job_type_code,
+            'scale': self.scale_code,
+            'finance': self.finance_code,
+            'position': self.position_code,
+            'publish': self.publish_code,
+            'latest': self.latest,
+        }
+
+    def get_csv_filename(self):
+        """
+        获取带有筛选条件标识的CSV文件名
+        
+        Returns:
+            str: CSV文件名
+        """
+        filter_info = []
+        if self.city_code != '100010000':
+            filter_info.append(f"城市_{self.city_code}")
+        if self.salary_code != '0':
+            filter_info.append(f"薪资_{self.salary_code}")
+        if self.experience_code != '0':
+            filter_info.append(f"经验_{self.experience_code}")
+        if self.education_code != '0':
+            filter_info.append(f"学历_{self.education_code}")
+        if self.job_type_code != '0':
+            filter_info.append(f"类型_{self.job_type_code}")
+        if self.scale_code != '0':
+            filter_info.append(f"规模_{self.scale_code}")
+        if self.finance_code != '0':
+            filter_info.append(f"融资_{self.finance_code}")
+        if self.position_code != '0':
+            filter_info.append(f"职位_{self.position_code}")
+        if self.publish_code != '0':
+            filter_info.append(f"发布_{self.publish_code}")
+        if self.latest:
+            filter_info.append("最新发布")
+            
+        if filter_info:
+            return rf'{self.name}_{"_".join(filter_info)}.csv'
+        return rf'{self.name}.csv'
+
+    def give_me_job(self, mode, count, resume=False):
         """
         开始爬取职位信息
         
         Args:
             mode (str): 爬取模式，'按页爬取'/'按数量爬取'/'全部爬取'
             count (int): 爬取页数或爬取数量
+            resume (bool): 是否从上次中断的断点继续爬取
+            
+        Returns:
+            int: 保存到结果文件中的职位数（续爬时包括断点之前的职位），爬取失败时返回None
         """
         self.target_count = count  # 设置目标爬取数量
-        driver = self.open_chrome()
+        self.full_listing = False
+        self.listed_ids = set()
+        if self.watermark_store is not None and not self.latest:
+            # 增量爬取依赖从新到旧的排序
+            print("增量爬取模式下自动启用最新发布排序")
+            self.latest = True
+        fetcher = None
         try:
+            fetcher = self.create_fetcher()
+            # 详情页由独立的后端获取，列表页加载可以与详情获取同时进行
+            self.detail_pool = DetailFetchPool(self.create_fetcher, self.detail_workers)
             # 构建基础URL
             encoded_name = urllib.parse.quote(self.name)
-            base_url = f"https://www.zhipin.com/web/geek/job"
+            base_url = self.base_url
             
             # 构建带有筛选条件的URL
             filter_params = []
@@ -594,11 +561,10 @@ class Job:
             # 访问第一页
             first_page_url = f"{base_url}?query={encoded_name}&{params}"
             print(f"搜索URL: {first_page_url}")
-            driver.get(first_page_url)
-            self.random_sleep(3, 5)
+            page_html = fetcher.fetch_list(first_page_url)
 
             # 获取总页数
-            total_pages = self.get_total_pages(driver)
+            total_pages = self.get_total_pages(page_html)
             print(f"准备爬取数据")
             
             # 估算每页职位数和总职位数
@@ -625,94 +591,88 @@ class Job:
                     'percentage': 0
                 })
 
-            csv_file = rf'{self.name}.csv'
-            # 创建或清空CSV文件，并写入表头
-            self.save_to_csv(None, csv_file, 'w')
-            
             # 在文件名中添加筛选条件标识
-            filter_info = []
-            if self.city_code != '100010000':
-                filter_info.append(f"城市_{self.city_code}")
-            if self.salary_code != '0':
-                filter_info.append(f"薪资_{self.salary_code}")
-            if self.experience_code != '0':
-                filter_info.append(f"经验_{self.experience_code}")
-            if self.education_code != '0':
-                filter_info.append(f"学历_{self.education_code}")
-            if self.job_type_code != '0':
-                filter_info.append(f"类型_{self.job_type_code}")
-            if self.scale_code != '0':
-                filter_info.append(f"规模_{self.scale_code}")
-            if self.finance_code != '0':
-                filter_info.append(f"融资_{self.finance_code}")
-            if self.position_code != '0':
-                filter_info.append(f"职位_{self.position_code}")
-            if self.publish_code != '0':
-                filter_info.append(f"发布_{self.publish_code}")
-            if self.latest:
-                filter_info.append("最新发布")
-                
-            if filter_info:
-                csv_file = rf'{self.name}_{"_".join(filter_info)}.csv'
-                # 重新创建有筛选条件的CSV文件
-                self.save_to_csv(None, csv_file, 'w')
-
-            consecutive_duplicates = 0
-            max_consecutive_duplicates = 3
+            csv_file = self.get_csv_filename()
+            
+            # 断点续爬：筛选条件和爬取模式一致时从断点继续，并追加写入已有CSV
+            checkpoint = Checkpoint.for_csv(self.save_path, csv_file)
+            checkpoint_base = {
+                'name': self.name,
+                'mode': mode,
+                'count': count,
+                'filters': self.get_filter_state(),
+            }
+            state = checkpoint.load() if resume else None
+            if state and any(state.get(key) != value for key, value in checkpoint_base.items()):
+                print("断点的筛选条件或爬取模式与本次不一致，重新开始爬取")
+                state = None
+            if state and not os.path.exists(os.path.join(self.save_path, csv_file)):
+                print("断点对应的CSV文件不存在，重新开始爬取")
+                state = None
+            
+            if state:
+                print(f"从断点恢复：第 {state['page']} 页，已保存 {len(state['saved_ids'])} 个职位")
+                self.seen_jobs.update(state['saved_ids'])
+            
+            # 增量爬取：读取本查询的高水位和以往已保存的职位
+            append = bool(state)
+            if self.watermark_store is not None:
+                self.watermark_query = csv_file
+                self.known_ids = self.watermark_store.known_ids(csv_file)
+                self.appended_ids = self.watermark_store.saved_ids(csv_file)
+                if (self.known_ids or self.appended_ids) and os.path.exists(os.path.join(self.save_path, csv_file)):
+                    print(f"增量爬取：已有 {len(self.appended_ids)} 个职位，只获取新发布的职位")
+                    append = True
+                else:
+                    print("首次增量爬取，将完整爬取并建立基线")
+                    self.known_ids = set()
+                    self.appended_ids = set()
+            # 打开数据流，恢复或增量爬取时追加，否则创建或清空CSV文件并写入表头
+            self.open_row_stream(csv_file, append=append)
 
+            # 三种爬取模式作为调度器的停止条件
             if mode == '按页爬取':
-                # 限制爬取页数
-                pages_to_scrape = min(count, total_pages)
-                print(f"将爬取 {pages_to_scrape} 页数据")
-                total_saved_jobs = 0
-                for page in range(1, pages_to_scrape + 1):
-                    jobs_on_page = self.scrape_page(driver, page, csv_file, encoded_name, base_url, total_pages, is_page_mode=True, target_jobs=target_jobs, params=params)
-                    total_saved_jobs += jobs_on_page
-                    if jobs_on_page == 0:  # 如果这一页没爬到数据，考虑停止
-                        consecutive_duplicates += 1
-                        if consecutive_duplicates >= max_consecutive_duplicates:
-                            print("连续多页都没有数据，停止爬取")
-                            break
-                    else:
-                        consecutive_duplicates = 0
-                print(f"按页爬取完成，共获取 {total_saved_jobs} 个职位")
+                print(f"将爬取 {min(count, total_pages)} 页数据")
             elif mode == '全部爬取':
-                # 爬取所有页面的所有职位
                 print(f"将爬取所有页面的所有职位，共 {total_pages} 页")
-                for page in range(1, total_pages + 1):
-                    if not self.scrape_page(driver, page, csv_file, encoded_name, base_url, total_pages, target_jobs=target_jobs, params=params):
-                        break
             else:  # 按数量爬取
                 print(f"将爬取 {count} 个职位")
-                for page in range(1, total_pages + 1):
-                    if len(self.seen_jobs) >= count:
-                        print(f"已达到目标数量: {count}")
-                        # 更新最终进度
-                        if self.progress_callback:
-                            self.progress_callback({
-                                'status': '爬取完成',
-                                'total_pages': total_pages,
-                                'current_page': page,
-                                'scraped_jobs': len(self.seen_jobs),
-                                'target_jobs': self.target_count,
-                                'percentage': 100
-                            })
-                        break
-                    if not self.scrape_page(driver, page, csv_file, encoded_name, base_url, total_pages, target_jobs=target_jobs, params=params):
-                        break
+            
+            scheduler = CrawlScheduler(
+                self, fetcher, self.detail_pool,
+                lambda page: f"{base_url}?query={encoded_name}&{params}&page={page}",
+                csv_file, total_pages, mode, count, target_jobs, first_page_html=page_html,
+                checkpoint=checkpoint, checkpoint_base=checkpoint_base,
+                start_page=state['page'] if state else 1,
+                saved_ids=state['saved_ids'] if state else (),
+                consecutive_empty=state.get('consecutive_empty', 0) if state else 0,
+                host_concurrency=self.host_concurrency
+            )
+            total_saved_jobs = asyncio.run(scheduler.run())
+            print(f"{mode}完成，共获取 {total_saved_jobs} 个职位")
+            # 提前停止、有页面或任务失败、或结果超过了网站显示的页数时，没出现的职位不一定已下线
+            self.full_listing = (mode == '全部爬取' and not scheduler.stopped and not append
+                                 and not scheduler.failed_tasks and total_pages < MAX_LIST_PAGES)
+            self.close_row_stream()
+            if self.stop_requested:
+                # 用户中途停止的运行不完整，保留断点，也不推进高水位
+                print("爬取已停止，已爬取的数据和断点已保存，可使用断点续爬继续")
+            else:
+                checkpoint.clear()
+                if self.watermark_store is not None:
+                    self.watermark_store.advance(csv_file, self.listed_ids)
 
             print(f"\n爬取完成！共获取了 {len(self.seen_jobs)} 个不重复的职位详情")
             # 确保进度显示100%
             if self.progress_callback:
                 self.progress_callback({
-                    'status': '爬取完成',
+                    'status': '爬取已停止' if self.stop_requested else '爬取完成',
                     'total_pages': total_pages,
                     'current_page': total_pages,
                     'scraped_jobs': len(self.seen_jobs),
                     'target_jobs': target_jobs if len(self.seen_jobs) < target_jobs else len(self.seen_jobs),
                     'percentage': 100
                 })
-            driver.quit()
             
             # 确保数据已保存
             print(f"最终检查CSV文件: {os.path.join(self.save_path, csv_file)}")
@@ -730,253 +690,200 @@ class Job:
             except Exception as e:
                 print(f"检查CSV文件时出错: {e}")
             
-            # 将CSV转换为Markdown格式
-            self.csv_to_markdown(csv_file)
+            # 未增量生成Markdown时，将CSV转换为Markdown格式
+            if not self.live_markdown:
+                self.csv_to_markdown(csv_file)
+            return total_saved_jobs
             
         except Exception as e:
             print(f"爬取失败: {e}")
+            try:
+                self.close_row_stream()
+            except Exception as close_error:
+                print(f"关闭数据流失败: {close_error}")
+            print("已爬取的数据和断点已保存，可使用断点续爬继续")
             if self.progress_callback:
                 self.progress_callback({
                     'status': f'爬取失败: {e}',
                     'percentage': 0
                 })
-            driver.quit()
+        finally:
+            # 创建后端或抓取池失败时也要释放已借出的浏览器
+            self.close_fetchers(fetcher)
 
-    def scrape_page(self, driver, page, csv_file, encoded_name, base_url, total_pages, is_page_mode=False, target_jobs=0, params=""):
+    def create_fetcher(self):
         """
-        爬取单个页面的数据
+        按当前设置创建一个抓取后端
+        
+        Returns:
+            Fetcher: 抓取后端实例
+        """
+        archive_meta = {
+            'name': self.name,
+            'filters': self.get_filter_state(),
+            'source': self.get_csv_filename(),
+        }
+        return create_fetcher(self.fetch_backend, self.driver_pool, self.rate_limiter,
+                              self.archive, archive_meta, self.response_cache, self.pacer)
+
+    def close_fetchers(self, fetcher):
+        """
+        关闭本次爬取使用的抓取后端和详情页并发抓取池
         
         Args:
-            driver (webdriver.Chrome): Chrome WebDriver实例
-            page (int): 页码
-            csv_file (str): CSV文件名
-            encoded_name (str): URL编码后的职位名称
-            base_url (str): 基础URL
+            fetcher (Fetcher): 列表页使用的抓取后端，尚未创建时为None
+        """
+        if self.detail_pool is not None:
+            self.detail_pool.close()
+            self.detail_pool = None
+        if fetcher is not None:
+            fetcher.close()
+
+    def report_progress(self, status, total_pages, current_page, target_jobs, scraped_jobs=None, **extra):
+        """
+        通过进度回调函数报告爬取进度
+        
+        Args:
+            status (str): 状态文本
             total_pages (int): 总页数
-            is_page_mode (bool): 是否为按页爬取模式
+            current_page (int): 当前页码
             target_jobs (int): 目标职位数
-            params (str): URL参数字符串
+            scraped_jobs (int): 已爬取职位数，默认为已见过的职位数
+            **extra: 其他需要传给回调函数的字段
+        """
+        if not self.progress_callback:
+            return
+        if scraped_jobs is None:
+            scraped_jobs = len(self.seen_jobs)
+        # 使用职位数而不是页数计算进度
+        percentage = min(100, int((scraped_jobs / target_jobs) * 100) if target_jobs > 0 else 0)
+        progress = {
+            'status': status,
+            'total_pages': total_pages,
+            'current_page': current_page,
+            'scraped_jobs': scraped_jobs,
+            'target_jobs': target_jobs,
+            'percentage': percentage
+        }
+        progress.update(extra)
+        self.progress_callback(progress)
+
+    def load_list_page(self, fetcher, page_url, page, page_html=None, reload=False):
+        """
+        加载列表页并解析出所有职位卡片
+        
+        Args:
+            fetcher (Fetcher): 列表页使用的抓取后端
+            page_url (str): 列表页URL
+            page (int): 页码
+            page_html (str): 已经加载好的页面HTML，为None时重新加载
+            reload (bool): 是否为失败后的重试，重试时绕过缓存重新加载
             
         Returns:
-            int/bool: 按页模式下返回爬取的职位数量，非按页模式下返回是否继续爬取
+            list: 职位卡片记录列表，页面加载失败时返回None
         """
-        try:
-            # 构建完整的URL
-            page_url = f"{base_url}?query={encoded_name}&{params}&page={page}"
+        if page_html is None and reload:
+            print(f"\n重新加载第 {page} 页: {page_url}")
+            page_html = fetcher.reload(page_url)
+        elif page_html is None:
             print(f"\n正在访问第 {page} 页: {page_url}")
-            
-            # 更新进度状态为正在访问页面
-            if self.progress_callback:
-                # 使用职位数而不是页数计算进度
-                percentage = min(100, int((len(self.seen_jobs) / target_jobs) * 100) if target_jobs > 0 else 0)
-                
-                self.progress_callback({
-                    'status': f'正在爬取第 {page}/{total_pages} 页',
-                    'total_pages': total_pages,
-                    'current_page': page,
-                    'scraped_jobs': len(self.seen_jobs),
-                    'target_jobs': target_jobs,
-                    'percentage': percentage
-                })
-            
-            # 访问页面
-            driver.get(page_url)
-            self.random_sleep(3, 5)
-            
-            # 验证页面是否正确加载
-            retry_count = 0
-            while retry_count < 3:
-                if self.verify_page_loaded(driver, page):
-                    break
-                retry_count += 1
-                # 更新进度状态为重试加载页面
-                if self.progress_callback:
-                    percentage = min(100, int((len(self.seen_jobs) / target_jobs) * 100) if target_jobs > 0 else 0)
-                    self.progress_callback({
-                        'status': f'第 {retry_count} 次重试加载第 {page}/{total_pages} 页',
-                        'total_pages': total_pages,
-                        'current_page': page,
-                        'scraped_jobs': len(self.seen_jobs),
-                        'target_jobs': target_jobs,
-                        'percentage': percentage
-                    })
-                if retry_count < 3:
-                    print(f"第 {retry_count} 次重试加载页面...")
-                    driver.refresh()
-                    self.random_sleep(3, 5)
-            
-            if retry_count == 3:
-                print(f"页面 {page} 加载失败，停止爬取")
-                if self.progress_callback:
-                    percentage = min(100, int((len(self.seen_jobs) / target_jobs) * 100) if target_jobs > 0 else 0)
-                    self.progress_callback({
-                        'status': f'页面 {page}/{total_pages} 加载失败',
-                        'total_pages': total_pages,
-                        'current_page': page,
-                        'scraped_jobs': len(self.seen_jobs),
-                        'target_jobs': target_jobs,
-                        'percentage': percentage
-                    })
-                return 0 if is_page_mode else False
-
-            # 随机滚动
-            for _ in range(3):
-                scroll_height = random.randint(300, 700)
-                driver.execute_script(f"window.scrollBy(0, {scroll_height});")
-                self.random_sleep(0.5, 1.5)
-            
-            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            self.random_sleep(2, 4)
-
-            # 获取职位卡片
-            job_cards = driver.find_elements(By.CSS_SELECTOR, '.job-card-wrapper')
-
-            if not job_cards:
-                print(f"第 {page} 页没有找到职位，尝试重新加载")
-                if self.progress_callback:
-                    percentage = min(100, int((len(self.seen_jobs) / target_jobs) * 100) if target_jobs > 0 else 0)
-                    self.progress_callback({
-                        'status': f'第 {page}/{total_pages} 页没有找到职位，正在重试',
-                        'total_pages': total_pages,
-                        'current_page': page,
-                        'scraped_jobs': len(self.seen_jobs),
-                        'target_jobs': target_jobs,
-                        'percentage': percentage
-                    })
-                driver.refresh()
-                self.random_sleep(3, 5)
-                job_cards = driver.find_elements(By.CSS_SELECTOR, '.job-card-wrapper')
-                if not job_cards:
-                    print("重试后仍未找到职位，停止爬取")
-                    if self.progress_callback:
-                        percentage = min(100, int((len(self.seen_jobs) / target_jobs) * 100) if target_jobs > 0 else 0)
-                        self.progress_callback({
-                            'status': f'重试后第 {page}/{total_pages} 页仍未找到职位',
-                            'total_pages': total_pages,
-                            'current_page': page,
-                            'scraped_jobs': len(self.seen_jobs),
-                            'target_jobs': target_jobs,
-                            'percentage': percentage
-                        })
-                    return 0 if is_page_mode else False
-
-            # 更新进度状态为正在解析职位
-            if self.progress_callback:
-                percentage = min(100, int((len(self.seen_jobs) / target_jobs) * 100) if target_jobs > 0 else 0)
-                self.progress_callback({
-                    'status': f'正在解析第 {page}/{total_pages} 页的 {len(job_cards)} 个职位',
-                    'total_pages': total_pages,
-                    'current_page': page,
-                    'scraped_jobs': len(self.seen_jobs),
-                    'target_jobs': target_jobs,
-                    'job_cards_on_page': len(job_cards),
-                    'percentage': percentage
-                })
+            page_html = fetcher.fetch_list(page_url)
+        
+        # 验证页面是否正确加载
+        if not self.verify_page_loaded(page_html, page):
+            return None
+        
+        # 触发懒加载（浏览器后端会随机滚动页面）
+        page_html = fetcher.expand_list()
+        
+        # 一次性读取页面快照，解析出所有职位卡片
+        job_cards = self.parser.parse_list(page_html, fetcher.current_url)
+        if not job_cards:
+            print(f"第 {page} 页没有找到职位")
+            return None
+        return job_cards
 
-            new_data_found = False
-            new_rows = []
+    def select_new_cards(self, job_cards, page, total_pages, max_jobs=None):
+        """
+        对职位卡片去重，返回需要获取详情的新职位
+        
+        以详情页URL中的职位ID为键，先检查本次运行已选中的职位，
+        再检查持久化去重索引中以往运行已爬取的职位。
+        
+        Args:
+            job_cards (list): 职位卡片记录列表
+            page (int): 页码
+            total_pages (int): 总页数
+            max_jobs (int): 最多选择到的职位总数，None表示不限制
             
-            job_card_counter = 0
-            for card in job_cards:
-                job_card_counter += 1
-                try:
-                    job_title = card.find_element(By.CSS_SELECTOR, '.job-title').text.strip()
-                    company = card.find_element(By.CSS_SELECTOR, '.company-name').text.strip()
-                    job_key = f"{job_title}_{company}"
-                    
-                    # 仅在控制台输出当前处理的职位信息，不更新UI进度
-                    print(f"正在处理第 {page}/{total_pages} 页的第 {job_card_counter}/{len(job_cards)} 个职位: {job_title}")
-                    
-                    if job_key not in self.seen_jobs:
-                        self.seen_jobs.add(job_key)
-                        job_detail = self.get_job_detail(driver, card)
-                        if job_detail:
-                            new_data_found = True
-                            new_rows.append(job_detail)
-                            print(f"成功获取职位详情: {job_title}")
-                            
-                            # 每获取一个新职位就更新进度
-                            if self.progress_callback:
-                                # 直接使用已爬取职位数/目标职位数计算进度百分比
-                                percentage = min(100, int((len(self.seen_jobs) / target_jobs) * 100) if target_jobs > 0 else 0)
-                                self.progress_callback({
-                                    'status': f'已获取 {len(self.seen_jobs)} 个职位信息 (第 {page}/{total_pages} 页)',
-                                    'total_pages': total_pages,
-                                    'current_page': page,
-                                    'scraped_jobs': len(self.seen_jobs),
-                                    'target_jobs': target_jobs,
-                                    'percentage': percentage
-                                })
-                            
-                            # 在按页爬取模式下，不检查职位数量限制
-                            if not is_page_mode and len(self.seen_jobs) >= self.target_count:
-                                print(f"已达到目标数量: {self.target_count}")
-                                # 保存爬取到的最后一批数据
-                                if new_rows:
-                                    self.save_to_csv(new_rows, csv_file)
-                                    print(f"保存最后一批数据，共 {len(new_rows)} 条")
-                                return 0 if is_page_mode else False
-                    
-                except Exception as e:
-                    print(f"处理职位卡片时出错: {e}")
-                    continue
-
-            if new_rows:
-                self.save_to_csv(new_rows, csv_file)
-                print(f"第 {page} 页爬取完成，获取并保存了 {len(new_rows)} 个职位详情")
-                # 更新进度状态为页面爬取完成
-                if self.progress_callback:
-                    percentage = min(100, int((len(self.seen_jobs) / target_jobs) * 100) if target_jobs > 0 else 0)
-                    self.progress_callback({
-                        'status': f'第 {page}/{total_pages} 页完成，本页获取 {len(new_rows)} 个职位，总计 {len(self.seen_jobs)} 个',
-                        'total_pages': total_pages,
-                        'current_page': page,
-                        'scraped_jobs': len(self.seen_jobs),
-                        'new_jobs': len(new_rows),
-                        'target_jobs': target_jobs,
-                        'percentage': percentage
-                    })
-                # 如果这是按页爬取，返回这一页获取到的职位数
-                if is_page_mode:
-                    return len(new_rows)
-
-            if not is_page_mode and not new_data_found:
-                self.consecutive_duplicates += 1
-                print(f"第 {page} 页没有新数据")
-                if self.consecutive_duplicates >= self.max_consecutive_duplicates:
-                    print("连续多页都是重复数据，停止爬取")
-                    # 更新进度状态为重复数据停止爬取
-                    if self.progress_callback:
-                        percentage = min(100, int((len(self.seen_jobs) / target_jobs) * 100) if target_jobs > 0 else 0)
-                        self.progress_callback({
-                            'status': f'连续多页都是重复数据，停止爬取',
-                            'total_pages': total_pages,
-                            'current_page': page,
-                            'scraped_jobs': len(self.seen_jobs),
-                            'target_jobs': self.target_count,
-                            'percentage': percentage
-                        })
-                    return 0 if is_page_mode else False
-            else:
-                self.consecutive_duplicates = 0
+        Returns:
+            list: 需要获取详情的职位卡片
+        """
+        new_cards = []
+        job_card_counter = 0
+        for card in job_cards:
+            job_card_counter += 1
+            job_title = card['title']
+            job_key = card['job_id']
+            
+            # 仅在控制台输出当前处理的职位信息，不更新UI进度
+            print(f"正在处理第 {page}/{total_pages} 页的第 {job_card_counter}/{len(job_cards)} 个职位: {job_title}")
+            
+            if not card['href']:
+                print(f"职位卡片缺少详情链接，跳过: {job_title}")
+                continue
+            
+            if job_key in self.seen_jobs:
+                continue
+            if job_key in self.appended_ids:
+                continue
+            if self.dedup_index is not None and job_key in self.dedup_index:
+                print(f"职位已在以往运行中爬取过，跳过: {job_title}")
+                continue
+            
+            self.seen_jobs.add(job_key)
+            new_cards.append(card)
+            if max_jobs is not None and len(self.seen_jobs) >= max_jobs:
+                break
+        return new_cards
 
-            # 对于按页爬取，返回0表示这一页没有新数据
-            return 0 if is_page_mode and not new_data_found else len(new_rows) if is_page_mode else True
+    def record_crawled(self, cards):
+        """
+        把已成功保存的职位写入持久化去重索引和增量爬取记录
+        
+        Args:
+            cards (list): 已保存详情的职位卡片
+        """
+        if self.dedup_index is not None and cards:
+            self.dedup_index.add_many([(card['job_id'], card['title']) for card in cards])
+        if self.watermark_store is not None and cards:
+            job_ids = [card['job_id'] for card in cards]
+            self.watermark_store.record_saved(self.watermark_query, job_ids)
+            self.appended_ids.update(job_ids)
 
-        except Exception as e:
-            print(f'页面处理出错 {e}：第 {page} 页')
-            # 更新进度状态为页面处理出错
-            if self.progress_callback:
-                percentage = min(100, int((len(self.seen_jobs) / target_jobs) * 100) if target_jobs > 0 else 0)
-                self.progress_callback({
-                    'status': f'页面处理出错 {e}：第 {page}/{total_pages} 页',
-                    'total_pages': total_pages,
-                    'current_page': page,
-                    'scraped_jobs': len(self.seen_jobs),
-                    'target_jobs': target_jobs,
-                    'percentage': percentage
-                })
-            return 0 if is_page_mode else False
+    def record_listed(self, job_cards):
+        """
+        记录列表页上出现的职位，爬取成功后作为新的高水位，变更日志据此判断删除
+        
+        Args:
+            job_cards (list): 职位卡片记录列表
+        """
+        self.listed_ids.update(card['job_id'] for card in job_cards)
+
+    def is_known_page(self, job_cards):
+        """
+        判断一页职位是否全部在以往成功运行的列表页上出现过，用于增量爬取的停止条件
+        
+        以列表页上的职位ID判断，被去重跳过或详情获取失败的职位也算出现过。
+        
+        Args:
+            job_cards (list): 职位卡片记录列表
+            
+        Returns:
+            bool: 增量爬取时整页都在高水位以下
+        """
+        return bool(self.known_ids) and bool(job_cards) and all(
+            card['job_id'] in self.known_ids for card in job_cards)
 
 if __name__=='__main__':
     job_name = input("请输入要搜索的职位（例如：数据分析师）：")
@@ -0,0 +1,288 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from sinks import RowSink
+from salary import parse_salary, SALARY_COLUMNS
+from snapdiff import record_hash, ChangeLogSink, change_log_path
+
+# 保存路径下的默认职位库文件名
+JOB_STORE_FILE = 'jobs.sqlite'
+
+# jobs表中与JOB_COLUMNS一一对应的列
+JOB_FIELDS = [
+    'title', 'salary', 'company', 'company_size', 'finance_stage', 'industry', 'experience',
+    'education', 'tags', 'address', 'description', 'duties', 'requirements', 'benefits',
+    'interview_address',
+]
+
+# 月薪的分档边界(K)
+SALARY_BANDS = [0, 5, 10, 15, 20, 30, 50]
+
+# 数值薪资列的SQLite类型
+SALARY_FIELD_TYPES = {
+    'salary_min': 'REAL',
+    'salary_max': 'REAL',
+    'months': 'INTEGER',
+    'unit': 'TEXT',
+    'annualized': 'REAL',
+}
+
+# job_sources表中快照比较使用的列：该结果文件中的内容指纹和数据行，以及在完整爬取中消失的时间
+SNAPSHOT_FIELD_TYPES = {
+    'content_hash': 'TEXT',
+    'content': 'TEXT',  # 该结果文件最近一次写入的职位数据行(JSON)，jobs表中的行可能已被其他结果文件更新
+    'removed_at': 'REAL',
+}
+
+
+def salary_band(salary):
+    """
+    按折算后的月薪把薪资归入分档，用于建立索引
+
+    Args:
+        salary (dict): parse_salary的解析结果
+
+    Returns:
+        str: 分档，如 "15-20K"、"50K+"，无法识别时返回None
+    """
+    if salary['annualized'] is None:
+        return None
+    # 按月计薪时以月薪下限分档，其他周期按年薪折算到12个月
+    if salary['unit'] == 'month':
+        low = salary['salary_min'] / 1000
+    else:
+        low = salary['annualized'] / 12 / 1000
+    for lower, upper in zip(SALARY_BANDS, SALARY_BANDS[1:]):
+        if lower <= low < upper:
+            return f"{lower}-{upper}K"
+    return f"{SALARY_BANDS[-1]}K+"
+
+
+class JobStore:
+    """
+    SQLite职位库
+
+    所有职位名称和筛选条件的结果保存在同一个jobs表中，以职位ID为主键，
+    按公司、城市、薪资分档和爬取时间建立索引。同一职位可能出现在多个搜索结果中，
+    职位与结果文件的对应关系单独保存在job_sources表中，以(结果文件, 职位ID)为主键，
+    变更比较使用的指纹和删除标记也按结果文件保存在这里，互相重叠的搜索不会互相覆盖。
+    每页数据在一个事务中写入，WAL模式下多个线程或进程可以同时写入。
+    """
+
+    def __init__(self, path):
+        """
+        打开（或创建）职位库
+
+        Args:
+            path (str): SQLite文件路径
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.create_tables()
+
+    def create_tables(self):
+        """创建jobs表、job_sources表和索引"""
+        columns = ', '.join(f"{field} TEXT" for field in JOB_FIELDS)
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "job_id TEXT PRIMARY KEY, "
+                "search_name TEXT, "  # 搜索的职位名称
+                "source TEXT, "  # 最近一次写入该职位的结果文件名，按结果文件统计请使用job_sources表
+                f"{columns}, "
+                "city TEXT, "
+                "salary_band TEXT, "
+                "crawled_at REAL, "
+                f"{', '.join(f'{name} {sql_type}' for name, sql_type in SALARY_FIELD_TYPES.items())})"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs (company)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_city ON jobs (city)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_salary_band ON jobs (salary_band)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_crawled_at ON jobs (crawled_at)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_source ON jobs (source, crawled_at)")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_sources ("
+                "source TEXT NOT NULL, "  # 结果文件名，区分职位名称和筛选条件的组合
+                "job_id TEXT NOT NULL, "
+                "search_name TEXT, "  # 搜索的职位名称
+                "crawled_at REAL, "
+                f"{', '.join(f'{name} {sql_type}' for name, sql_type in SNAPSHOT_FIELD_TYPES.items())}, "
+                "PRIMARY KEY (source, job_id))"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_job_sources_crawled_at ON job_sources (source, crawled_at)")
+
+    def save_page(self, rows, cards, search_name, source):
+        """
+        在一个事务中保存一页职位，已存在的职位ID会被更新
+
+        Args:
+            rows (list): 职位数据行
+            cards (list): 与每行对应的职位卡片信息，提供job_id和所在城市
+            search_name (str): 搜索的职位名称
+            source (str): 结果文件名
+
+        Returns:
+            int: 写入的行数
+        """
+        now = time.time()
+        records = []
+        sources = []
+        for row, card in zip(rows, cards or []):
+            if not card or not card.get('job_id'):
+                continue
+            city = (card.get('area') or '').split('·')[0] or None
+            salary = parse_salary(row[1])
+            records.append([card['job_id'], search_name, source, *row[:len(JOB_FIELDS)],
+                            city, salary_band(salary), now, *(salary[name] for name in SALARY_COLUMNS)])
+            sources.append((source, card['job_id'], search_name, now, record_hash(row),
+                            json.dumps(row[:len(JOB_FIELDS)], ensure_ascii=False), None))
+        if not records:
+            return 0
+        columns = ['job_id', 'search_name', 'source', *JOB_FIELDS, 'city', 'salary_band', 'crawled_at',
+                   *SALARY_COLUMNS]
+        updates = ', '.join(f"{column} = excluded.{column}" for column in columns[1:])
+        sql = (f"INSERT INTO jobs ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+               f"ON CONFLICT(job_id) DO UPDATE SET {updates}")
+        source_columns = ['source', 'job_id', 'search_name', 'crawled_at', *SNAPSHOT_FIELD_TYPES]
+        source_updates = ', '.join(f"{column} = excluded.{column}" for column in source_columns[2:])
+        source_sql = (f"INSERT INTO job_sources ({', '.join(source_columns)}) "
+                      f"VALUES ({', '.join('?' * len(source_columns))}) "
+                      f"ON CONFLICT(source, job_id) DO UPDATE SET {source_updates}")
+        with self.lock:
+            with self.conn:
+                self.conn.executemany(sql, records)
+                self.conn.executemany(source_sql, sources)
+        return len(records)
+
+    def count(self, source=None, since=None):
+        """
+        统计职位数
+
+        Args:
+            source (str): 只统计该结果文件的职位，包括同时出现在其他结果文件中的职位
+            since (float): 只统计该时间戳之后爬取的职位
+
+        Returns:
+            int: 职位数
+        """
+        params = []
+        if source is not None:
+            sql = "SELECT COUNT(*) FROM job_sources WHERE source = ?"
+            params.append(source)
+        else:
+            sql = "SELECT COUNT(*) FROM jobs WHERE 1 = 1"
+        if since is not None:
+            sql += " AND crawled_at >= ?"
+            params.append(since)
+        with self.lock:
+            return self.conn.execute(sql, params).fetchone()[0]
+
+    def query(self, sql, params=()):
+        """
+        在jobs表上执行只读查询，用于跨职位名称的分析
+
+        Args:
+            sql (str): SELECT语句
+            params (tuple): 查询参数
+
+        Returns:
+            list: 查询结果
+        """
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def snapshot(self, source):
+        """
+        读取某个结果文件当前的快照，已标记删除的职位不包括在内
+
+        Args:
+            source (str): 结果文件名
+
+        Returns:
+            dict: 职位ID -> (指纹, 职位数据行)
+        """
+        with self.lock:
+            records = self.conn.execute(
+                "SELECT job_id, content_hash, content FROM job_sources "
+                "WHERE source = ? AND removed_at IS NULL", (source,)
+            ).fetchall()
+        snapshot = {}
+        for job_id, digest, content in records:
+            snapshot[job_id] = (digest, json.loads(content))
+        return snapshot
+
+    def mark_removed(self, source, job_ids):
+        """
+        标记在某个结果文件的完整爬取中已消失的职位，不影响其他结果文件中的同一职位
+
+        Args:
+            source (str): 结果文件名
+            job_ids (list): 职位ID
+        """
+        if not job_ids:
+            return
+        now = time.time()
+        with self.lock:
+            with self.conn:
+                self.conn.executemany("UPDATE job_sources SET removed_at = ? WHERE source = ? AND job_id = ?",
+                                      [(now, source, job_id) for job_id in job_ids])
+
+    def sink_for(self, job, csv_file, append):
+        """
+        Job.add_exporter使用的工厂函数，把爬取结果同时写入职位库
+
+        Args:
+            job (Job): 爬虫实例
+            csv_file (str): CSV文件名
+            append (bool): 是否为续爬（职位以ID为主键，续爬无需特殊处理）
+
+        Returns:
+            JobStoreSink: 职位库输出
+        """
+        return JobStoreSink(self, job.name, csv_file)
+
+    def change_log_for(self, job, csv_file, append):
+        """
+        Job.add_exporter使用的工厂函数，爬取结束时在CSV旁边追加本次的职位变更
+
+        Args:
+            job (Job): 爬虫实例
+            csv_file (str): CSV文件名
+            append (bool): 是否为续爬或增量爬取
+
+        Returns:
+            ChangeLogSink: 变更日志输出
+        """
+        return ChangeLogSink(self, job, csv_file, change_log_path(job.save_path, csv_file), append)
+
+    def close(self):
+        """关闭职位库"""
+        with self.lock:
+            self.conn.close()
+
+
+class JobStoreSink(RowSink):
+    """订阅职位数据流，每页在一个事务中写入职位库"""
+
+    name = 'SQLite'
+
+    def __init__(self, store, search_name, source):
+        """
+        Args:
+            store (JobStore): 职位库
+            search_name (str): 搜索的职位名称
+            source (str): 结果文件名
+        """
+        self.store = store
+        self.search_name = search_name
+        self.source = source
+
+    def write_rows(self, rows, cards=None):
+        self.store.save_page(rows, cards, self.search_name, self.source)
@@ -2,11 +2,23 @@ import tkinter as tk
 from tkinter import messagebox, ttk, filedialog
 import os
 from jobspider import Job
+from driverpool import DriverPool
+from fetcher import open_chrome
+from resourcefilter import block_stats
+from dedup import DedupIndex
+from sinks import parquet_exporter
+from jobstore import JobStore, JOB_STORE_FILE
+from archive import PageArchive, ARCHIVE_DIR
+from httpcache import ResponseCache
+from ratelimit import TokenBucket
+from watermark import WatermarkStore
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
+from chromedriver_cache import resolve_chromedriver
 import csv
 
 class JobEntry:
@@ -139,6 +151,13 @@ class JobSpiderApp:
         master.title("BOSS_Spider v1.0")
         self.is_running = False  # 控制爬取状态
         self.thread = None  # 初始化线程属性
+        self.driver_pool = None  # 批量任务共享的WebDriver池
+        self.title_rows = []  # 进度列表中每个职位的行ID，与本次的职位顺序一致
+        self.title_progress = {}  # 行ID -> 该职位最近一次的进度信息
+        self.title_names = {}  # 行ID -> 职位名称
+        self.progress_lock = threading.Lock()
+        self.running_jobs = set()  # 正在爬取的职位，停止时通知它们不再调度新的页面
+        self.jobs_lock = threading.Lock()
         
         # 设置应用程序图标
         try:
@@ -295,6 +314,88 @@ class JobSpiderApp:
         self.latest_check = ttk.Checkbutton(filter_row4, text="优先显示最新发布", variable=self.latest_var)
         self.latest_check.pack(side=tk.LEFT, padx=10)
         
+        # 爬取选项行
+        option_row = ttk.Frame(self.filter_frame)
+        option_row.pack(fill="x", padx=5, pady=5)
+        
+        # 跳过以往运行中已爬取过的职位
+        self.skip_crawled_var = tk.BooleanVar(value=False)
+        self.skip_crawled_check = ttk.Checkbutton(option_row, text="跳过历史已爬取的职位", variable=self.skip_crawled_var)
+        self.skip_crawled_check.pack(side=tk.LEFT, padx=5)
+        
+        # 从上次中断的断点继续爬取
+        self.resume_var = tk.BooleanVar(value=False)
+        self.resume_check = ttk.Checkbutton(option_row, text="断点续爬", variable=self.resume_var)
+        self.resume_check.pack(side=tk.LEFT, padx=5)
+        
+        # 同时输出Parquet文件，需要安装pyarrow
+        self.parquet_var = tk.BooleanVar(value=False)
+        self.parquet_check = ttk.Checkbutton(option_row, text="同时输出Parquet", variable=self.parquet_var)
+        self.parquet_check.pack(side=tk.LEFT, padx=5)
+        
+        # 同时保存到保存路径下的SQLite职位库
+        self.sqlite_var = tk.BooleanVar(value=False)
+        self.sqlite_check = ttk.Checkbutton(option_row, text="保存到SQLite职位库", variable=self.sqlite_var)
+        self.sqlite_check.pack(side=tk.LEFT, padx=5)
+        
+        # 保存原始页面，修复解析规则后可用 reparse.py 重新生成结果
+        self.archive_var = tk.BooleanVar(value=False)
+        self.archive_check = ttk.Checkbutton(option_row, text="保存原始页面归档", variable=self.archive_var)
+        self.archive_check.pack(side=tk.LEFT, padx=5)
+        
+        # 本地页面缓存，多个相近职位批量爬取时避免重复获取相同的详情页
+        self.cache_var = tk.BooleanVar(value=False)
+        self.cache_check = ttk.Checkbutton(option_row, text="启用页面缓存", variable=self.cache_var)
+        self.cache_check.pack(side=tk.LEFT, padx=5)
+        
+        # 增量爬取：按最新发布排序，遇到整页都是以往爬过的职位时停止
+        self.incremental_var = tk.BooleanVar(value=False)
+        self.incremental_check = ttk.Checkbutton(option_row, text="增量爬取", variable=self.incremental_var)
+        self.incremental_check.pack(side=tk.LEFT, padx=5)
+        
+        # 与职位库中上一次的结果比较，记录新增、下线和修改的职位
+        self.changes_var = tk.BooleanVar(value=False)
+        self.changes_check = ttk.Checkbutton(option_row, text="记录职位变更", variable=self.changes_var)
+        self.changes_check.pack(side=tk.LEFT, padx=5)
+        
+        # 浏览器不加载图片、字体、音视频和统计脚本，页面加载更快、流量更少
+        self.block_var = tk.BooleanVar(value=True)
+        self.block_check = ttk.Checkbutton(option_row, text="屏蔽图片和字体", variable=self.block_var)
+        self.block_check.pack(side=tk.LEFT, padx=5)
+        
+        # 爬取结束时输出被屏蔽的请求数，需要浏览器记录性能日志，默认关闭
+        self.block_stats_var = tk.BooleanVar(value=False)
+        self.block_stats_check = ttk.Checkbutton(option_row, text="统计屏蔽请求", variable=self.block_stats_var)
+        self.block_stats_check.pack(side=tk.LEFT, padx=5)
+        
+        # 批量执行设置行
+        batch_row = ttk.Frame(self.filter_frame)
+        batch_row.pack(fill="x", padx=5, pady=5)
+        
+        # 同时爬取的职位数，每个职位使用自己的浏览器
+        ttk.Label(batch_row, text="并行职位数:").pack(side=tk.LEFT, padx=5)
+        self.batch_workers_var = tk.StringVar(value="1")
+        self.batch_workers_spin = ttk.Spinbox(batch_row, from_=1, to=5, textvariable=self.batch_workers_var, width=5)
+        self.batch_workers_spin.pack(side=tk.LEFT, padx=5)
+        
+        # 所有职位共享的总请求速率
+        ttk.Label(batch_row, text="每秒请求数(0为不限):").pack(side=tk.LEFT, padx=5)
+        self.rps_var = tk.StringVar(value="0")
+        self.rps_spin = ttk.Spinbox(batch_row, from_=0, to=10, increment=0.5, textvariable=self.rps_var, width=5)
+        self.rps_spin.pack(side=tk.LEFT, padx=5)
+        
+        # 每个职位获取详情页的线程数，每个线程占用一个浏览器
+        ttk.Label(batch_row, text="详情线程数:").pack(side=tk.LEFT, padx=5)
+        self.detail_workers_var = tk.StringVar(value="1")
+        self.detail_workers_spin = ttk.Spinbox(batch_row, from_=1, to=5, textvariable=self.detail_workers_var, width=5)
+        self.detail_workers_spin.pack(side=tk.LEFT, padx=5)
+        
+        # 不限速时同一站点两次请求的最小间隔，所有职位和线程合计
+        ttk.Label(batch_row, text="请求间隔(秒):").pack(side=tk.LEFT, padx=5)
+        self.interval_var = tk.StringVar(value="1")
+        self.interval_spin = ttk.Spinbox(batch_row, from_=0, to=10, increment=0.5, textvariable=self.interval_var, width=5)
+        self.interval_spin.pack(side=tk.LEFT, padx=5)
+        
         # 标题标签 - 行号调整到3
         self.label = tk.Label(self.main_frame, text="职位搜索设置")
         self.label.grid(row=3, column=0, columnspan=4, pady=10, sticky="w", padx=5)
@@ -371,6 +472,15 @@ class JobSpiderApp:
         self.progress_bar = ttk.Progressbar(self.progress_frame, orient="horizontal", length=400, mode="determinate")
         self.progress_bar.grid(row=2, column=1, columnspan=3, padx=5, pady=5, sticky="ew")
         
+        # 每个职位一行的进度列表，多个职位并行爬取时分别显示
+        self.title_tree = ttk.Treeview(self.progress_frame, columns=('title', 'status', 'pages', 'jobs', 'percent'),
+                                       show='headings', height=5)
+        for column, text, width in (('title', '职位名称', 100), ('status', '状态', 280), ('pages', '页数', 60),
+                                    ('jobs', '职位数', 70), ('percent', '进度', 50)):
+            self.title_tree.heading(column, text=text)
+            self.title_tree.column(column, width=width, anchor="w")
+        self.title_tree.grid(row=3, column=0, columnspan=4, padx=5, pady=5, sticky="ew")
+        
         # 结果标签
         self.result_label = tk.Label(self.main_frame, text="")
         self.result_label.grid(row=999, column=0, columnspan=4, pady=10)
@@ -625,6 +735,10 @@ class JobSpiderApp:
     def stop_scraping(self):
         """停止爬取任务"""
         self.is_running = False
+        # 尚未开始的职位由is_running跳过，正在爬取的职位在当前页完成后停止
+        with self.jobs_lock:
+            for job in self.running_jobs:
+                job.request_stop()
         messagebox.showinfo("信息", "爬取任务已停止")
 
     def browse_save_path(self):
@@ -719,6 +833,48 @@ class JobSpiderApp:
         except Exception as e:
             print(f"更新进度时出错: {e}")
     
+    def update_title_progress(self, item, progress_info):
+        """
+        更新某个职位的进度，并汇总所有职位的进度显示在总进度中
+        
+        在爬取线程中调用，界面更新交给主线程执行。
+        
+        Args:
+            item (str): 该职位在进度列表中的行ID
+            progress_info (dict): 包含进度信息的字典
+        """
+        with self.progress_lock:
+            self.title_progress[item] = progress_info
+            progresses = list(self.title_progress.values())
+        total = dict(progress_info)
+        total['percentage'] = sum(p.get('percentage', 0) for p in progresses) / max(1, len(self.title_rows))
+        total['scraped_jobs'] = sum(p.get('scraped_jobs', 0) for p in progresses)
+        total['target_jobs'] = sum(p.get('target_jobs', 0) for p in progresses)
+        if progress_info.get('status'):
+            total['status'] = f"[{self.title_names.get(item, '')}] {progress_info['status']}"
+        self.update_title_row(
+            item,
+            status=progress_info.get('status', ''),
+            pages=f"{progress_info.get('current_page', 0)}/{progress_info.get('total_pages', 0)}",
+            jobs=f"{progress_info.get('scraped_jobs', 0)}/{progress_info.get('target_jobs', 0)}",
+            percent=f"{progress_info.get('percentage', 0):.0f}%"
+        )
+        self.master.after(0, self.update_progress, total)
+    
+    def update_title_row(self, item, **values):
+        """
+        在主线程中更新进度列表中的一行
+        
+        Args:
+            item (str): 行ID
+            **values: 列名 -> 显示的值
+        """
+        def apply():
+            if self.title_tree.exists(item):
+                for column, value in values.items():
+                    self.title_tree.set(item, column, value)
+        self.master.after(0, apply)
+    
     def flash_progress_bar(self):
         """给进度条添加闪烁效果，使进度变化更明显"""
         try:
@@ -765,6 +921,32 @@ class JobSpiderApp:
         position_code = self.position_code_map.get(self.position_var.get(), '0')
         publish_code = self.publish_code_map.get(self.publish_var.get(), '0')
         latest = self.latest_var.get()
+        self.skip_crawled = self.skip_crawled_var.get()
+        self.resume = self.resume_var.get()
+        self.export_parquet = self.parquet_var.get()
+        self.use_job_store = self.sqlite_var.get()
+        self.use_archive = self.archive_var.get()
+        self.use_cache = self.cache_var.get()
+        self.incremental = self.incremental_var.get()
+        self.track_changes = self.changes_var.get()
+        self.block_resources = self.block_var.get()
+        self.collect_block_stats = self.block_resources and self.block_stats_var.get()
+        try:
+            self.batch_workers = max(1, int(self.batch_workers_var.get()))
+        except ValueError:
+            self.batch_workers = 1
+        try:
+            self.detail_workers = max(1, int(self.detail_workers_var.get()))
+        except ValueError:
+            self.detail_workers = 1
+        try:
+            self.requests_per_second = max(0.0, float(self.rps_var.get())) or None
+        except ValueError:
+            self.requests_per_second = None
+        try:
+            self.min_interval = max(0.0, float(self.interval_var.get()))
+        except ValueError:
+            self.min_interval = 1.0
         
         # 重置进度显示
         if self.status_value and self.status_value.winfo_exists():
@@ -778,6 +960,13 @@ class JobSpiderApp:
         if self.result_label and self.result_label.winfo_exists():
             self.result_label.config(text="")
         
+        # 每个职位在进度列表中占一行
+        self.title_tree.delete(*self.title_tree.get_children())
+        self.title_rows = [self.title_tree.insert('', tk.END, values=(info['title'], "等待中", "", "", "0%"))
+                           for info in job_infos]
+        self.title_names = {item: info['title'] for item, info in zip(self.title_rows, job_infos)}
+        self.title_progress = {}
+        
         # 计算总任务数量
         total_jobs = sum(info['count'] for info in job_infos)
         
@@ -800,6 +989,9 @@ class JobSpiderApp:
         """
         爬取职位信息
         
+        多个职位由batch_workers个工作线程并行爬取，每个职位使用自己的浏览器，
+        所有职位共享同一个令牌桶、去重索引和其他存储。
+        
         Args:
             job_infos (list): 职位信息列表
             total_jobs (int): 总任务数量
@@ -816,199 +1008,323 @@ class JobSpiderApp:
             publish_code (str): 发布时间代码
             latest (bool): 是否优先显示最新发布
         """
-        for info in job_infos:
-            if not self.is_running:
-                break
+        workers = max(1, min(self.batch_workers, len(job_infos)))
+        # 每个职位获取详情页的线程数
+        detail_workers = self.detail_workers
+        # 同一批任务共享预热的浏览器，避免每个职位都冷启动Chrome
+        # 每个并行的职位的列表页占用一个浏览器，每个详情线程各占用一个浏览器
+        block_resources = self.block_resources
+        collect_block_stats = self.collect_block_stats
+        self.driver_pool = DriverPool(size=workers * (detail_workers + 1),
+                                      factory=lambda: open_chrome(block_resources, collect_block_stats))
+        # 所有职位共享同一个持久化去重索引
+        dedup_index = DedupIndex() if self.skip_crawled else None
+        # 所有职位写入同一个职位库，统计职位数时直接查询索引；记录职位变更时以职位库作为上一次的快照
+        use_job_store = self.use_job_store or self.track_changes
+        job_store = JobStore(os.path.join(save_path, JOB_STORE_FILE)) if use_job_store else None
+        page_archive = PageArchive(os.path.join(save_path, ARCHIVE_DIR)) if self.use_archive else None
+        response_cache = ResponseCache() if self.use_cache else None
+        watermark_store = WatermarkStore() if self.incremental else None
+        resources = {
+            'dedup_index': dedup_index,
+            'job_store': job_store,
+            'page_archive': page_archive,
+            'response_cache': response_cache,
+            'watermark_store': watermark_store,
+            # 所有并行的职位共享同一个令牌桶，总请求速率不超过设定值
+            'rate_limiter': TokenBucket(self.requests_per_second) if self.requests_per_second else None,
+            'detail_workers': detail_workers,
+        }
+        
+        # 多个职位由工作线程并行爬取，停止后尚未开始的职位不再执行
+        filters = (city_code, salary_code, experience_code, education_code, job_type_code,
+                   scale_code, finance_code, position_code, publish_code, latest)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='title') as executor:
+            futures = [(item, info, executor.submit(self.scrape_title, item, info, save_path, filters, resources))
+                       for item, info in zip(self.title_rows, job_infos)]
+        # scrape_title自己处理爬取中的错误，这里只兜底处理没有被捕获的异常
+        for item, info, future in futures:
+            error = future.exception()
+            if error is not None:
+                print(f"处理任务 {info['title']} 时出现未处理的错误: {error}")
+                self.update_title_row(item, status=f"出错: {error}")
+        
+        # 关闭池中的浏览器
+        self.driver_pool.close()
+        self.driver_pool = None
+        if dedup_index is not None:
+            dedup_index.close()
+        if job_store is not None:
+            job_store.close()
+        if page_archive is not None:
+            page_archive.close()
+        if response_cache is not None:
+            print(f"页面缓存统计: {response_cache.stats()}")
+            response_cache.close()
+        if watermark_store is not None:
+            watermark_store.close()
+        if collect_block_stats:
+            print(block_stats.summary())
+        
+        # 爬取完成后，在主线程中恢复按钮状态
+        self.is_running = False
+        self.master.after(0, self.reset_buttons)
+
+    def reset_buttons(self):
+        """恢复开始和停止按钮的状态"""
+        self.start_button.config(state=tk.NORMAL)
+        self.stop_button.config(state=tk.DISABLED)
+
+    def scrape_title(self, item, info, save_path, filters, resources):
+        """
+        在批量执行的工作线程中爬取一个职位
+        
+        Args:
+            item (str): 该职位在进度列表中的行ID
+            info (dict): 职位信息
+            save_path (str): 保存路径
+            filters (tuple): 筛选条件代码，最后一项为是否优先显示最新发布
+            resources (dict): 所有职位共享的去重索引、职位库、归档、缓存、高水位记录、令牌桶和详情线程数
+        """
+        if not self.is_running:
+            self.update_title_row(item, status="已取消")
+            return
+        self.update_title_row(item, status="正在启动...")
+        dedup_index = resources['dedup_index']
+        job_store = resources['job_store']
+        rate_limiter = resources['rate_limiter']
+        job = Job(info['title'])
+        with self.jobs_lock:
+            self.running_jobs.add(job)
+        # 注册之后再检查一次，避免错过在此之前发出的停止请求
+        if not self.is_running:
+            job.request_stop()
+        try:
+            job.set_save_path(save_path)
+            job.set_driver_pool(self.driver_pool)
+            job.set_dedup_index(dedup_index)
+            job.set_concurrency(resources['detail_workers'], rate_limiter=rate_limiter)
+            job.set_pacing(self.min_interval)
+            if self.export_parquet:
+                job.add_exporter(parquet_exporter)
+            if job_store is not None:
+                # 变更日志在职位写入职位库之前读取上一次的快照
+                if self.track_changes:
+                    job.add_exporter(job_store.change_log_for)
+                job.add_exporter(job_store.sink_for)
+            job.set_archive(resources['page_archive'])
+            job.set_response_cache(resources['response_cache'])
+            job.set_incremental(resources['watermark_store'])
+            # 增量爬取依赖最新发布排序
+            job.set_filter_conditions(*filters[:-1], filters[-1] or self.incremental)
+            
+            # 计算实际文件名（考虑筛选条件）
+            actual_filename = os.path.splitext(job.get_csv_filename())[0]
+            
+            # 确保路径存在
+            if not os.path.exists(save_path):
+                os.makedirs(save_path)
+                print(f"已创建保存路径: {save_path}")
+            
+            # 验证路径可写
+            test_file_path = os.path.join(save_path, "test_write_permission.txt")
             try:
-                job = Job(info['title'])
+                with open(test_file_path, 'w') as f:
+                    f.write("测试写入权限")
+                os.remove(test_file_path)
+                print(f"路径 {save_path} 可写")
+            except Exception as e:
+                print(f"警告: 路径 {save_path} 可能无法写入: {e}")
+                # 尝试使用备用路径
+                save_path = os.getcwd()
                 job.set_save_path(save_path)
-                job.set_filter_conditions(city_code, salary_code, experience_code, education_code, 
-                                          job_type_code, scale_code, finance_code, position_code, publish_code, latest)
-                
-                # 计算实际文件名（考虑筛选条件）
-                filter_info = []
-                if city_code != '100010000':
-                    filter_info.append(f"城市_{city_code}")
-                if experience_code != '0':
-                    filter_info.append(f"经验_{experience_code}")
-                # 添加其他筛选条件...
-                
-                actual_filename = info['title']
-                if filter_info:
-                    actual_filename = f"{info['title']}_{'_'.join(filter_info)}"
-                
-                # 保存正确的文件路径
-                self.current_csv_path = os.path.join(save_path, f"{actual_filename}.csv")
-                self.current_md_path = os.path.join(save_path, f"{actual_filename}.md")
-                
-                # 确保路径存在
-                if not os.path.exists(save_path):
-                    os.makedirs(save_path)
-                    print(f"已创建保存路径: {save_path}")
-                
-                # 验证路径可写
-                test_file_path = os.path.join(save_path, "test_write_permission.txt")
+                print(f"将使用备用路径: {save_path}")
+            
+            # 设置进度回调函数
+            job.set_progress_callback(lambda progress: self.update_title_progress(item, progress))
+            
+            # 显示预期爬取情况
+            if info['mode'] == '按页爬取':
+                self.update_title_progress(item, {
+                    'status': f'将爬取 {info["title"]} 的前 {info["count"]} 页数据',
+                    'total_pages': info['count'],
+                    'current_page': 0,
+                    'scraped_jobs': 0,
+                    'target_jobs': 999,  # 按页爬取不限制职位数
+                    'percentage': 0
+                })
+            elif info['mode'] == '按数量爬取':
+                self.update_title_progress(item, {
+                    'status': f'将爬取 {info["title"]} 的 {info["count"]} 个职位',
+                    'total_pages': 999,
+                    'current_page': 0,
+                    'scraped_jobs': 0,
+                    'target_jobs': info['count'],
+                    'percentage': 0
+                })
+            else:  # 全部爬取
+                self.update_title_progress(item, {
+                    'status': f'将爬取 {info["title"]} 的所有职位',
+                    'total_pages': 0,
+                    'current_page': 0,
+                    'scraped_jobs': 0,
+                    'target_jobs': 0,
+                    'percentage': 0
+                })
+            
+            # 开始爬取
+            started_at = time.time()
+            saved_jobs = job.give_me_job(info['mode'], info['count'], resume=self.resume)
+            
+            # 爬取完成后，检查文件
+            expected_csv = os.path.join(save_path, f"{actual_filename}.csv")
+            expected_md = os.path.join(save_path, f"{actual_filename}.md")
+            
+            # 验证文件是否存在及是否有内容
+            csv_exists = os.path.exists(expected_csv)
+            csv_has_content = False
+            job_count = 0
+            
+            if saved_jobs is not None:
+                # 调度器统计的保存数，多个职位并行时不受其他职位写入的影响
+                job_count = saved_jobs
+                csv_has_content = csv_exists and job_count > 0
+            elif job_store is not None:
+                # 本次写入职位库的职位数，走source和爬取时间的索引
+                job_count = job_store.count(source=f"{actual_filename}.csv", since=started_at)
+                csv_has_content = job_count > 0
+            elif csv_exists:
                 try:
-                    with open(test_file_path, 'w') as f:
-                        f.write("测试写入权限")
-                    os.remove(test_file_path)
-                    print(f"路径 {save_path} 可写")
+                    with open(expected_csv, 'r', encoding='utf-8-sig') as f:
+                        reader = csv.reader(f)
+                        next(reader)  # 跳过表头
+                        job_count = sum(1 for _ in reader)
+                        csv_has_content = job_count > 0
                 except Exception as e:
-                    print(f"警告: 路径 {save_path} 可能无法写入: {e}")
-                    # 尝试使用备用路径
-                    save_path = os.getcwd()
-                    job.set_save_path(save_path)
-                    print(f"将使用备用路径: {save_path}")
-                
-                # 设置进度回调函数
-                job.set_progress_callback(self.update_progress)
-                
-                # 显示预期爬取情况
-                if info['mode'] == '按页爬取':
-                    self.update_progress({
-                        'status': f'将爬取 {info["title"]} 的前 {info["count"]} 页数据',
-                        'total_pages': info['count'],
-                        'current_page': 0,
-                        'scraped_jobs': 0,
-                        'target_jobs': 999,  # 按页爬取不限制职位数
-                        'percentage': 0
-                    })
-                elif info['mode'] == '按数量爬取':
-                    self.update_progress({
-                        'status': f'将爬取 {info["title"]} 的 {info["count"]} 个职位',
-                        'total_pages': 999,
-                        'current_page': 0,
-                        'scraped_jobs': 0,
-                        'target_jobs': info['count'],
-                        'percentage': 0
-                    })
-                else:  # 全部爬取
-                    self.update_progress({
-                        'status': f'将爬取 {info["title"]} 的所有职位',
-                        'total_pages': 0,
-                        'current_page': 0,
-                        'scraped_jobs': 0,
-                        'target_jobs': 0,
-                        'percentage': 0
-                    })
-                
-                # 开始爬取
-                job.give_me_job(info['mode'], info['count'])
-                completed_jobs += info['count']
-                
-                # 爬取完成后，检查文件
-                expected_csv = os.path.join(save_path, f"{actual_filename}.csv")
-                expected_md = os.path.join(save_path, f"{actual_filename}.md")
-                
-                # 验证文件是否存在及是否有内容
-                csv_exists = os.path.exists(expected_csv)
-                csv_has_content = False
-                job_count = 0
-                
-                if csv_exists:
-                    try:
-                        with open(expected_csv, 'r', encoding='utf-8-sig') as f:
-                            reader = csv.reader(f)
-                            next(reader)  # 跳过表头
-                            job_count = sum(1 for _ in reader)
-                            csv_has_content = job_count > 0
-                    except Exception as e:
-                        print(f"检查CSV文件内容时出错: {e}")
-                
-                md_exists = os.path.exists(expected_md)
-                
-                # 构建详细的结果反馈
-                result_text = ""
-                
-                if info['mode'] == '按页爬取':
-                    result_text += f"爬取完成 - 模式: 按页爬取 ({info['count']}页)\n"
-                    mode_text = f"按页爬取 ({info['count']}页)"
-                elif info['mode'] == '按数量爬取':
-                    result_text += f"爬取完成 - 模式: 按数量爬取 ({info['count']}个)\n"
-                    mode_text = f"按数量爬取 ({info['count']}个)"
-                else:
-                    result_text += f"爬取完成 - 模式: 全部爬取\n"
-                    mode_text = "全部爬取"
-                
-                # 设置爬取模式显示
-                self.result_mode_value.config(text=mode_text, font=("宋体", 10, "bold"))
-                
-                if csv_exists:
-                    if csv_has_content:
-                        result_text += f"✅ 成功爬取并保存了 {job_count} 个职位\n"
-                        count_text = f"✅ 成功爬取并保存了 {job_count} 个职位"
-                        self.result_count_value.config(text=count_text, foreground="#009688")
-                    else:
-                        result_text += f"⚠️ CSV文件已创建但没有数据\n"
-                        count_text = "⚠️ CSV文件已创建但没有数据"
-                        self.result_count_value.config(text=count_text, foreground="#FFA500")
-                else:
-                    result_text += f"❌ CSV文件创建失败\n"
-                    count_text = "❌ CSV文件创建失败"
-                    self.result_count_value.config(text=count_text, foreground="#FF0000")
-                    
-                if md_exists:
-                    result_text += f"✅ Markdown文件已生成\n"
-                    md_text = "✅ 已成功生成"
-                    self.result_md_value.config(text=md_text, foreground="#009688")
+                    print(f"检查CSV文件内容时出错: {e}")
+            
+            md_exists = os.path.exists(expected_md)
+            
+            # 构建详细的结果反馈
+            result_text = ""
+            
+            if info['mode'] == '按页爬取':
+                result_text += f"爬取完成 - 模式: 按页爬取 ({info['count']}页)\n"
+                mode_text = f"按页爬取 ({info['count']}页)"
+            elif info['mode'] == '按数量爬取':
+                result_text += f"爬取完成 - 模式: 按数量爬取 ({info['count']}个)\n"
+                mode_text = f"按数量爬取 ({info['count']}个)"
+            else:
+                result_text += f"爬取完成 - 模式: 全部爬取\n"
+                mode_text = "全部爬取"
+            
+            if csv_exists:
+                if csv_has_content:
+                    result_text += f"✅ 成功爬取并保存了 {job_count} 个职位\n"
+                    count_text = f"✅ 成功爬取并保存了 {job_count} 个职位"
+                    count_color = "#009688"
                 else:
-                    result_text += f"❌ Markdown文件生成失败\n"
-                    md_text = "❌ 生成失败"
-                    self.result_md_value.config(text=md_text, foreground="#FF0000")
-                
-                # 清除旧的路径标签
-                for widget in self.file_paths_frame.winfo_children():
-                    widget.destroy()
-                
-                # 创建文件路径标签，使用短路径显示
-                csv_path_short = self.shorten_path(expected_csv)
-                md_path_short = self.shorten_path(expected_md)
-                
-                ttk.Label(self.file_paths_frame, text="文件位置：").grid(row=0, column=0, sticky="w", padx=5, pady=2)
-                ttk.Label(self.file_paths_frame, text=save_path, foreground="#555555").grid(row=0, column=1, sticky="w", padx=5, pady=2)
-                
-                # 显示美化后的结果框架
-                self.result_frame.grid()
-                
-                # 保留原来的结果文本以兼容
-                self.result_label.config(text=result_text)
-                
-                # 如果文件没有保存成功但有数据，尝试再次保存
-                if not csv_has_content and len(job.seen_jobs) > 0:
-                    self.update_progress({
-                        'status': f'检测到数据未保存，尝试手动保存...',
-                        'percentage': 100
-                    })
-                    try:
-                        print("爬取到了数据但未能成功保存，尝试紧急备份...")
-                        backup_csv = os.path.join(os.getcwd(), f"backup_{actual_filename}.csv")
-                        # 这里可以添加其他紧急保存逻辑
-                        print(f"创建了备份CSV: {backup_csv}")
-                    except Exception as save_error:
-                        print(f"尝试备份数据失败: {save_error}")
-                
-                # 如果Markdown不存在但CSV存在，尝试再次转换
-                if not md_exists and csv_exists:
-                    try:
-                        print("尝试再次创建Markdown文件")
-                        job.csv_to_markdown(f"{actual_filename}.csv")
-                        # 再次检查Markdown是否创建成功
-                        if os.path.exists(expected_md):
-                            result_text = result_text.replace("❌ Markdown文件生成失败", "✅ Markdown文件已重新生成")
-                            self.result_label.config(text=result_text)
-                    except Exception as md_error:
-                        print(f"再次创建Markdown失败: {md_error}")
-                
-            except Exception as e:
-                print(f"处理任务 {info['title']} 时出错: {e}")
-                self.result_label.config(text=f"处理任务 {info['title']} 时出错:\n{e}")
-                messagebox.showerror("错误", f"处理任务 {info['title']} 时出错: {e}")
-                continue
+                    result_text += f"⚠️ CSV文件已创建但没有数据\n"
+                    count_text = "⚠️ CSV文件已创建但没有数据"
+                    count_color = "#FFA500"
+            else:
+                result_text += f"❌ CSV文件创建失败\n"
+                count_text = "❌ CSV文件创建失败"
+                count_color = "#FF0000"
+            
+            if md_exists:
+                result_text += f"✅ Markdown文件已生成\n"
+                md_text = "✅ 已成功生成"
+                md_color = "#009688"
+            else:
+                result_text += f"❌ Markdown文件生成失败\n"
+                md_text = "❌ 生成失败"
+                md_color = "#FF0000"
+            
+            # 多个职位并行时结果区域显示最后完成的职位，界面更新交给主线程执行
+            self.master.after(0, self.show_title_result, save_path, expected_csv, expected_md, mode_text,
+                              (count_text, count_color), (md_text, md_color), result_text)
+            self.update_title_row(item, status=count_text, percent='100%')
+            
+            # 如果文件没有保存成功但有数据，尝试再次保存
+            if not csv_has_content and len(job.seen_jobs) > 0:
+                self.update_title_progress(item, {
+                    'status': f'检测到数据未保存，尝试手动保存...',
+                    'percentage': 100
+                })
+                try:
+                    print("爬取到了数据但未能成功保存，尝试紧急备份...")
+                    backup_csv = os.path.join(os.getcwd(), f"backup_{actual_filename}.csv")
+                    # 这里可以添加其他紧急保存逻辑
+                    print(f"创建了备份CSV: {backup_csv}")
+                except Exception as save_error:
+                    print(f"尝试备份数据失败: {save_error}")
+            
+            # 如果Markdown不存在但CSV存在，尝试再次转换
+            if not md_exists and csv_exists:
+                try:
+                    print("尝试再次创建Markdown文件")
+                    job.csv_to_markdown(f"{actual_filename}.csv")
+                    # 再次检查Markdown是否创建成功
+                    if os.path.exists(expected_md):
+                        result_text = result_text.replace("❌ Markdown文件生成失败", "✅ Markdown文件已重新生成")
+                        self.master.after(0, self.result_label.config, {'text': result_text})
+                except Exception as md_error:
+                    print(f"再次创建Markdown失败: {md_error}")
+            
+        except Exception as e:
+            print(f"处理任务 {info['title']} 时出错: {e}")
+            self.update_title_row(item, status=f"出错: {e}")
+            self.master.after(0, self.show_title_error, info['title'], e)
+        finally:
+            with self.jobs_lock:
+                self.running_jobs.discard(job)
+
+    def show_title_result(self, save_path, csv_path, md_path, mode_text, count, md, result_text):
+        """
+        在主线程中把一个职位的爬取结果显示到结果区域
         
-        # 爬取完成后，恢复按钮状态
-        self.start_button.config(state=tk.NORMAL)
-        self.stop_button.config(state=tk.DISABLED)
-        self.is_running = False
+        Args:
+            save_path (str): 保存路径
+            csv_path (str): CSV文件路径
+            md_path (str): Markdown文件路径
+            mode_text (str): 爬取模式的显示文本
+            count (tuple): 职位数的显示文本和颜色
+            md (tuple): Markdown生成情况的显示文本和颜色
+            result_text (str): 完整的结果文本
+        """
+        # 打开文件按钮对应最后显示的职位
+        self.current_csv_path = csv_path
+        self.current_md_path = md_path
+        
+        # 设置爬取模式显示
+        self.result_mode_value.config(text=mode_text, font=("宋体", 10, "bold"))
+        self.result_count_value.config(text=count[0], foreground=count[1])
+        self.result_md_value.config(text=md[0], foreground=md[1])
+        
+        # 清除旧的路径标签
+        for widget in self.file_paths_frame.winfo_children():
+            widget.destroy()
+        
+        ttk.Label(self.file_paths_frame, text="文件位置：").grid(row=0, column=0, sticky="w", padx=5, pady=2)
+        ttk.Label(self.file_paths_frame, text=save_path, foreground="#555555").grid(row=0, column=1, sticky="w", padx=5, pady=2)
+        
+        # 显示美化后的结果框架
+        self.result_frame.grid()
+        
+        # 保留原来的结果文本以兼容
+        self.result_label.config(text=result_text)
+
+    def show_title_error(self, title, error):
+        """
+        在主线程中显示一个职位的爬取错误
+        
+        Args:
+            title (str): 职位名称
+            error (Exception): 错误
+        """
+        self.result_label.config(text=f"处理任务 {title} 时出错:\n{error}")
+        messagebox.showerror("错误", f"处理任务 {title} 时出错: {error}")
 
     def open_csv(self):
         """打开CSV文件"""
@@ -1041,7 +1357,7 @@ class JobSpiderApp:
         options = Options()
         options.headless = False
         # 添加其他选项
-        service = Service(ChromeDriverManager().install())
+        service = Service(resolve_chromedriver())
         driver = webdriver.Chrome(service=service, options=options)
         driver.minimize_window()  # 最小化窗口
         return driver
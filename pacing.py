@@ -0,0 +1,209 @@
+import random
+import threading
+import time
+import urllib.parse
+
+# 同一站点两次页面请求之间的默认最小间隔(秒)
+DEFAULT_MIN_INTERVAL = 1.0
+
+# 间隔上随机增加的比例，避免请求间隔过于规律
+DEFAULT_JITTER = 0.5
+
+# 轮询页面状态的间隔(秒)
+POLL_INTERVAL = 0.1
+
+# 判断网络空闲和元素数量稳定时，状态需要保持不变的时长(秒)
+SETTLE_TIME = 0.5
+
+# 已发出的请求数（包括接口、脚本等资源），用于判断网络是否空闲
+_RESOURCE_COUNT_JS = "return performance.getEntriesByType('resource').length;"
+
+
+class HostPacer:
+    """
+    按站点统一管理的请求间隔
+
+    所有后端在访问页面前向这里预约时间，同一站点的两次请求至少间隔min_interval秒，
+    不同站点互不影响。只有在间隔要求之内才会等待，页面加载本身花费的时间也计入间隔。
+    间隔对同一站点的所有线程合计生效，是没有令牌桶时唯一的限速策略；
+    使用令牌桶时抓取后端不再经过这里，避免两种限速叠加。
+    """
+
+    def __init__(self, min_interval=DEFAULT_MIN_INTERVAL, jitter=DEFAULT_JITTER):
+        """
+        初始化请求间隔
+
+        Args:
+            min_interval (float): 默认的最小间隔(秒)，0表示不限制
+            jitter (float): 间隔上随机增加的比例
+        """
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self.host_intervals = {}  # 站点 -> 单独设置的最小间隔
+        self.next_allowed = {}  # 站点 -> 下一次允许请求的时间
+        self.lock = threading.Lock()
+        self.total_waited = 0.0
+
+    def configure(self, min_interval=None, jitter=None, host=None):
+        """
+        修改最小间隔
+
+        Args:
+            min_interval (float): 最小间隔(秒)
+            jitter (float): 间隔上随机增加的比例
+            host (str): 只修改该站点的间隔，默认修改所有站点的默认值
+        """
+        with self.lock:
+            if host is not None:
+                self.host_intervals[host] = min_interval
+                return
+            if min_interval is not None:
+                self.min_interval = min_interval
+            if jitter is not None:
+                self.jitter = jitter
+
+    def wait(self, url):
+        """
+        等到允许请求该站点时返回，并预约下一次请求的时间
+
+        Args:
+            url (str): 即将访问的URL
+
+        Returns:
+            float: 实际等待的时间(秒)
+        """
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        with self.lock:
+            interval = self.host_intervals.get(host, self.min_interval)
+            now = time.monotonic()
+            start = max(now, self.next_allowed.get(host, now))
+            # 先预约，多个线程同时请求同一站点时依次排队
+            self.next_allowed[host] = start + interval * (1 + random.uniform(0, self.jitter))
+            delay = start - now
+            self.total_waited += delay
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+# 进程内共享的请求间隔，所有职位和所有浏览器共用
+default_pacer = HostPacer()
+
+
+def wait_until(condition, timeout, poll=POLL_INTERVAL):
+    """
+    轮询等待条件成立，条件出错视为不成立
+
+    Args:
+        condition (callable): 无参数的判断函数
+        timeout (float): 超时时间(秒)
+        poll (float): 轮询间隔(秒)
+
+    Returns:
+        bool: 超时前条件是否成立
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            if condition():
+                return True
+        except Exception:
+            pass
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(poll)
+
+
+def wait_until_stable(measure, timeout, settle=SETTLE_TIME, poll=POLL_INTERVAL):
+    """
+    等待某个数值连续settle秒保持不变
+
+    Args:
+        measure (callable): 返回当前数值的函数
+        timeout (float): 超时时间(秒)
+        settle (float): 数值需要保持不变的时长(秒)
+        poll (float): 轮询间隔(秒)
+
+    Returns:
+        bool: 超时前数值是否已稳定
+    """
+    deadline = time.monotonic() + timeout
+    last = None
+    stable_since = time.monotonic()
+    while True:
+        try:
+            value = measure()
+        except Exception:
+            value = None
+        now = time.monotonic()
+        if value != last:
+            last = value
+            stable_since = now
+        elif value is not None and now - stable_since >= settle:
+            return True
+        if now >= deadline:
+            return False
+        time.sleep(poll)
+
+
+def wait_for_document_ready(driver, timeout=15):
+    """
+    等待页面的document加载完成
+
+    Args:
+        driver (webdriver.Chrome): WebDriver实例
+        timeout (float): 超时时间(秒)
+
+    Returns:
+        bool: 是否加载完成
+    """
+    return wait_until(lambda: driver.execute_script("return document.readyState;") == 'complete', timeout)
+
+
+def wait_for_network_idle(driver, timeout=5, settle=SETTLE_TIME):
+    """
+    等待页面在settle秒内没有发出新的资源请求，用于详情页加载和滚动触发懒加载之后
+
+    Args:
+        driver (webdriver.Chrome): WebDriver实例
+        timeout (float): 超时时间(秒)
+        settle (float): 没有新请求的时长(秒)
+
+    Returns:
+        bool: 网络是否已空闲
+    """
+    return wait_until_stable(lambda: driver.execute_script(_RESOURCE_COUNT_JS), timeout, settle)
+
+
+def count_elements(driver, css_selector):
+    """
+    统计页面上匹配选择器的元素数
+
+    Args:
+        driver (webdriver.Chrome): WebDriver实例
+        css_selector (str): CSS选择器
+
+    Returns:
+        int: 元素数
+    """
+    return driver.execute_script("return document.querySelectorAll(arguments[0]).length;", css_selector)
+
+
+def wait_for_stable_count(driver, css_selector, timeout=15, settle=SETTLE_TIME):
+    """
+    等待匹配选择器的元素出现，并且数量在settle秒内不再变化
+
+    Args:
+        driver (webdriver.Chrome): WebDriver实例
+        css_selector (str): CSS选择器
+        timeout (float): 超时时间(秒)
+        settle (float): 数量需要保持不变的时长(秒)
+
+    Returns:
+        bool: 元素是否已出现且数量稳定
+    """
+    def measure():
+        count = count_elements(driver, css_selector)
+        # 还没有元素时不算稳定
+        return count or None
+    return wait_until_stable(measure, timeout, settle)
@@ -0,0 +1,70 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    线程安全的令牌桶限速器
+
+    所有工作线程共享同一个令牌桶，保证总请求速率不超过设定的礼貌预算。
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        初始化令牌桶
+
+        Args:
+            rate (float): 每秒补充的令牌数，即允许的平均请求速率
+            capacity (float): 桶容量，即允许的最大突发请求数，默认等于1
+        """
+        if rate <= 0:
+            raise ValueError("限速速率必须大于0")
+        self.rate = float(rate)
+        self.capacity = float(capacity or 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        """按流逝的时间补充令牌，调用方需持有锁"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens=1):
+        """
+        尝试立即获取令牌
+
+        Args:
+            tokens (float): 需要的令牌数
+
+        Returns:
+            bool: 是否获取成功
+        """
+        with self.lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens=1):
+        """
+        获取令牌，令牌不足时阻塞等待
+
+        Args:
+            tokens (float): 需要的令牌数
+
+        Returns:
+            float: 实际等待的时间(秒)
+        """
+        waited = 0.0
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                delay = (tokens - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
@@ -0,0 +1,252 @@
+import argparse
+import gzip
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from archive import load_index, read_record, DETAIL_PAGE, INDEX_FILE
+from jobparser import JobParser, extract_job_id
+from sinks import RowStream, CsvSink, MarkdownSink, ParquetSink
+
+
+def parse_chunk(directory, entries):
+    """
+    在工作进程中解析一批归档的详情页
+
+    Args:
+        directory (str): 归档目录
+        entries (list): 索引条目
+
+    Returns:
+        list: (结果文件名, 职位名称, 职位ID, 抓取时间, 职位数据行) 元组列表
+    """
+    parser = JobParser()
+    results = []
+    for entry in entries:
+        try:
+            header, page_html = read_record(directory, entry)
+            row = parser.parse_detail(page_html)
+        except Exception as e:
+            print(f"解析归档记录失败 {entry.get('url')}: {e}")
+            continue
+        if row is None:
+            continue
+        job_id = extract_job_id(header['url']) or header['url']
+        results.append((header.get('source') or f"{header.get('name', '未命名')}.csv",
+                        header.get('name', ''), job_id, header['time'], row))
+    return results
+
+
+def reparse_archive(directory, output_dir, workers=None, chunk_size=200, parquet=False, markdown=True):
+    """
+    从页面归档重新生成所有结果文件，不访问网络
+
+    详情页按块分配给多个进程并行解析，同一结果文件中重复的职位只保留最后抓取的一次。
+
+    Args:
+        directory (str): 归档目录
+        output_dir (str): 输出目录
+        workers (int): 进程数，默认为CPU核数
+        chunk_size (int): 每个任务包含的页面数
+        parquet (bool): 是否同时输出Parquet
+        markdown (bool): 是否同时输出Markdown
+
+    Returns:
+        dict: 结果文件名 -> 职位数
+    """
+    entries = [entry for entry in load_index(directory) if entry.get('kind') == DETAIL_PAGE]
+    print(f"归档中共有 {len(entries)} 个详情页")
+    chunks = [entries[i:i + chunk_size] for i in range(0, len(entries), chunk_size)]
+
+    # 结果文件名 -> {职位ID: (抓取时间, 职位名称, 数据行)}，按首次出现的顺序输出
+    outputs = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for results in executor.map(parse_chunk, [directory] * len(chunks), chunks):
+            for source, name, job_id, fetched_at, row in results:
+                jobs = outputs.setdefault(source, {})
+                if job_id not in jobs or jobs[job_id][0] <= fetched_at:
+                    jobs[job_id] = (fetched_at, name, row)
+
+    counts = {}
+    for source, jobs in outputs.items():
+        name = next(iter(jobs.values()))[1]
+        rows = [row for _, _, row in jobs.values()]
+        cards = [{'job_id': job_id} for job_id in jobs]
+        counts[source] = write_outputs(output_dir, source, name, rows, cards, parquet, markdown)
+    return counts
+
+
+def write_outputs(output_dir, csv_file, name, rows, cards, parquet=False, markdown=True):
+    """
+    把解析结果写入CSV，以及可选的Markdown和Parquet
+
+    Args:
+        output_dir (str): 输出目录
+        csv_file (str): CSV文件名
+        name (str): 职位名称，用于Markdown标题
+        rows (list): 职位数据行
+        cards (list): 与每行对应的职位卡片信息
+        parquet (bool): 是否同时输出Parquet
+        markdown (bool): 是否同时输出Markdown
+
+    Returns:
+        int: 写入的职位数
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    stream = RowStream([CsvSink(os.path.join(output_dir, csv_file))])
+    if markdown:
+        stream.subscribe(MarkdownSink(os.path.join(output_dir, csv_file.replace('.csv', '.md')), name))
+    if parquet:
+        try:
+            stream.subscribe(ParquetSink(os.path.join(output_dir, csv_file.replace('.csv', '.parquet'))))
+        except ImportError as e:
+            print(e)
+    stream.write_rows(rows, cards)
+    stream.close()
+    print(f"已生成 {csv_file}，共 {len(rows)} 个职位")
+    return len(rows)
+
+
+# 离线保存的页面文件后缀
+HTML_SUFFIXES = ('.html', '.htm', '.html.gz', '.htm.gz')
+
+
+def find_html_files(directory):
+    """
+    递归查找目录下保存的页面文件
+
+    Args:
+        directory (str): 页面目录
+
+    Returns:
+        list: 文件路径列表，按路径排序
+    """
+    paths = []
+    for root, _, files in os.walk(directory):
+        paths.extend(os.path.join(root, name) for name in files if name.lower().endswith(HTML_SUFFIXES))
+    return sorted(paths)
+
+
+def read_html_file(path):
+    """
+    读取页面文件，支持gzip压缩
+
+    Args:
+        path (str): 文件路径
+
+    Returns:
+        str: 页面HTML
+    """
+    opener = gzip.open if path.lower().endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        return f.read().decode('utf-8', errors='replace')
+
+
+def content_key(row):
+    """
+    没有职位ID时，用职位名称、公司名称和职位描述生成去重键
+
+    Args:
+        row (list): 职位数据行
+
+    Returns:
+        str: 去重键
+    """
+    text = '\x1f'.join((row[0], row[2], row[10]))
+    return 'content:' + hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def parse_files(paths):
+    """
+    在工作进程中解析一个分片的页面文件，详情页解析为职位数据行，列表页解析为职位卡片
+
+    Args:
+        paths (list): 文件路径
+
+    Returns:
+        tuple: (详情列表, 卡片列表)，详情为 (职位ID, 文件修改时间, 职位数据行) 元组
+    """
+    parser = JobParser()
+    details = []
+    cards = []
+    for path in paths:
+        try:
+            doc = parser.load(read_html_file(path))
+            if doc is None:
+                continue
+            row = parser.parse_detail(doc)
+            if row is not None:
+                url = parser.canonical_url(doc)
+                job_id = extract_job_id(url) if '/job_detail/' in url else content_key(row)
+                details.append((job_id, os.path.getmtime(path), row))
+            else:
+                cards.extend(parser.parse_list(doc))
+        except Exception as e:
+            print(f"解析页面文件失败 {path}: {e}")
+    return details, cards
+
+
+def reparse_directory(html_dir, output_dir, name='重新解析', workers=None, shards_per_worker=4,
+                      parquet=False, markdown=True):
+    """
+    批量解析目录中离线保存的列表页和详情页，合并为一份去重后的结果
+
+    文件按轮转方式分成若干分片，由多个进程并行读取和解析。同一职位ID
+    （没有ID时为内容指纹）只保留修改时间最新的一份，列表页卡片用于补充所在城市等信息。
+
+    Args:
+        html_dir (str): 页面目录
+        output_dir (str): 输出目录
+        name (str): 输出文件名，不含扩展名
+        workers (int): 进程数，默认为CPU核数
+        shards_per_worker (int): 每个进程分到的分片数，分片越多负载越均衡
+        parquet (bool): 是否同时输出Parquet
+        markdown (bool): 是否同时输出Markdown
+
+    Returns:
+        int: 输出的职位数
+    """
+    paths = find_html_files(html_dir)
+    print(f"目录中共有 {len(paths)} 个页面文件")
+    if not paths:
+        return 0
+    workers = workers or os.cpu_count() or 1
+    shard_count = min(len(paths), workers * shards_per_worker)
+    shards = [paths[i::shard_count] for i in range(shard_count)]
+
+    jobs = {}  # 职位ID -> (修改时间, 职位数据行)
+    listed = {}  # 职位ID -> 列表页卡片
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for details, cards in executor.map(parse_files, shards):
+            for job_id, mtime, row in details:
+                if job_id not in jobs or jobs[job_id][0] <= mtime:
+                    jobs[job_id] = (mtime, row)
+            for card in cards:
+                listed.setdefault(card['job_id'], card)
+
+    missing = sum(1 for job_id in listed if job_id not in jobs)
+    if missing:
+        print(f"列表页中有 {missing} 个职位没有对应的详情页")
+    rows = [row for _, row in jobs.values()]
+    cards = [dict(listed.get(job_id, {}), job_id=job_id) for job_id in jobs]
+    return write_outputs(output_dir, f"{name}.csv", name, rows, cards, parquet, markdown)
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description="从页面归档或保存的HTML目录重新解析并生成CSV/Markdown/Parquet")
+    arg_parser.add_argument('input', help="归档目录，或保存了列表页/详情页HTML的目录")
+    arg_parser.add_argument('output', help="输出目录")
+    arg_parser.add_argument('--name', default='重新解析', help="解析HTML目录时的输出文件名")
+    arg_parser.add_argument('--workers', type=int, default=None, help="进程数，默认为CPU核数")
+    arg_parser.add_argument('--parquet', action='store_true', help="同时输出Parquet")
+    arg_parser.add_argument('--no-markdown', action='store_true', help="不输出Markdown")
+    args = arg_parser.parse_args()
+
+    start = time.time()
+    if os.path.exists(os.path.join(args.input, INDEX_FILE)):
+        reparse_archive(args.input, args.output, args.workers, parquet=args.parquet, markdown=not args.no_markdown)
+    else:
+        reparse_directory(args.input, args.output, args.name, args.workers,
+                          parquet=args.parquet, markdown=not args.no_markdown)
+    print(f"重新解析完成，用时 {time.time() - start:.1f} 秒")
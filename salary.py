@@ -0,0 +1,198 @@
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# 薪资文本，如 "15-25K·14薪"、"200-300元/天"、"1-1.5万"、"8千-1万"、"面议"
+# 下限可以带自己的数量单位，没有时与上限相同
+SALARY_PATTERN = (
+    r'(?P<low>\d+(?:\.\d+)?)\s*(?P<low_scale>[Kk千万])?(?:\s*-\s*(?P<high>\d+(?:\.\d+)?))?\s*'
+    r'(?P<scale>[Kk千万]|元)?'
+    r'(?:\s*/\s*(?P<per>小时|时|天|日|周|月|年))?'
+    r'(?:\s*·\s*(?P<months>\d+)\s*薪)?'
+)
+_SALARY_RE = re.compile(SALARY_PATTERN)
+
+# 数量单位对应的倍数
+SCALES = {'K': 1000, 'k': 1000, '千': 1000, '万': 10000, '元': 1}
+
+# 计薪周期统一后的名称
+UNITS = {'小时': 'hour', '时': 'hour', '天': 'day', '日': 'day', '周': 'week', '月': 'month', '年': 'year'}
+
+# 各计薪周期折算成一年的倍数（按每年250个工作日、每天8小时、每年50周计算）
+PERIODS_PER_YEAR = {'hour': 2000, 'day': 250, 'week': 50, 'year': 1}
+
+# 输出的数值列
+SALARY_COLUMNS = ['salary_min', 'salary_max', 'months', 'unit', 'annualized']
+
+
+def parse_salary(text):
+    """
+    解析一条薪资文本，用于爬取过程中的逐行处理
+
+    Args:
+        text (str): 薪资文本
+
+    Returns:
+        dict: 包含 salary_min/salary_max(元)、months(每年发薪月数，仅按月计薪时有值)、
+              unit('hour'/'day'/'week'/'month'/'year')、annualized(按区间中值折算的年薪，元)，
+              无法识别时各项均为None
+    """
+    result = dict.fromkeys(SALARY_COLUMNS)
+    match = _SALARY_RE.search(text or '')
+    if not match:
+        return result
+
+    scale_text = match.group('scale') or match.group('low_scale') or '元'
+    scale = SCALES[scale_text]
+    low_scale = SCALES[match.group('low_scale') or scale_text]
+    # 没有标明周期时，K/千/万 按月计薪，单位为元时不确定周期
+    per = match.group('per')
+    if per:
+        unit = UNITS[per]
+    elif scale_text != '元':
+        unit = 'month'
+    else:
+        return result
+
+    low = float(match.group('low')) * low_scale
+    high = float(match.group('high')) * scale if match.group('high') else low
+    result['salary_min'] = low
+    result['salary_max'] = high
+    result['unit'] = unit
+    if unit == 'month':
+        result['months'] = int(match.group('months') or 12)
+        result['annualized'] = (low + high) / 2 * result['months']
+    else:
+        result['annualized'] = (low + high) / 2 * PERIODS_PER_YEAR[unit]
+    return result
+
+
+def normalize_salaries(salaries):
+    """
+    向量化解析整列薪资文本，用于批量重新处理已有的CSV
+
+    薪资文本的取值种类远少于行数，因此先对去重后的取值做正则提取，
+    数值换算全部用NumPy数组完成，最后按编码取回每一行的结果。
+
+    Args:
+        salaries (pandas.Series): 薪资文本列
+
+    Returns:
+        pandas.DataFrame: 与输入同索引，列为SALARY_COLUMNS，无法识别的行为缺失值
+    """
+    codes, uniques = pd.factorize(salaries.astype('string'), use_na_sentinel=False)
+    parts = pd.Series(uniques, dtype='string').str.extract(SALARY_PATTERN)
+    scale_text = parts['scale'].fillna(parts['low_scale']).fillna('元')
+    scale = scale_text.map(SCALES).astype('float64').to_numpy()
+    low_scale = parts['low_scale'].fillna(scale_text).map(SCALES).astype('float64').to_numpy()
+
+    unit = parts['per'].map(UNITS)
+    # 没有标明周期时，K/千/万 按月计薪
+    implied_month = unit.isna() & (scale_text != '元')
+    unit = unit.mask(implied_month, 'month')
+
+    low = parts['low'].astype('float64').to_numpy() * low_scale
+    high = parts['high'].astype('float64').to_numpy() * scale
+    high = np.where(np.isnan(high), low, high)
+    valid = unit.notna().to_numpy()
+    low = np.where(valid, low, np.nan)
+    high = np.where(valid, high, np.nan)
+
+    is_month = (unit == 'month').to_numpy()
+    months = parts['months'].astype('float64').fillna(12).to_numpy()
+    months = np.where(is_month, months, np.nan)
+    per_year = unit.map(PERIODS_PER_YEAR).astype('float64').to_numpy()
+    annualized = (low + high) / 2 * np.where(is_month, months, per_year)
+    unit = pd.Categorical(unit)
+
+    return pd.DataFrame({
+        'salary_min': low[codes],
+        'salary_max': high[codes],
+        'months': pd.array(months[codes], dtype='Int64'),
+        'unit': pd.Categorical.from_codes(unit.codes[codes], categories=unit.categories),
+        'annualized': annualized[codes],
+    }, index=salaries.index)
+
+
+def normalize_csv(csv_path, output_path=None, salary_column='薪资'):
+    """
+    为已有的职位CSV补充数值薪资列
+
+    Args:
+        csv_path (str): 职位CSV路径
+        output_path (str): 输出路径，默认覆盖原文件
+        salary_column (str): 薪资列名
+
+    Returns:
+        pandas.DataFrame: 补充了薪资列的数据
+    """
+    df = pd.read_csv(csv_path, encoding='utf-8-sig', dtype=str, keep_default_na=False)
+    df = df.drop(columns=[c for c in SALARY_COLUMNS if c in df.columns])
+    df = df.join(normalize_salaries(df[salary_column]))
+    df.to_csv(output_path or csv_path, index=False, encoding='utf-8-sig')
+    return df
+
+
+def benchmark(rows=1000000, seed=0):
+    """
+    在合成的薪资文本上对比逐行解析和向量化解析的耗时
+
+    Args:
+        rows (int): 合成的行数
+        seed (int): 随机种子
+    """
+    rng = np.random.default_rng(seed)
+    low = rng.integers(3, 60, rows)
+    high = low + rng.integers(1, 30, rows)
+    templates = [
+        lambda l, h: f"{l}-{h}K",
+        lambda l, h: f"{l}-{h}K·{13 + h % 4}薪",
+        lambda l, h: f"{l * 10}-{h * 10}元/天",
+        lambda l, h: f"{l}-{h}元/时",
+        lambda l, h: f"{l / 10:g}-{h / 10:g}万",
+        lambda l, h: f"{l}千-{h / 10:g}万",
+        lambda l, h: "面议",
+    ]
+    kinds = rng.integers(0, len(templates), rows)
+    corpus = pd.Series([templates[k](l, h) for k, l, h in zip(kinds, low, high)])
+    print(f"合成 {rows} 条薪资文本")
+
+    start = time.perf_counter()
+    per_row = pd.DataFrame([parse_salary(text) for text in corpus])
+    per_row_time = time.perf_counter() - start
+    print(f"逐行解析: {per_row_time:.2f} 秒")
+
+    start = time.perf_counter()
+    vectorized = normalize_salaries(corpus)
+    vectorized_time = time.perf_counter() - start
+    print(f"向量化解析: {vectorized_time:.2f} 秒 ({per_row_time / vectorized_time:.1f}x)")
+
+    # 两种路径的结果必须一致
+    for column in ['salary_min', 'salary_max', 'annualized']:
+        np.testing.assert_allclose(per_row[column].astype('float64'), vectorized[column], equal_nan=True)
+    print("两种解析结果一致")
+
+    # 已知取值的解析结果，上下限单位不同时分别换算
+    examples = {
+        '15-25K·14薪': (15000, 25000),
+        '1-1.5万': (10000, 15000),
+        '8千-1万': (8000, 10000),
+        '200-300元/天': (200, 300),
+    }
+    vectorized = normalize_salaries(pd.Series(list(examples)))
+    for (text, expected), (_, row) in zip(examples.items(), vectorized.iterrows()):
+        parsed = parse_salary(text)
+        assert (parsed['salary_min'], parsed['salary_max']) == expected, (text, parsed)
+        assert (row['salary_min'], row['salary_max']) == expected, (text, row)
+    print("示例薪资解析正确")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        # python salary.py 职位.csv [输出.csv]
+        normalize_csv(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+    else:
+        benchmark()
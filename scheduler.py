@@ -0,0 +1,479 @@
+import asyncio
+import itertools
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+LIST_TASK = 'list'
+DETAIL_TASK = 'detail'
+
+
+class CrawlTask:
+    """
+    调度器中的一个抓取任务（列表页或详情页）
+    """
+
+    def __init__(self, kind, url, page, index=0, card=None, page_html=None):
+        """
+        初始化抓取任务
+
+        Args:
+            kind (str): 任务类型，LIST_TASK 或 DETAIL_TASK
+            url (str): 页面URL
+            page (int): 所属列表页页码
+            index (int): 详情任务在本页卡片中的序号
+            card (dict): 详情任务对应的职位卡片记录
+            page_html (str): 已经预先取回的列表页HTML（第一页在获取总页数时已加载）
+        """
+        self.kind = kind
+        self.url = url
+        self.page = page
+        self.index = index
+        self.card = card
+        self.page_html = page_html
+        self.attempts = 0
+
+    @property
+    def priority(self):
+        """优先处理靠前页面的任务，同一页内按卡片顺序"""
+        return (self.page, self.index)
+
+    @property
+    def host(self):
+        """任务URL所属主机，用于按主机限制并发"""
+        return urllib.parse.urlparse(self.url).netloc
+
+
+class Frontier:
+    """
+    URL前沿队列
+
+    列表页任务和详情页任务分别放在两个优先队列中，由各自的工作协程消费，
+    因此第N+1页列表的加载可以与第N页详情的获取同时进行。
+    """
+
+    def __init__(self):
+        self.queues = {LIST_TASK: asyncio.PriorityQueue(), DETAIL_TASK: asyncio.PriorityQueue()}
+        self.counter = itertools.count()  # 相同优先级时保持先进先出
+
+    def put(self, task):
+        """
+        加入任务
+
+        Args:
+            task (CrawlTask): 抓取任务
+        """
+        self.queues[task.kind].put_nowait((task.priority, next(self.counter), task))
+
+    async def get(self, kind):
+        """
+        取出指定类型中优先级最高的任务
+
+        Args:
+            kind (str): 任务类型
+
+        Returns:
+            CrawlTask: 抓取任务，收到结束信号时返回None
+        """
+        return (await self.queues[kind].get())[2]
+
+    def close(self, workers):
+        """
+        向所有工作协程发送结束信号
+
+        Args:
+            workers (dict): 每种任务类型的工作协程数量
+        """
+        for kind, count in workers.items():
+            for _ in range(count):
+                # 结束信号排在所有任务之后
+                self.queues[kind].put_nowait(((float('inf'), 0), next(self.counter), None))
+
+
+class PageState:
+    """
+    单个列表页的处理状态，用于判断该页的详情是否全部完成
+    """
+
+    def __init__(self, page):
+        self.page = page
+        self.remaining = 0  # 尚未完成的详情任务数
+        self.cards = []  # 需要获取详情的职位卡片
+        self.rows = []  # 按卡片顺序保存的职位详情
+        self.failed = False  # 列表页本身是否加载失败
+
+
+class CrawlScheduler:
+    """
+    基于asyncio的爬取调度器
+
+    把“按页爬取”、“按数量爬取”和“全部爬取”三种模式统一为同一个调度器上的停止条件：
+    - 按页爬取：只调度前count页列表
+    - 按数量爬取：已选中的职位达到count个后不再调度新的列表页和详情
+    - 全部爬取：调度所有页面
+    三种模式都会在连续多页没有新职位时停止。
+
+    阻塞的抓取后端（Selenium/requests）在线程池中运行：列表页使用一个专用线程和后端，
+    详情页由DetailFetchPool的多个工作线程并发获取，每个主机同时进行的请求数受上限约束，
+    失败的任务按退避时间重新入队。
+    """
+
+    def __init__(self, job, list_fetcher, detail_pool, page_url, csv_file, total_pages,
+                 mode, count, target_jobs, first_page_html=None,
+                 checkpoint=None, checkpoint_base=None, start_page=1, saved_ids=(), consecutive_empty=0,
+                 host_concurrency=4, max_attempts=3, retry_delay=2, lookahead=1):
+        """
+        初始化调度器
+
+        Args:
+            job (Job): 爬虫实例，提供解析、去重、保存和进度回调
+            list_fetcher (Fetcher): 列表页使用的抓取后端
+            detail_pool (DetailFetchPool): 详情页并发抓取池
+            page_url (function): 根据页码生成列表页URL的函数
+            csv_file (str): CSV文件名
+            total_pages (int): 总页数
+            mode (str): 爬取模式，'按页爬取'/'按数量爬取'/'全部爬取'
+            count (int): 爬取页数或爬取数量
+            target_jobs (int): 用于计算进度的目标职位数
+            first_page_html (str): 已加载的第一页HTML
+            checkpoint (Checkpoint): 断点，每完成一页写入一次
+            checkpoint_base (dict): 断点中固定不变的部分（职位名称、模式、筛选条件）
+            start_page (int): 起始页码，从断点恢复时大于1
+            saved_ids (iterable): 断点中已保存的职位ID
+            consecutive_empty (int): 断点中已连续出现的空页数
+            host_concurrency (int): 每个主机同时进行的最大请求数
+            max_attempts (int): 每个任务的最大尝试次数
+            retry_delay (float): 重试前的基础等待时间(秒)，按尝试次数递增
+            lookahead (int): 详情尚未完成时允许提前加载的列表页数
+        """
+        self.job = job
+        self.list_fetcher = list_fetcher
+        self.detail_pool = detail_pool
+        self.page_url = page_url
+        self.csv_file = csv_file
+        self.total_pages = total_pages
+        self.mode = mode
+        self.target_jobs = target_jobs
+        self.first_page_html = first_page_html
+        self.host_concurrency = host_concurrency
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lookahead = lookahead
+        self.checkpoint = checkpoint
+        self.checkpoint_base = checkpoint_base or {}
+        self.start_page = start_page
+        self.saved_ids = set(saved_ids)  # 已写入CSV的职位ID
+
+        # 停止条件
+        if mode == '按页爬取':
+            self.max_pages = min(count, total_pages)
+            self.max_jobs = None
+        elif mode == '按数量爬取':
+            self.max_pages = total_pages
+            self.max_jobs = count
+        else:  # 全部爬取
+            self.max_pages = total_pages
+            self.max_jobs = None
+        self.max_consecutive_empty = job.max_consecutive_duplicates
+
+        self.stopped = False
+        self.failed_tasks = 0  # 重试后仍失败的列表页和详情任务数
+        self.saved_jobs = len(self.saved_ids)
+        self.pages = {}  # 页码 -> PageState
+        self.finished_pages = {}  # 已完成页码 -> 本页新增职位数
+        self.next_page_to_check = start_page  # 按页码顺序检查连续空页，也是断点中的下一页
+        self.consecutive_empty = consecutive_empty
+        self.error = None  # 处理任务结果时出现的第一个异常，run()结束时抛出
+
+    def stop(self, reason):
+        """
+        触发停止条件，不再调度新的列表页
+
+        Args:
+            reason (str): 停止原因
+        """
+        if not self.stopped:
+            print(reason)
+            self.stopped = True
+
+    def host_semaphore(self, host):
+        """获取指定主机的并发信号量"""
+        if host not in self.host_semaphores:
+            self.host_semaphores[host] = asyncio.Semaphore(self.host_concurrency)
+        return self.host_semaphores[host]
+
+    async def run(self):
+        """
+        运行调度器直到满足停止条件且所有已调度的任务完成
+
+        Returns:
+            int: 成功保存的职位数
+
+        Raises:
+            Exception: 处理任务结果（保存、回调等）时出错
+        """
+        loop = asyncio.get_running_loop()
+        self.loop = loop
+        self.frontier = Frontier()
+        self.host_semaphores = {}
+        self.page_window = asyncio.Semaphore(self.lookahead + 1)
+        self.released_pages = set()  # 已释放预取窗口的页码
+        self.retries = set()  # 等待中的重试
+        self.outstanding = 0  # 已入队但尚未完成的任务数
+        self.idle = asyncio.Event()
+        self.list_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='list')
+
+        workers = {LIST_TASK: 1, DETAIL_TASK: self.detail_pool.workers}
+        tasks = [asyncio.create_task(self.worker(LIST_TASK))]
+        tasks += [asyncio.create_task(self.worker(DETAIL_TASK)) for _ in range(workers[DETAIL_TASK])]
+        try:
+            await self.produce_list_pages()
+            # 等待所有已调度的任务（包括重试）完成
+            if self.outstanding:
+                self.idle.clear()
+                await self.idle.wait()
+        finally:
+            # 正常结束时重试都已完成，出错退出时取消仍在等待的重试
+            for retry in self.retries:
+                retry.cancel()
+            await asyncio.gather(*self.retries, return_exceptions=True)
+            self.frontier.close(workers)
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.list_executor.shutdown(wait=True)
+        if self.error is not None:
+            raise self.error
+        return self.saved_jobs
+
+    async def produce_list_pages(self):
+        """按页码顺序调度列表页，最多提前lookahead页"""
+        for page in range(self.start_page, self.max_pages + 1):
+            await self.page_window.acquire()
+            if self.job.stop_requested:
+                self.stop("收到停止请求，不再爬取新的页面")
+            if self.stopped:
+                self.page_window.release()
+                break
+            page_html = self.first_page_html if page == 1 else None
+            self.schedule(CrawlTask(LIST_TASK, self.page_url(page), page, page_html=page_html))
+
+    def schedule(self, task):
+        """
+        将任务加入前沿队列
+
+        Args:
+            task (CrawlTask): 抓取任务
+        """
+        self.outstanding += 1
+        self.frontier.put(task)
+
+    def release_page(self, page):
+        """
+        释放列表页占用的预取窗口，每页只释放一次
+
+        Args:
+            page (int): 页码
+        """
+        if page not in self.released_pages:
+            self.released_pages.add(page)
+            self.page_window.release()
+
+    def task_done(self):
+        """标记一个任务完成"""
+        self.outstanding -= 1
+        if self.outstanding == 0:
+            self.idle.set()
+
+    async def retry_later(self, task):
+        """
+        退避后把任务重新放回前沿队列
+
+        Args:
+            task (CrawlTask): 失败的任务
+        """
+        await asyncio.sleep(self.retry_delay * task.attempts)
+        self.frontier.put(task)
+
+    async def worker(self, kind):
+        """
+        工作协程，不断从前沿队列中取出并执行指定类型的任务
+
+        Args:
+            kind (str): 任务类型
+        """
+        while True:
+            task = await self.frontier.get(kind)
+            if task is None:
+                return
+            task.attempts += 1
+            try:
+                async with self.host_semaphore(task.host):
+                    if kind == LIST_TASK:
+                        result = await self.run_list_task(task)
+                    else:
+                        result = await self.run_detail_task(task)
+            except Exception as e:
+                print(f"执行任务出错 {task.url}: {e}")
+                result = None
+
+            if result is None and task.attempts < self.max_attempts and not (kind == LIST_TASK and self.stopped):
+                print(f"第 {task.attempts} 次尝试失败，稍后重试: {task.url}")
+                # 重试任务仍计入未完成任务数，保留引用避免等待中的重试被回收
+                retry = asyncio.create_task(self.retry_later(task))
+                self.retries.add(retry)
+                retry.add_done_callback(self.retries.discard)
+                continue
+
+            try:
+                if kind == LIST_TASK:
+                    self.on_list_done(task, result)
+                else:
+                    self.on_detail_done(task, result)
+            except Exception as e:
+                # 保存或回调出错时本页可能没有释放窗口，停止调度并放行生产者，避免run()一直等待
+                print(f"处理任务结果出错 {task.url}: {e}")
+                if self.error is None:
+                    self.error = e
+                self.stop(f"处理任务结果出错，停止爬取: {e}")
+                self.release_page(task.page)
+            finally:
+                self.task_done()
+
+    async def run_list_task(self, task):
+        """
+        加载并解析列表页
+
+        Returns:
+            list: 职位卡片记录，页面加载失败时返回None
+        """
+        if self.job.stop_requested:
+            self.stop("收到停止请求，不再爬取新的页面")
+        if self.stopped:
+            return []
+        self.job.report_progress(f'正在爬取第 {task.page}/{self.total_pages} 页', self.total_pages, task.page, self.target_jobs)
+        page_html, task.page_html = task.page_html, None  # 预加载的HTML只使用一次
+        # 重试时绕过缓存重新加载
+        return await self.loop.run_in_executor(
+            self.list_executor, self.job.load_list_page, self.list_fetcher, task.url, task.page, page_html,
+            task.attempts > 1
+        )
+
+    async def run_detail_task(self, task):
+        """
+        获取并解析详情页
+
+        Returns:
+            list: 职位详情，失败时返回None
+        """
+        future = self.detail_pool.submit(self.job.get_job_detail, task.url)
+        return await asyncio.wrap_future(future)
+
+    def on_list_done(self, task, cards):
+        """
+        列表页完成后去重并调度本页的详情任务
+
+        Args:
+            task (CrawlTask): 列表页任务
+            cards (list): 职位卡片记录，加载失败时为None
+        """
+        state = PageState(task.page)
+        self.pages[task.page] = state
+        if cards is None:
+            print(f"页面 {task.page} 加载失败")
+            self.job.report_progress(f'页面 {task.page}/{self.total_pages} 加载失败', self.total_pages, task.page, self.target_jobs)
+            state.failed = True
+            self.failed_tasks += 1
+            self.finish_page(state)
+            return
+
+        if cards:
+            self.job.report_progress(f'正在解析第 {task.page}/{self.total_pages} 页的 {len(cards)} 个职位',
+                                     self.total_pages, task.page, self.target_jobs, job_cards_on_page=len(cards))
+
+        self.job.record_listed(cards)
+        known_page = self.job.is_known_page(cards)
+        if known_page:
+            self.stop(f"第 {task.page} 页的职位都已在以往运行中出现过，增量爬取结束")
+        # 停止页本身仍补取其中尚未保存的职位，如以往获取详情失败的职位
+        if self.stopped and not known_page:
+            new_cards = []
+        else:
+            new_cards = self.job.select_new_cards(cards, task.page, self.total_pages, self.max_jobs)
+        if self.max_jobs is not None and len(self.job.seen_jobs) >= self.max_jobs:
+            self.stop(f"已达到目标数量: {self.max_jobs}")
+
+        state.remaining = len(new_cards)
+        state.cards = new_cards
+        state.rows = [None] * len(new_cards)
+        for index, card in enumerate(new_cards):
+            self.schedule(CrawlTask(DETAIL_TASK, card['href'], task.page, index, card))
+        if not new_cards:
+            self.finish_page(state)
+
+    def on_detail_done(self, task, job_detail):
+        """
+        详情任务完成后记录结果，本页全部完成时保存
+
+        Args:
+            task (CrawlTask): 详情任务
+            job_detail (list): 职位详情，失败时为None
+        """
+        state = self.pages[task.page]
+        state.remaining -= 1
+        if job_detail:
+            state.rows[task.index] = job_detail
+            self.saved_jobs += 1
+            print(f"成功获取职位详情: {task.card['title']}")
+            self.job.report_progress(f'已获取 {self.saved_jobs} 个职位信息 (第 {task.page}/{self.total_pages} 页)',
+                                     self.total_pages, task.page, self.target_jobs, scraped_jobs=self.saved_jobs)
+        else:
+            self.failed_tasks += 1
+        if state.remaining == 0:
+            self.finish_page(state)
+
+    def finish_page(self, state):
+        """
+        保存一页的结果，并按页码顺序检查连续空页停止条件
+
+        Args:
+            state (PageState): 页面状态
+        """
+        new_rows = [row for row in state.rows if row]
+        if new_rows:
+            saved_cards = [card for card, row in zip(state.cards, state.rows) if row]
+            self.job.save_rows(new_rows, saved_cards)
+            self.job.record_crawled(saved_cards)
+            self.saved_ids.update(card['job_id'] for card in saved_cards)
+            print(f"第 {state.page} 页爬取完成，获取并保存了 {len(new_rows)} 个职位详情")
+            self.job.report_progress(
+                f'第 {state.page}/{self.total_pages} 页完成，本页获取 {len(new_rows)} 个职位，总计 {self.saved_jobs} 个',
+                self.total_pages, state.page, self.target_jobs, scraped_jobs=self.saved_jobs, new_jobs=len(new_rows))
+        else:
+            print(f"第 {state.page} 页没有新数据")
+        self.release_page(state.page)
+
+        self.finished_pages[state.page] = len(new_rows)
+        while self.next_page_to_check in self.finished_pages:
+            if self.finished_pages.pop(self.next_page_to_check) == 0:
+                self.consecutive_empty += 1
+                if self.consecutive_empty >= self.max_consecutive_empty:
+                    self.stop("连续多页都没有新数据，停止爬取")
+            else:
+                self.consecutive_empty = 0
+            self.next_page_to_check += 1
+        self.save_checkpoint()
+
+    def save_checkpoint(self):
+        """
+        写入断点：下一个未完成的页码和已保存的职位ID
+
+        乱序完成的后续页面中已保存的职位记录在saved_ids中，恢复时会被去重跳过。
+        """
+        if self.checkpoint is None:
+            return
+        # 断点引用的数据必须先落盘
+        self.job.row_stream.sync()
+        self.checkpoint.save(dict(
+            self.checkpoint_base,
+            page=self.next_page_to_check,
+            saved_ids=sorted(self.saved_ids),
+            consecutive_empty=self.consecutive_empty,
+        ))
@@ -0,0 +1,126 @@
+import csv
+import os
+import re
+import sys
+from collections import namedtuple
+
+# 各类段落标题的常见写法，键为统一后的段落名称
+SECTION_KEYWORDS = {
+    '职位描述': ['职位描述', '岗位描述', '职位介绍', '岗位介绍'],
+    '岗位职责': ['岗位职责', '工作职责', '职位职责', '职责描述', '工作内容', '你将负责'],
+    '任职要求': ['任职要求', '职位要求', '岗位要求', '任职资格', '任职条件', '我们希望你'],
+    '加分项': ['加分项', '加分条件', '优先条件'],
+    '福利待遇': ['福利待遇', '薪资福利', '我们提供'],
+}
+
+# 标题写法 -> 段落名称
+_KEYWORD_LABELS = {keyword: label for label, keywords in SECTION_KEYWORDS.items() for keyword in keywords}
+
+# 所有标题写法合成一个正则，一次扫描找出全部段落标题。
+# 标题位于行首，允许带序号和括号，如 "一、岗位职责："、"【任职要求】"；
+# 标题后必须是冒号、右括号或行尾，避免把 "工作内容包括..." 这样的正文当成标题
+_HEADING_RE = re.compile(
+    r'^[ \t]*(?:[一二三四五六七八九十\d]+[、.．)）][ \t]*)?[【\[(（]?[ \t]*'
+    r'(?P<keyword>' + '|'.join(sorted(map(re.escape, _KEYWORD_LABELS), key=len, reverse=True)) + r')'
+    r'[ \t]*(?:[】\])）][ \t]*[:：]?|[:：]|(?=\n|$))[ \t]*',
+    re.MULTILINE,
+)
+
+# 一个段落：label为统一后的名称，keyword为原文中的标题写法，
+# start/end为段落正文在原文中的起止位置，text为去掉首尾空白的正文
+Section = namedtuple('Section', ['label', 'keyword', 'start', 'end', 'text'])
+
+
+def segment(text):
+    """
+    把职位描述切分为带标签的段落
+
+    Args:
+        text (str): 职位描述
+
+    Returns:
+        list: Section列表，按在原文中的顺序排列；第一个标题之前的内容不属于任何段落
+    """
+    if not text:
+        return []
+    headings = list(_HEADING_RE.finditer(text))
+    sections = []
+    for i, heading in enumerate(headings):
+        start = heading.end()
+        end = headings[i + 1].start() if i + 1 < len(headings) else len(text)
+        keyword = heading.group('keyword')
+        sections.append(Section(_KEYWORD_LABELS[keyword], keyword, start, end, text[start:end].strip()))
+    return sections
+
+
+def section_texts(text):
+    """
+    按段落名称汇总职位描述的各段正文
+
+    Args:
+        text (str): 职位描述
+
+    Returns:
+        dict: 段落名称 -> 正文，同名段落出现多次时按顺序以换行连接
+    """
+    texts = {}
+    for section in segment(text):
+        if section.text:
+            texts[section.label] = f"{texts[section.label]}\n{section.text}" if section.label in texts else section.text
+    return texts
+
+
+def split_description(text):
+    """
+    从职位描述中分离岗位职责和任职要求
+
+    Args:
+        text (str): 职位描述
+
+    Returns:
+        tuple: (岗位职责, 任职要求)，找不到时为空字符串
+    """
+    texts = section_texts(text)
+    return texts.get('岗位职责', ''), texts.get('任职要求', '')
+
+
+def resplit_csv(csv_path, output_path=None):
+    """
+    用当前的切分规则重新生成已有CSV中的岗位职责和任职要求，边读边写
+
+    Args:
+        csv_path (str): 职位CSV路径
+        output_path (str): 输出路径，默认覆盖原文件
+
+    Returns:
+        int: 处理的行数
+    """
+    target = output_path or csv_path
+    tmp_path = f"{target}.tmp"
+    count = 0
+    with open(csv_path, 'r', encoding='utf-8-sig', newline='') as src, \
+            open(tmp_path, 'w', encoding='utf-8-sig', newline='') as dst:
+        reader = csv.reader(src)
+        writer = csv.writer(dst)
+        headers = next(reader)
+        writer.writerow(headers)
+        desc_index = headers.index('职位描述')
+        duties_index = headers.index('岗位职责')
+        requirements_index = headers.index('任职要求')
+        last_index = max(desc_index, duties_index, requirements_index)
+        for row in reader:
+            if len(row) > last_index:
+                row[duties_index], row[requirements_index] = split_description(row[desc_index])
+            writer.writerow(row)
+            count += 1
+    os.replace(tmp_path, target)
+    return count
+
+
+if __name__ == '__main__':
+    # python segmenter.py 职位.csv [输出.csv]
+    if len(sys.argv) < 2:
+        print("用法: python segmenter.py 职位.csv [输出.csv]")
+        sys.exit(1)
+    count = resplit_csv(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+    print(f"已重新切分 {count} 条职位描述")
@@ -0,0 +1,445 @@
+import csv
+import os
+import time
+from datetime import datetime
+
+from jobparser import JOB_COLUMNS
+from salary import parse_salary, SALARY_COLUMNS
+
+# pyarrow是可选依赖，只有输出Parquet时才需要
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# 取值种类很少的列，在Parquet中使用字典编码
+DICTIONARY_COLUMNS = ['公司规模', '融资阶段', '学历要求', '工作年限']
+
+
+class RowSink:
+    """
+    职位数据输出的基类
+
+    每个输出格式实现一个子类，订阅同一个RowStream，爬取过程中按页收到职位行。
+    """
+
+    name = '输出'
+    required = False  # 是否为主输出，主输出出错时中止爬取，其他输出出错只打印错误
+
+    def write_rows(self, rows, cards=None):
+        """
+        写入一批职位数据
+
+        Args:
+            rows (list): 职位数据行，每行的字段与JOB_COLUMNS对应
+            cards (list): 与每行对应的职位卡片信息（包含job_id等），可能为None
+        """
+        raise NotImplementedError
+
+    def flush(self):
+        """把缓冲区的数据交给操作系统"""
+
+    def sync(self):
+        """把数据落盘，在写入断点前调用"""
+        self.flush()
+
+    def close(self):
+        """落盘并关闭输出"""
+        self.sync()
+
+
+class CsvSink(RowSink):
+    """
+    流式CSV输出
+
+    每次运行只打开一次文件，使用带缓冲的csv.writer写入，
+    累计行数或距上次刷新的时间超过阈值时才刷新缓冲区，写断点时fsync。
+    """
+
+    name = 'CSV'
+    required = True  # 去重索引和断点都以CSV已写入为前提
+
+    def __init__(self, path, append=False, columns=JOB_COLUMNS, flush_rows=100, flush_interval=5.0,
+                 buffer_size=64 * 1024):
+        """
+        打开CSV输出
+
+        Args:
+            path (str): CSV文件完整路径
+            append (bool): 是否追加到已有文件，否则清空后重写表头
+            columns (list): 表头
+            flush_rows (int): 累计多少行后刷新缓冲区
+            flush_interval (float): 距上次刷新多少秒后刷新缓冲区
+            buffer_size (int): 文件缓冲区大小(字节)
+        """
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.pending = 0  # 未刷新的行数
+        self.rows_written = 0
+        self.last_flush = time.monotonic()
+        try:
+            self.path = path
+            self.file = self.open(path, append, columns, buffer_size)
+        except OSError as e:
+            print(f"打开CSV文件失败: {e}")
+            # 尝试使用备用路径
+            self.path = os.path.join(os.getcwd(), f"backup_{os.path.basename(path)}")
+            print(f"尝试保存到备用路径: {self.path}")
+            self.file = self.open(self.path, append, columns, buffer_size)
+        self.writer = csv.writer(self.file)
+
+    def open(self, path, append, columns, buffer_size):
+        """
+        打开文件，新文件或覆盖模式下写入表头
+
+        Returns:
+            file: 文件对象
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        write_header = not append or not os.path.exists(path) or os.path.getsize(path) == 0
+        # 追加到已有文件时不会重复写入BOM
+        f = open(path, 'a' if append else 'w', encoding='utf-8-sig', newline='', buffering=buffer_size)
+        if write_header:
+            csv.writer(f).writerow(columns)
+            print(f"已创建CSV文件并写入表头: {path}")
+        return f
+
+    def write_rows(self, rows, cards=None):
+        self.writer.writerows(rows)
+        self.pending += len(rows)
+        self.rows_written += len(rows)
+        if self.pending >= self.flush_rows or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if self.file.closed:
+            return
+        self.file.flush()
+        self.pending = 0
+        self.last_flush = time.monotonic()
+
+    def sync(self):
+        if self.file.closed:
+            return
+        self.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.sync()
+        self.file.close()
+
+
+# Markdown中每个职位的详细信息段落：(标题, 字段下标)
+MARKDOWN_SECTIONS = [
+    ("职位标签", 8),
+    ("职位描述", 10),
+    ("岗位职责", 11),
+    ("任职要求", 12),
+    ("公司福利", 13),
+    ("面试地址", 14),
+]
+
+
+def markdown_lines(row):
+    """
+    生成一个职位的Markdown内容
+
+    Args:
+        row (list): 职位数据行
+
+    Yields:
+        str: Markdown的一行（可能包含换行）
+    """
+    yield f"## {row[0]} - {row[2]}\n"  # 职位名称和公司名称作为二级标题
+
+    # 基本信息表格
+    yield "### 基本信息\n"
+    yield "| 项目 | 内容 |"
+    yield "|------|------|"
+    yield f"| 薪资 | {row[1]} |"
+    yield f"| 公司规模 | {row[3]} |"
+    yield f"| 融资阶段 | {row[4]} |"
+    yield f"| 所属行业 | {row[5]} |"
+    yield f"| 工作年限 | {row[6]} |"
+    yield f"| 学历要求 | {row[7]} |"
+    yield f"| 工作地址 | {row[9]} |"
+    yield ""
+
+    for title, index in MARKDOWN_SECTIONS:
+        if row[index]:
+            yield f"### {title}"
+            yield f"{row[index]}\n"
+
+    # 分隔线
+    yield "---\n"
+
+
+class MarkdownSink(RowSink):
+    """
+    增量Markdown输出
+
+    收到职位行时直接渲染并写入带缓冲的文件，内存占用与职位数量无关。
+    """
+
+    name = 'Markdown'
+
+    def __init__(self, path, title, append=False, buffer_size=64 * 1024):
+        """
+        打开Markdown输出
+
+        Args:
+            path (str): Markdown文件完整路径
+            title (str): 职位名称，用于一级标题
+            append (bool): 是否追加到已有文件
+            buffer_size (int): 文件缓冲区大小(字节)
+        """
+        self.path = path
+        self.append = append and os.path.exists(path)
+        self.rows_written = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.file = open(path, 'a' if self.append else 'w', encoding='utf-8', buffering=buffer_size)
+        if not self.append:
+            self.file.write(f"# {title}职位信息\n")
+
+    def write_rows(self, rows, cards=None):
+        for row in rows:
+            # 各行之间以换行连接
+            for line in markdown_lines(row):
+                self.file.write('\n')
+                self.file.write(line)
+        self.rows_written += len(rows)
+
+    def flush(self):
+        if not self.file.closed:
+            self.file.flush()
+
+    def sync(self):
+        if self.file.closed:
+            return
+        self.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        if self.file.closed:
+            return
+        # 如果没有职位记录，添加提示信息
+        if not self.append and self.rows_written == 0:
+            self.file.write("\n*没有找到职位记录*\n")
+        self.sync()
+        self.file.close()
+
+
+class ParquetSink(RowSink):
+    """
+    列式Parquet输出
+
+    接收与CSV相同的职位行，按行组增量写入，并附加职位ID、爬取时间和数值薪资列。
+    低基数列使用字典编码，文件更小，pandas读取时直接得到category类型。
+    Parquet的文件尾在关闭时才写入，因此爬取中断后需要从CSV重建。
+    """
+
+    name = 'Parquet'
+
+    def __init__(self, path, seed_csv=None, row_group_size=1000, compression='zstd'):
+        """
+        打开Parquet输出
+
+        Args:
+            path (str): Parquet文件完整路径
+            seed_csv (str): 续爬时已有的CSV文件路径，其中的职位先写入Parquet
+            row_group_size (int): 每个行组包含的行数
+            compression (str): 压缩算法
+        """
+        if pa is None:
+            raise ImportError("输出Parquet需要安装pyarrow: pip install pyarrow")
+        self.path = path
+        self.row_group_size = row_group_size
+        self.schema = self.build_schema()
+        self.buffer = []  # 尚未写入行组的行
+        self.rows_written = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.writer = pq.ParquetWriter(path, self.schema, compression=compression)
+        if seed_csv and os.path.exists(seed_csv):
+            self.load_csv(seed_csv)
+
+    @staticmethod
+    def build_schema():
+        """
+        构建Parquet表结构
+
+        Returns:
+            pyarrow.Schema: 表结构
+        """
+        fields = []
+        for column in JOB_COLUMNS:
+            if column in DICTIONARY_COLUMNS:
+                fields.append(pa.field(column, pa.dictionary(pa.int32(), pa.string())))
+            else:
+                fields.append(pa.field(column, pa.string()))
+        fields.append(pa.field('job_id', pa.string()))
+        fields.append(pa.field('crawled_at', pa.timestamp('s')))
+        # 由薪资文本解析出的数值列
+        fields.append(pa.field('salary_min', pa.float64()))
+        fields.append(pa.field('salary_max', pa.float64()))
+        fields.append(pa.field('months', pa.int32()))
+        fields.append(pa.field('unit', pa.dictionary(pa.int32(), pa.string())))
+        fields.append(pa.field('annualized', pa.float64()))
+        return pa.schema(fields)
+
+    def load_csv(self, csv_path):
+        """
+        把已有CSV中的职位写入Parquet，用于续爬
+
+        Args:
+            csv_path (str): CSV文件路径
+        """
+        with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            next(reader, None)  # 跳过表头
+            for row in reader:
+                if len(row) >= len(JOB_COLUMNS):
+                    self.buffer.append((row, None, None))
+                    if len(self.buffer) >= self.row_group_size:
+                        self.write_row_group()
+
+    def write_rows(self, rows, cards=None):
+        now = datetime.now().replace(microsecond=0)
+        for i, row in enumerate(rows):
+            job_id = cards[i].get('job_id') if cards else None
+            self.buffer.append((row, job_id, now))
+        if len(self.buffer) >= self.row_group_size:
+            self.write_row_group()
+
+    def write_row_group(self):
+        """把缓冲的行写成一个行组"""
+        if not self.buffer:
+            return
+        columns = {name: [row[i] for row, _, _ in self.buffer] for i, name in enumerate(JOB_COLUMNS)}
+        columns['job_id'] = [job_id for _, job_id, _ in self.buffer]
+        columns['crawled_at'] = [crawled_at for _, _, crawled_at in self.buffer]
+        salaries = [parse_salary(row[1]) for row, _, _ in self.buffer]
+        for name in SALARY_COLUMNS:
+            columns[name] = [salary[name] for salary in salaries]
+        arrays = []
+        for field in self.schema:
+            if pa.types.is_dictionary(field.type):
+                arrays.append(pa.array(columns[field.name], pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(columns[field.name], field.type))
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+        self.rows_written += len(self.buffer)
+        self.buffer = []
+
+    def sync(self):
+        # 文件尾要到关闭时才写入，这里只把缓冲的行写成行组
+        self.write_row_group()
+
+    def close(self):
+        if self.writer is None:
+            return
+        self.write_row_group()
+        self.writer.close()
+        self.writer = None
+
+
+def parquet_exporter(job, csv_file, append):
+    """
+    Job.add_exporter使用的工厂函数，在CSV旁边输出同名的Parquet文件
+
+    Args:
+        job (Job): 爬虫实例
+        csv_file (str): CSV文件名
+        append (bool): 是否为续爬
+
+    Returns:
+        ParquetSink: Parquet输出
+    """
+    csv_path = os.path.join(job.save_path, csv_file)
+    parquet_path = os.path.join(job.save_path, csv_file.replace('.csv', '.parquet'))
+    return ParquetSink(parquet_path, seed_csv=csv_path if append else None)
+
+
+class RowStream:
+    """
+    职位数据流
+
+    爬取过程中的职位行只写入这里，再分发给所有订阅的输出（CSV、Markdown等）。
+    可选输出出错只打印错误，不影响其他输出和爬取本身；主输出（CSV）出错时抛出异常，
+    避免在数据没有写入的情况下继续记录去重索引和断点。
+    """
+
+    def __init__(self, sinks=()):
+        """
+        初始化数据流
+
+        Args:
+            sinks (iterable): 初始订阅的输出
+        """
+        self.sinks = list(sinks)
+        self.rows_written = 0
+
+    def subscribe(self, sink):
+        """
+        订阅数据流
+
+        Args:
+            sink (RowSink): 输出
+        """
+        self.sinks.append(sink)
+
+    def _each(self, action, method, *args, finish_all=False):
+        """
+        对每个输出执行同一操作
+
+        Args:
+            action (str): 操作名称，用于错误信息
+            method (str): RowSink的方法名
+            *args: 方法参数
+            finish_all (bool): 主输出出错后是否继续处理其他输出，关闭时使用
+
+        Raises:
+            Exception: 主输出出错
+        """
+        error = None
+        for sink in self.sinks:
+            try:
+                getattr(sink, method)(*args)
+            except Exception as e:
+                print(f"{sink.name}{action}失败: {e}")
+                if not sink.required:
+                    continue
+                if not finish_all:
+                    raise
+                if error is None:
+                    error = e
+        if error is not None:
+            raise error
+
+    def write_rows(self, rows, cards=None):
+        """
+        把一批职位数据分发给所有输出
+
+        Args:
+            rows (list): 职位数据行
+            cards (list): 与每行对应的职位卡片信息
+        """
+        if not rows:
+            return
+        self._each('写入', 'write_rows', rows, cards)
+        self.rows_written += len(rows)
+
+    def flush(self):
+        """刷新所有输出的缓冲区"""
+        self._each('刷新', 'flush')
+
+    def sync(self):
+        """所有输出落盘"""
+        self._each('落盘', 'sync')
+
+    def close(self):
+        """关闭所有输出，主输出关闭失败时仍会关闭其他输出"""
+        self._each('关闭', 'close', finish_all=True)
@@ -0,0 +1,223 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import time
+
+from jobparser import JOB_COLUMNS
+from sinks import RowSink
+
+# pyarrow是可选依赖，只有读取Parquet快照时才需要
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+# 变更类型
+ADDED = 'added'
+REMOVED = 'removed'
+MODIFIED = 'modified'
+
+# 删除记录中保留的字段，便于阅读变更日志时识别职位
+_REMOVED_FIELDS = ['职位名称', '公司名称']
+
+
+def record_hash(row):
+    """
+    计算一条职位记录的内容指纹，两次快照中指纹相同即内容未变
+
+    Args:
+        row (list): 与JOB_COLUMNS顺序一致的职位数据行
+
+    Returns:
+        str: 16位十六进制指纹
+    """
+    text = '\x1f'.join((value or '').strip() for value in row[:len(JOB_COLUMNS)])
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def diff_snapshots(old, new, complete=True, listed=()):
+    """
+    以职位ID做哈希连接，比较两次快照
+
+    两次快照各扫描一遍，只有指纹不同的职位才逐列比较，总耗时与职位数成正比。
+
+    Args:
+        old (dict): 旧快照，职位ID -> (指纹, 职位数据行)
+        new (dict): 新快照，职位ID -> (指纹, 职位数据行)
+        complete (bool): 新快照是否覆盖了完整的搜索结果，否则不判断删除
+        listed (iterable): 本次在列表页上出现但没有新数据行的职位ID（被跳过或详情获取失败），不算删除
+
+    Returns:
+        list: 变更记录，每条为包含 op 和 job_id 的字典
+    """
+    changes = []
+    for job_id, (digest, row) in new.items():
+        previous = old.get(job_id)
+        if previous is None:
+            changes.append({'op': ADDED, 'job_id': job_id, 'record': dict(zip(JOB_COLUMNS, row))})
+        elif previous[0] != digest:
+            fields = {column: [before, after] for column, before, after in zip(JOB_COLUMNS, previous[1], row)
+                      if before != after}
+            changes.append({'op': MODIFIED, 'job_id': job_id, 'fields': fields})
+    if complete:
+        listed = set(listed)
+        for job_id, (_, row) in old.items():
+            if job_id not in new and job_id not in listed:
+                record = dict(zip(JOB_COLUMNS, row))
+                changes.append(dict({'op': REMOVED, 'job_id': job_id},
+                                    **{column: record.get(column, '') for column in _REMOVED_FIELDS}))
+    return changes
+
+
+def summarize(changes):
+    """
+    统计各类变更的数量
+
+    Args:
+        changes (list): diff_snapshots的结果
+
+    Returns:
+        dict: 变更类型 -> 数量
+    """
+    counts = {ADDED: 0, REMOVED: 0, MODIFIED: 0}
+    for change in changes:
+        counts[change['op']] += 1
+    return counts
+
+
+def write_change_log(changes, path, **meta):
+    """
+    把变更追加到JSON Lines格式的变更日志，每行一个变更
+
+    Args:
+        changes (list): diff_snapshots的结果
+        path (str): 变更日志路径
+        **meta: 写入每一行的附加信息，如结果文件名
+
+    Returns:
+        int: 写入的变更数
+    """
+    if not changes:
+        return 0
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    now = time.strftime('%Y-%m-%d %H:%M:%S')
+    with open(path, 'a', encoding='utf-8') as f:
+        for change in changes:
+            f.write(json.dumps(dict(meta, time=now, **change), ensure_ascii=False) + '\n')
+    return len(changes)
+
+
+def load_snapshot(path):
+    """
+    从结果文件读取快照
+
+    Parquet和带job_id列的CSV以职位ID为键；爬虫输出的CSV没有职位ID，
+    以职位名称、公司名称和职位描述的内容指纹为键。
+
+    Args:
+        path (str): CSV或Parquet文件路径
+
+    Returns:
+        dict: 职位ID -> (指纹, 职位数据行)
+    """
+    snapshot = {}
+    if path.lower().endswith('.parquet'):
+        if pq is None:
+            raise ImportError("读取Parquet需要安装pyarrow: pip install pyarrow")
+        table = pq.read_table(path, columns=JOB_COLUMNS + ['job_id']).to_pydict()
+        rows = zip(*(table[column] for column in JOB_COLUMNS))
+        for job_id, row in zip(table['job_id'], rows):
+            row = [value or '' for value in row]
+            snapshot[job_id] = (record_hash(row), row)
+        return snapshot
+
+    # 延迟导入，避免读取Parquet时加载进程池相关模块
+    from reparse import content_key
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        headers = next(reader, None)
+        if headers is None:
+            return snapshot
+        positions = [headers.index(column) for column in JOB_COLUMNS]
+        id_index = headers.index('job_id') if 'job_id' in headers else None
+        for values in reader:
+            if len(values) < len(headers):
+                continue
+            row = [values[i] for i in positions]
+            job_id = values[id_index] if id_index is not None else content_key(row)
+            snapshot[job_id] = (record_hash(row), row)
+    return snapshot
+
+
+class ChangeLogSink(RowSink):
+    """
+    订阅职位数据流，爬取结束时与职位库中的上一次快照比较并写入变更日志
+
+    打开时从职位库读取该结果文件上一次的快照，爬取过程中只收集本次的职位ID和指纹，
+    关闭时做一次哈希连接。只有本次完整爬取了全部搜索结果时才判断删除，
+    以列表页上出现的职位ID为准，删除的职位在职位库中打上标记，不再出现在之后的快照中。
+    """
+
+    name = '变更日志'
+
+    def __init__(self, store, job, source, log_path, append=False):
+        """
+        Args:
+            store (JobStore): 职位库
+            job (Job): 爬虫实例，关闭时读取本次是否完整爬取
+            source (str): 结果文件名
+            log_path (str): 变更日志路径
+            append (bool): 是否为续爬或增量爬取，此时只记录新增和修改
+        """
+        self.store = store
+        self.job = job
+        self.source = source
+        self.log_path = log_path
+        self.append = append
+        self.old = store.snapshot(source)
+        self.new = {}
+
+    def write_rows(self, rows, cards=None):
+        for row, card in zip(rows, cards or []):
+            if card and card.get('job_id'):
+                self.new[card['job_id']] = (record_hash(row), row)
+
+    def close(self):
+        complete = not self.append and getattr(self.job, 'full_listing', False)
+        changes = diff_snapshots(self.old, self.new, complete, getattr(self.job, 'listed_ids', ()))
+        write_change_log(changes, self.log_path, source=self.source)
+        if complete:
+            self.store.mark_removed(self.source, [change['job_id'] for change in changes if change['op'] == REMOVED])
+        counts = summarize(changes)
+        print(f"职位变更：新增 {counts[ADDED]}，修改 {counts[MODIFIED]}，删除 {counts[REMOVED]}"
+              + ("" if complete else "（本次未完整爬取，不判断删除）"))
+
+
+def change_log_path(save_path, csv_file):
+    """
+    结果文件对应的变更日志路径
+
+    Args:
+        save_path (str): 保存路径
+        csv_file (str): CSV文件名
+
+    Returns:
+        str: 变更日志路径
+    """
+    return os.path.join(save_path, csv_file.replace('.csv', '.changes.jsonl'))
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description="比较两次爬取结果(CSV或Parquet)，输出新增、删除和修改的职位")
+    arg_parser.add_argument('old', help="旧的结果文件")
+    arg_parser.add_argument('new', help="新的结果文件")
+    arg_parser.add_argument('-o', '--output', default=None, help="变更日志路径，默认为新结果文件旁的 .changes.jsonl")
+    args = arg_parser.parse_args()
+
+    start = time.time()
+    changes = diff_snapshots(load_snapshot(args.old), load_snapshot(args.new))
+    output = args.output or os.path.splitext(args.new)[0] + '.changes.jsonl'
+    write_change_log(changes, output, source=os.path.basename(args.new))
+    print(f"{summarize(changes)}，已写入 {output}，用时 {time.time() - start:.2f} 秒")
@@ -0,0 +1,129 @@
+import os
+import sqlite3
+import threading
+import time
+
+# 默认的增量爬取记录文件
+DEFAULT_WATERMARK_PATH = os.path.join(os.path.expanduser('~'), '.boss_spider', 'watermark.sqlite')
+
+
+class WatermarkStore:
+    """
+    增量爬取的高水位记录
+
+    按 (职位名称, 筛选条件) 分别记录两类职位ID：
+    已追加到结果文件的职位每页保存后立即记录，之后的运行不再获取这些职位的详情，
+    中断的运行也不会让下次重复写入；成功运行中在列表页上出现过的职位作为高水位，
+    结果按发布时间从新到旧排列时，遇到一整页都是高水位以下的职位就说明后面都是旧数据，
+    可以立即停止。只有整次爬取成功后才推进高水位，中断的运行不会让下次漏掉职位。
+    """
+
+    def __init__(self, path=DEFAULT_WATERMARK_PATH):
+        """
+        打开（或创建）高水位记录
+
+        Args:
+            path (str): SQLite文件路径
+        """
+        self.path = path
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS watermarks ("
+                "query TEXT, job_id TEXT, first_seen REAL, PRIMARY KEY (query, job_id)) WITHOUT ROWID"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS saved_jobs ("
+                "query TEXT, job_id TEXT, saved_at REAL, PRIMARY KEY (query, job_id)) WITHOUT ROWID"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS query_runs ("
+                "query TEXT PRIMARY KEY, last_run REAL, runs INTEGER)"
+            )
+
+    def known_ids(self, query):
+        """
+        获取某个查询的高水位，即以往成功运行中在列表页上出现过的职位ID
+
+        Args:
+            query (str): 查询标识，由职位名称和筛选条件组成
+
+        Returns:
+            set: 职位ID集合
+        """
+        with self.lock:
+            return {job_id for (job_id,) in self.conn.execute(
+                "SELECT job_id FROM watermarks WHERE query = ?", (query,))}
+
+    def saved_ids(self, query):
+        """
+        获取某个查询以往已追加到结果文件的职位ID，包括中断的运行中保存的职位
+
+        Args:
+            query (str): 查询标识
+
+        Returns:
+            set: 职位ID集合
+        """
+        with self.lock:
+            return {job_id for (job_id,) in self.conn.execute(
+                "SELECT job_id FROM saved_jobs WHERE query = ?", (query,))}
+
+    def record_saved(self, query, job_ids):
+        """
+        记录刚追加到结果文件的职位，每页保存后调用
+
+        Args:
+            query (str): 查询标识
+            job_ids (iterable): 职位ID
+        """
+        now = time.time()
+        with self.lock:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO saved_jobs (query, job_id, saved_at) VALUES (?, ?, ?)",
+                    [(query, job_id, now) for job_id in job_ids]
+                )
+
+    def last_run(self, query):
+        """
+        获取某个查询上次成功爬取的时间
+
+        Args:
+            query (str): 查询标识
+
+        Returns:
+            float: 时间戳，从未爬取过时返回None
+        """
+        with self.lock:
+            row = self.conn.execute("SELECT last_run FROM query_runs WHERE query = ?", (query,)).fetchone()
+        return row[0] if row else None
+
+    def advance(self, query, job_ids):
+        """
+        爬取成功后推进高水位
+
+        Args:
+            query (str): 查询标识
+            job_ids (iterable): 本次在列表页上出现的职位ID，包括跳过和获取详情失败的职位
+        """
+        now = time.time()
+        with self.lock:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO watermarks (query, job_id, first_seen) VALUES (?, ?, ?)",
+                    [(query, job_id, now) for job_id in job_ids]
+                )
+                self.conn.execute(
+                    "INSERT INTO query_runs (query, last_run, runs) VALUES (?, ?, 1) "
+                    "ON CONFLICT(query) DO UPDATE SET last_run = excluded.last_run, runs = runs + 1",
+                    (query, now)
+                )
+
+    def close(self):
+        """关闭记录"""
+        with self.lock:
+            self.conn.close()